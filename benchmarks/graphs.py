@@ -0,0 +1,80 @@
+"""
+Graphes synthétiques ayant la forme d'un scan (sans DNS) : domaines en éventail, serveurs NS/MX
+partagés, adresses regroupées par /24, PTR et voisins, TXT/SPF, arêtes PARENT.
+Utilisés par les benchmarks de rendu.
+"""
+import random
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from src.models.graph import Node, Edge, NodeType, EdgeType
+
+WORDS = ("www", "api", "mail", "dev", "cdn", "app", "shop", "blog", "vpn", "static", "auth", "img", "m", "ns", "edge")
+
+
+def scan_graph(size: int, seed: int = 0) -> Tuple[Node, List[Edge]]:
+    """
+    Racine et arêtes d'un graphe d'environ `size` nœuds (déterministe pour une graine donnée).
+    """
+    rng = random.Random(seed)
+    nodes: Dict[Tuple[NodeType, str], Node] = {}
+    edges: List[Edge] = []
+
+    def node(value: str, node_type: NodeType) -> Optional[Node]:
+        key = (node_type, value)
+        found = nodes.get(key)
+        if found is None:
+            if len(nodes) >= size:
+                return None
+            found = nodes[key] = Node(value, node_type)
+            queue.append(found)
+        return found
+
+    def link(source: Node, target: Optional[Node], edge_type: EdgeType):
+        if target is not None:
+            edges.append(Edge(source, target, edge_type))
+
+    queue: deque = deque()
+    root = node("example.com", NodeType.DOMAIN)
+    nameservers = [f"ns{i}.dns-host{i % 7}.net" for i in range(12)]
+    exchangers = [f"mx{i}.mail-host{i % 5}.net" for i in range(8)]
+    blocks = [f"{rng.randrange(1, 223)}.{rng.randrange(256)}.{rng.randrange(256)}" for _ in range(max(4, size // 200))]
+    zones = ["example.com"] + [f"{word}{i}.example.{tld}" for i, (word, tld) in
+                               enumerate((rng.choice(WORDS), rng.choice(("com", "net", "org", "io"))) for _ in range(size // 500 + 1))]
+
+    while queue and len(nodes) < size:
+        current = queue.popleft()
+        if current.type == NodeType.DOMAIN:
+            labels = current.value.count(".")
+            for value in rng.sample(nameservers, 2):
+                link(current, node(value, NodeType.DOMAIN), EdgeType.NS)
+            if rng.random() < 0.5:
+                link(current, node(rng.choice(exchangers), NodeType.DOMAIN), EdgeType.MX)
+            block = rng.choice(blocks)
+            for _ in range(rng.randint(1, 3)):
+                link(current, node(f"{block}.{rng.randrange(1, 255)}", NodeType.IP_V4), EdgeType.A)
+            if rng.random() < 0.3:
+                link(current, node(f"2001:db8:{rng.randrange(65536):x}::{rng.randrange(1, 65536):x}", NodeType.IP_V6), EdgeType.AAAA)
+            if rng.random() < 0.3:
+                txt = node(f"v=spf1 ip4:{rng.choice(blocks)}.0/24 include:_spf.{rng.choice(zones)} ~all", NodeType.TXT)
+                link(current, txt, EdgeType.TXT)
+                if rng.random() < 0.5:
+                    link(current, node(f"{rng.choice(blocks)}.0/24", NodeType.PREFIX_V4), EdgeType.TXT)
+            # Éventail de sous-domaines, plus étroit en profondeur
+            if labels < 5:
+                for _ in range(rng.randint(0, max(1, 9 - 2 * labels))):
+                    child = node(f"{rng.choice(WORDS)}{rng.randrange(100)}.{current.value}", NodeType.DOMAIN)
+                    link(current, child, EdgeType.SUBDOMAIN)
+                    if child is not None:
+                        link(child, current, EdgeType.PARENT)
+            if rng.random() < 0.05:
+                link(current, node(rng.choice(zones), NodeType.DOMAIN), EdgeType.CNAME)
+        elif current.type == NodeType.IP_V4:
+            if rng.random() < 0.5:
+                link(current, node(f"host-{current.value.replace('.', '-')}.{rng.choice(zones)}", NodeType.DOMAIN), EdgeType.PTR)
+            if rng.random() < 0.3:
+                prefix, last = current.value.rsplit(".", 1)
+                neighbor = int(last) + rng.choice((-1, 1))
+                if 0 < neighbor < 255:
+                    link(current, node(f"{prefix}.{neighbor}", NodeType.IP_V4), EdgeType.NEIGHBOR)
+
+    return root, edges
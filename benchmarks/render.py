@@ -0,0 +1,222 @@
+"""
+Benchmarks de rendu : GraphWidget (Textual) et l'arbre Rich de RichDNSApp sur des graphes
+synthétiques de la forme d'un scan.
+
+    python -m benchmarks.render                       # 10k, 50k et 200k nœuds
+    python -m benchmarks.render -n 10000 --no-memory  # une taille, sans tracemalloc
+    python -m benchmarks.render --update              # réécrit benchmarks/render_baselines.json
+
+Mesures (secondes) : layout (et index spatial), construction du cache de rendu, part de _row_to_strip, pan et zoom
+(moyenne par redessin), ajout incrémental d'un lot de 1000 arêtes, index de clusters et rendu de la vue agrégée,
+construction de l'arbre Rich et son affichage en flux ; pic mémoire (tracemalloc) du widget et de l'affichage de
+l'arbre, mesuré dans un passage séparé pour ne pas fausser les temps.
+"""
+import argparse
+import io
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import networkx as nx
+from rich.console import Console
+from textual.geometry import Size
+
+from benchmarks.graphs import scan_graph
+from benchmarks.run import compare
+from src.tui.rich_app import RichDNSApp
+from src.tui.widgets.clusters import ClusterIndex
+from src.tui.widgets.graph import GraphWidget
+
+BASELINES = Path(__file__).parent / "render_baselines.json"
+SIZES = (10000, 50000, 200000)
+TIME_KEYS = ("layout_s", "render_s", "strips_s", "pan_s", "zoom_s", "stream_batch_s", "cluster_index_s", "cluster_render_s",
+             "tree_build_s", "tree_render_s")
+MEMORY_KEYS = ("widget_peak_kib", "tree_peak_kib")
+
+
+class BenchGraphWidget(GraphWidget):
+    """
+    GraphWidget hors application : taille fixe, temps passé dans _row_to_strip cumulé.
+    """
+
+    def __init__(self, graph, root, width: int, height: int):
+        super().__init__(graph, root=root)
+        self._bench_size = Size(width, height)
+        self.strip_time = 0.0
+
+    @property
+    def size(self) -> Size:
+        return self._bench_size
+
+    def refresh(self, *args, **kwargs):
+        return self
+
+    def _row_to_strip(self, row):
+        start = time.perf_counter()
+        strip = super()._row_to_strip(row)
+        self.strip_time += time.perf_counter() - start
+        return strip
+
+
+def _timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def _peak(function) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_widget(graph: nx.DiGraph, root, width: int, height: int, redraws: int) -> Dict:
+    widget = BenchGraphWidget(graph, root, width, height)
+
+    def layout():
+        widget._layout, widget._labels = widget._compute_layout(width, height)
+        widget._build_index()
+        widget._layout_dirty = False
+
+    result = {"layout_s": _timed(layout)}
+
+    widget.strip_time = 0.0
+    result["render_s"] = _timed(widget._build_render_cache)
+    result["strips_s"] = widget.strip_time
+
+    # Glisser : alternance de déplacements horizontaux et verticaux
+    moves = (widget.action_pan_right, widget.action_pan_down, widget.action_pan_left, widget.action_pan_up)
+    elapsed = 0.0
+    for index in range(redraws):
+        moves[index % len(moves)]()
+        elapsed += _timed(lambda: widget.render_line(0))
+    result["pan_s"] = elapsed / redraws
+
+    elapsed = 0.0
+    for index in range(redraws):
+        (widget.action_zoom_in if index % 2 else widget.action_zoom_out)()
+        elapsed += _timed(lambda: widget.render_line(0))
+    result["zoom_s"] = elapsed / redraws
+    return result
+
+
+def bench_stream(pairs: List, root, width: int, height: int, batch: int = 1000) -> Dict:
+    """
+    Suivi d'un scan en direct : layout complet du premier lot, puis add_edges par lots.
+    """
+    graph = nx.DiGraph()
+    graph.add_edges_from(pairs[:batch])
+    widget = BenchGraphWidget(graph, root, width, height)
+    widget.render_line(0)
+    batches = 0
+    elapsed = 0.0
+    for start in range(batch, len(pairs), batch):
+        chunk = pairs[start:start + batch]
+        elapsed += _timed(lambda: (widget.add_edges(chunk), widget.render_line(0)))
+        batches += 1
+    return {"stream_batch_s": elapsed / batches if batches else 0.0}
+
+
+def bench_clusters(pairs: List, root, width: int, height: int) -> Dict:
+    """
+    Niveau de détail : indexation des clusters, puis vue agrégée, layout et rendu.
+    """
+    index = ClusterIndex()
+    result = {"cluster_index_s": _timed(lambda: index.add_edges(pairs))}
+    widget = BenchGraphWidget(nx.DiGraph(), None, width, height)
+    result["cluster_render_s"] = _timed(lambda: (widget.set_clusters(index, root), widget._build_render_cache()))
+    result["clusters"] = len(index)
+    return result
+
+
+def bench_tree(app: RichDNSApp, root) -> Dict:
+    """
+    Arbre Rich avec les limites d'affichage par défaut : construction de l'objet Tree, et
+    affichage en flux tel que fait par RichDNSApp.run.
+    """
+    console = Console(file=io.StringIO(), width=120, color_system=None)
+    return {
+        "tree_build_s": _timed(lambda: app.build_rich_tree(root)),
+        "tree_render_s": _timed(lambda: app.print_tree(root, console)),
+    }
+
+
+def benchmark(size: int, width: int = 200, height: int = 60, redraws: int = 8, memory: bool = True) -> Dict:
+    root, edges = scan_graph(size)
+    graph = nx.DiGraph()
+    graph.add_edges_from((edge.source, edge.target) for edge in edges)
+
+    app = RichDNSApp()
+    for edge in edges:
+        app.engine.add_edge(edge)
+
+    result = {"nodes": graph.number_of_nodes(), "edges": graph.number_of_edges()}
+    result.update(bench_widget(graph, root, width, height, redraws))
+    pairs = [(edge.source, edge.target) for edge in edges]
+    result.update(bench_stream(pairs, root, width, height))
+    result.update(bench_clusters(pairs, root, width, height))
+    result.update(bench_tree(app, root))
+
+    if memory:
+        def widget_pass():
+            widget = BenchGraphWidget(graph, root, width, height)
+            widget._build_render_cache()
+        result["widget_peak_kib"] = _peak(widget_pass)
+        result["tree_peak_kib"] = _peak(lambda: app.print_tree(root, Console(file=io.StringIO(), width=120)))
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.render", description="Benchmarks de rendu")
+    parser.add_argument("-n", "--size", type=int, action="append", help="Nombre de nœuds (répétable)")
+    parser.add_argument("--viewport", default="200x60", help="Taille du widget (par défaut : 200x60)")
+    parser.add_argument("--redraws", type=int, default=8, help="Redessins mesurés pour le pan et le zoom")
+    parser.add_argument("--no-memory", action="store_true", help="Ne pas mesurer le pic mémoire")
+    parser.add_argument("--baselines", default=str(BASELINES), help="Fichier de références (JSON)")
+    parser.add_argument("--update", action="store_true", help="Enregistrer les résultats comme nouvelles références")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Marge tolérée avant de signaler une régression")
+    parser.add_argument("--json", action="store_true", help="Résultats en JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    width, height = (int(part) for part in args.viewport.lower().split("x"))
+    sizes: Sequence[int] = args.size or SIZES
+    path = Path(args.baselines)
+    baselines = json.loads(path.read_text()) if path.exists() else {}
+    results: Dict[str, Dict] = {}
+    regressions = 0
+
+    for size in sizes:
+        key = f"render/{size}"
+        result = benchmark(size, width, height, args.redraws, memory=not args.no_memory)
+        for name in TIME_KEYS:
+            if name in result:
+                result[name] = round(result[name], 4)
+        results[key] = result
+
+        problems = compare(result, baselines.get(key), args.tolerance,
+                           keys=[(name, 0.01) for name in TIME_KEYS] + [(name, 256) for name in MEMORY_KEYS],
+                           completeness=False)
+        regressions += bool(problems)
+        if not args.json:
+            timings = " ".join(f"{name[:-2]}={result[name]:.3f}" for name in TIME_KEYS if name in result)
+            memory = " ".join(f"{name[:-9]}={result[name]}KiB" for name in MEMORY_KEYS if name in result)
+            status = "REGRESSION " + ", ".join(problems) if problems else "ok"
+            print(f"{key:<14} {result['nodes']:>7} nœuds  {timings}  {memory}  {status}", flush=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.update:
+        baselines.update(results)
+        path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Benchmarks hors ligne : scans complets du ScannerEngine contre un serveur faisant autorité local.
+
+    python -m benchmarks.run                      # tous les scénarios, comparés aux références
+    python -m benchmarks.run -k fanout -s default # filtre par scénario / jeu de stratégies
+    python -m benchmarks.run --update             # réécrit benchmarks/baselines.json
+
+Pour chaque couple (scénario, jeu de stratégies) : temps total, requêtes/s, pic mémoire
+(tracemalloc, mesuré sur un passage sans perte) et complétude (part des nœuds du passage
+sans perte ni latence retrouvés dans les conditions du scénario).
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import dns.resolver
+
+from benchmarks.server import ServerProcess
+from benchmarks.zones import ZoneBuilder, fanout, ptr_block, spf_chain, wildcard
+from src.models.graph import Node, NodeType
+from src.strategies.registry import DEFAULT_STRATEGIES, build_engine
+
+BASELINES = Path(__file__).parent / "baselines.json"
+
+STRATEGY_SETS: Dict[str, Sequence[str]] = {
+    "default": DEFAULT_STRATEGIES,
+    "full": ("dns", "txt", "ptr", "parents", "subdomains", "srv", "neighbors"),
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    root: str
+    build: Callable[[ZoneBuilder], None]
+    depth: int = 3
+    latency: float = 0.0
+    loss: float = 0.0
+    # Délai d'une requête côté client : court pour que les pertes ne dominent pas le temps total
+    timeout: float = 0.2
+    strategy_sets: Sequence[str] = field(default_factory=lambda: tuple(STRATEGY_SETS))
+
+
+def _mixed(builder: ZoneBuilder):
+    fanout(builder, "example.com", width=12, addresses=3)
+    spf_chain(builder, "example.net", length=8)
+    builder.add("example.com", "TXT", '"v=spf1 include:example.net -all"')
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("fanout", "example.com", lambda b: fanout(b, "example.com", width=16, addresses=4)),
+    Scenario("wildcard", "example.edu", lambda b: wildcard(b, "example.edu"), depth=2),
+    Scenario("spf", "example.net", lambda b: spf_chain(b, "example.net", length=12)),
+    Scenario("ptr", "www.example.org", lambda b: ptr_block(b, "example.org", count=64, stride=1), depth=8),
+    # Une perte coûte le délai client plus le backoff interne de dnspython : jeu par défaut seulement
+    Scenario("lossy", "example.com", _mixed, latency=0.002, loss=0.05, timeout=0.05, strategy_sets=("default",)),
+]
+
+
+def run_scan(scenario: Scenario, names: Sequence[str], latency: float, loss: float,
+             trace_memory: bool = False) -> Dict:
+    builder = ZoneBuilder()
+    scenario.build(builder)
+
+    with ServerProcess(builder.build(), latency=latency, loss=loss) as server:
+        engine = build_engine(names, max_depth=scenario.depth, cache=dns.resolver.LRUCache(100000))
+        for strategy in engine.strategies:
+            resolver = getattr(strategy, "resolver", None)
+            if resolver is not None:
+                resolver.nameservers = [server.host]
+                resolver.port = server.port
+                resolver.timeout = scenario.timeout
+                resolver.lifetime = scenario.timeout
+
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        engine.scan(Node(scenario.root, NodeType.DOMAIN))
+        wall = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    # Les compteurs du serveur ne sont connus qu'après son arrêt
+    strategies = engine.metrics.snapshot()
+    queries = sum(entry["queries"] for s in strategies.values() for entry in s["rdtypes"].values())
+    wire = sum(s["wire_queries"] for s in strategies.values())
+    return {
+        "wall_s": wall,
+        "queries": queries,
+        "wire_queries": wire,
+        "qps": wire / wall if wall else 0.0,
+        "server_queries": server.queries,
+        "dropped": server.dropped,
+        "retries": engine.retry.retries,
+        "nodes": len(engine.nodes),
+        "edges": len(engine.edges),
+        "peak_kib": None if peak is None else peak // 1024,
+        "found": {(node.type.value, node.value) for node in engine.nodes},
+    }
+
+
+def benchmark(scenario: Scenario, names: Sequence[str]) -> Dict:
+    # Passage de référence sans perte ni latence : ensemble attendu et pic mémoire
+    reference = run_scan(scenario, names, 0.0, 0.0, trace_memory=True)
+    if scenario.latency or scenario.loss:
+        measured = run_scan(scenario, names, scenario.latency, scenario.loss)
+    else:
+        # tracemalloc fausse les temps : on mesure à nouveau sans lui
+        measured = run_scan(scenario, names, 0.0, 0.0)
+
+    expected = reference["found"]
+    found = measured.pop("found")
+    measured["completeness"] = len(found & expected) / len(expected) if expected else 1.0
+    measured["peak_kib"] = reference["peak_kib"]
+    return measured
+
+
+# (mesure, marge absolue) : la marge s'ajoute à la relative, les scénarios courts sont dominés par le bruit
+COMPARED = (("wall_s", 0.05), ("wire_queries", 0), ("peak_kib", 64))
+
+
+def compare(result: Dict, baseline: Optional[Dict], tolerance: float,
+            keys: Sequence[Tuple[str, float]] = COMPARED, completeness: bool = True) -> List[str]:
+    """
+    Régressions de result par rapport à baseline (une mesure plus grande est une régression).
+    """
+    if not baseline:
+        return []
+    problems = []
+    for key, slack in keys:
+        old, new = baseline.get(key), result.get(key)
+        if old and new is not None and new > old * (1 + tolerance) + slack:
+            problems.append(f"{key} {old} -> {new}")
+    if completeness and result["completeness"] < baseline.get("completeness", 0) - 0.01:
+        problems.append(f"completeness {baseline['completeness']:.3f} -> {result['completeness']:.3f}")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmarks hors ligne du moteur de scan")
+    parser.add_argument("-k", "--scenario", action="append", help="Scénario(s) à lancer (par défaut : tous)")
+    parser.add_argument("-s", "--strategies", action="append", choices=tuple(STRATEGY_SETS), help="Jeu(x) de stratégies")
+    parser.add_argument("--baselines", default=str(BASELINES), help="Fichier de références (JSON)")
+    parser.add_argument("--update", action="store_true", help="Enregistrer les résultats comme nouvelles références")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Marge tolérée avant de signaler une régression (par défaut : 0.25)")
+    parser.add_argument("--json", action="store_true", help="Résultats en JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+
+    path = Path(args.baselines)
+    baselines = json.loads(path.read_text()) if path.exists() else {}
+    results: Dict[str, Dict] = {}
+    regressions = 0
+
+    # Échauffement : imports différés et chargement de la liste des suffixes publics hors mesure
+    run_scan(SCENARIOS[0], STRATEGY_SETS["default"], 0.0, 0.0)
+
+    for scenario in SCENARIOS:
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        for set_name in scenario.strategy_sets:
+            if args.strategies and set_name not in args.strategies:
+                continue
+            key = f"{scenario.name}/{set_name}"
+            result = benchmark(scenario, STRATEGY_SETS[set_name])
+            result["wall_s"] = round(result["wall_s"], 4)
+            result["qps"] = round(result["qps"], 1)
+            result["completeness"] = round(result["completeness"], 4)
+            results[key] = result
+
+            problems = compare(result, baselines.get(key), args.tolerance)
+            regressions += bool(problems)
+            if not args.json:
+                status = "REGRESSION " + ", ".join(problems) if problems else "ok"
+                print(f"{key:<20} {result['wall_s']:>8.3f}s {result['qps']:>9.1f} q/s "
+                      f"{result['wire_queries']:>6} req {result['nodes']:>6} nœuds "
+                      f"{result['completeness']:>7.1%} {result['peak_kib'] or 0:>7} KiB  {status}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.update:
+        baselines.update(results)
+        path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
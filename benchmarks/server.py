@@ -0,0 +1,309 @@
+"""
+Serveur DNS faisant autorité, local et minimal (UDP + TCP), construit sur dnspython.
+
+Sert des dns.zone.Zone en mémoire, avec prise en charge des jokers, des réponses négatives
+(SOA en autorité, RFC 2308), de la troncature UDP et d'une latence / perte artificielles.
+Destiné aux benchmarks : aucune récursion, aucune mise en cache.
+"""
+import heapq
+import random
+import socket
+import struct
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import dns.exception
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.rrset
+import dns.zone
+
+# Taille maximale d'une réponse UDP sans EDNS
+UDP_MAX = 512
+
+
+class AuthoritativeServer:
+    """
+    Utilisable comme gestionnaire de contexte :
+
+        with AuthoritativeServer(zones, latency=0.002, loss=0.01) as server:
+            resolver.nameservers = [server.host]
+            resolver.port = server.port
+    """
+
+    def __init__(self, zones: Iterable[dns.zone.Zone], host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, loss: float = 0.0, seed: int = 0):
+        # Zones triées de la plus spécifique à la plus générale
+        self.zones = sorted(zones, key=lambda zone: len(zone.origin.labels), reverse=True)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.loss = loss
+        self.queries = 0
+        self.dropped = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        # Réponses UDP différées : (échéance, séquence, données, adresse)
+        self._pending: List[Tuple[float, int, bytes, tuple]] = []
+        self._pending_seq = 0
+        self._pending_ready = threading.Condition()
+
+    # --- Cycle de vie ---
+
+    def start(self) -> "AuthoritativeServer":
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.bind((self.host, self.port))
+        self.port = self._udp.getsockname()[1]
+        self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._tcp.bind((self.host, self.port))
+        self._tcp.listen(64)
+        self._udp.settimeout(0.2)
+        self._tcp.settimeout(0.2)
+
+        self._running = True
+        for target in (self._serve_udp, self._serve_tcp, self._send_delayed):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._running = False
+        with self._pending_ready:
+            self._pending_ready.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+        self._udp.close()
+        self._tcp.close()
+
+    def __enter__(self) -> "AuthoritativeServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # --- Réponses ---
+
+    def handle(self, wire: bytes, max_size: int = 65535) -> Optional[bytes]:
+        """
+        Réponse (format wire) à une requête, ou None si elle est illisible.
+        """
+        try:
+            query = dns.message.from_wire(wire)
+        except Exception:
+            return None
+        with self._lock:
+            self.queries += 1
+        response = self.answer(query)
+        if query.edns >= 0:
+            max_size = min(max_size, max(query.payload, UDP_MAX))
+        try:
+            return response.to_wire(max_size=max_size)
+        except dns.exception.TooBig:
+            # Réponse tronquée : le client recommencera en TCP
+            response = dns.message.make_response(query)
+            response.flags |= dns.flags.AA | dns.flags.TC
+            return response.to_wire()
+
+    def answer(self, query: dns.message.Message) -> dns.message.Message:
+        response = dns.message.make_response(query)
+        if len(query.question) != 1:
+            response.set_rcode(dns.rcode.FORMERR)
+            return response
+        question = query.question[0]
+        qname, rdtype = question.name, question.rdtype
+
+        zone = self._find_zone(qname)
+        if zone is None:
+            response.set_rcode(dns.rcode.REFUSED)
+            return response
+        response.flags |= dns.flags.AA
+
+        node = zone.get_node(qname) or self._wildcard(zone, qname)
+        if node is None:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            self._add_soa(response, zone)
+            return response
+
+        rdataset = node.get_rdataset(dns.rdataclass.IN, rdtype)
+        if rdataset is None:
+            rdataset = node.get_rdataset(dns.rdataclass.IN, dns.rdatatype.CNAME)
+        if rdataset is None:
+            # NODATA : le nom existe, pas ce type
+            self._add_soa(response, zone)
+            return response
+        rrset = dns.rrset.RRset(qname, dns.rdataclass.IN, rdataset.rdtype)
+        rrset.update(rdataset)
+        response.answer.append(rrset)
+        return response
+
+    def _find_zone(self, qname: dns.name.Name) -> Optional[dns.zone.Zone]:
+        for zone in self.zones:
+            if qname.is_subdomain(zone.origin):
+                return zone
+        return None
+
+    def _wildcard(self, zone: dns.zone.Zone, qname: dns.name.Name):
+        """
+        Joker le plus proche (*.parent), en remontant jusqu'à l'origine de la zone.
+        """
+        name = qname
+        while name != zone.origin:
+            name = name.parent()
+            node = zone.get_node(dns.name.Name((b"*",) + name.labels))
+            if node is not None:
+                return node
+            if zone.get_node(name) is not None:
+                # Un nom existant bloque les jokers plus haut (RFC 4592, simplifié)
+                return None
+        return None
+
+    def _add_soa(self, response: dns.message.Message, zone: dns.zone.Zone):
+        soa = zone.get_rdataset(zone.origin, dns.rdatatype.SOA)
+        if soa is not None:
+            rrset = dns.rrset.RRset(zone.origin, dns.rdataclass.IN, dns.rdatatype.SOA)
+            rrset.update(soa)
+            # RFC 2308 : le TTL du SOA d'une réponse négative est borné par son champ MINIMUM
+            rrset.ttl = min(soa.ttl, soa[0].minimum)
+            response.authority.append(rrset)
+
+    # --- Transport ---
+
+    def _dropped(self) -> bool:
+        if self.loss <= 0:
+            return False
+        with self._lock:
+            drop = self._rng.random() < self.loss
+            if drop:
+                self.dropped += 1
+        return drop
+
+    def _serve_udp(self):
+        while self._running:
+            try:
+                wire, address = self._udp.recvfrom(65535)
+            except (socket.timeout, OSError):
+                continue
+            if self._dropped():
+                continue
+            response = self.handle(wire, UDP_MAX)
+            if response is None:
+                continue
+            if self.latency > 0:
+                with self._pending_ready:
+                    self._pending_seq += 1
+                    heapq.heappush(self._pending, (time.monotonic() + self.latency, self._pending_seq, response, address))
+                    self._pending_ready.notify()
+            else:
+                self._sendto(response, address)
+
+    def _send_delayed(self):
+        # Une seule file d'attente : la latence simulée ne sérialise pas les requêtes
+        while self._running:
+            with self._pending_ready:
+                while self._running and (not self._pending or self._pending[0][0] > time.monotonic()):
+                    timeout = self._pending[0][0] - time.monotonic() if self._pending else None
+                    self._pending_ready.wait(timeout)
+                if not self._running:
+                    return
+                _, _, response, address = heapq.heappop(self._pending)
+            self._sendto(response, address)
+
+    def _sendto(self, response: bytes, address):
+        try:
+            self._udp.sendto(response, address)
+        except OSError:
+            pass
+
+    def _serve_tcp(self):
+        while self._running:
+            try:
+                connection, _ = self._tcp.accept()
+            except (socket.timeout, OSError):
+                continue
+            threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+    def _serve_connection(self, connection: socket.socket):
+        with connection:
+            connection.settimeout(2)
+            while self._running:
+                try:
+                    header = _recv_exact(connection, 2)
+                    if header is None:
+                        return
+                    wire = _recv_exact(connection, struct.unpack("!H", header)[0])
+                    if wire is None:
+                        return
+                except OSError:
+                    return
+                response = self.handle(wire)
+                if response is None:
+                    return
+                if self.latency > 0:
+                    time.sleep(self.latency)
+                try:
+                    connection.sendall(struct.pack("!H", len(response)) + response)
+                except OSError:
+                    return
+
+
+def _recv_exact(connection: socket.socket, size: int) -> Optional[bytes]:
+    data = b""
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+class ServerProcess:
+    """
+    AuthoritativeServer dans un processus séparé, pour que le serveur ne dispute pas le GIL
+    au moteur mesuré. Même interface que le serveur (host, port, queries, dropped) ;
+    les compteurs sont rapatriés à l'arrêt.
+    """
+
+    def __init__(self, zones: Iterable[dns.zone.Zone], host: str = "127.0.0.1", latency: float = 0.0,
+                 loss: float = 0.0, seed: int = 0):
+        self.host = host
+        self.port = None
+        self.queries = 0
+        self.dropped = 0
+        self._args = (list(zones), host, latency, loss, seed)
+
+    def start(self) -> "ServerProcess":
+        import multiprocessing
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve_forever, args=(child,) + self._args, daemon=True)
+        self._process.start()
+        self.port = self._conn.recv()
+        return self
+
+    def stop(self):
+        self._conn.send("stop")
+        self.queries, self.dropped = self._conn.recv()
+        self._process.join(timeout=5)
+
+    def __enter__(self) -> "ServerProcess":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def _serve_forever(conn, zones, host, latency, loss, seed):
+    server = AuthoritativeServer(zones, host=host, latency=latency, loss=loss, seed=seed).start()
+    conn.send(server.port)
+    conn.recv()
+    server.stop()
+    conn.send((server.queries, server.dropped))
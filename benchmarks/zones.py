@@ -0,0 +1,139 @@
+"""
+Zones synthétiques pour les benchmarks.
+
+ZoneBuilder accumule des enregistrements par zone ; les adresses ajoutées avec add_address
+alimentent automatiquement les zones inverses (in-addr.arpa par /24, ip6.arpa par /64).
+Les fonctions fanout, wildcard, spf_chain et ptr_block décrivent les formes de zones qui
+font travailler chaque stratégie.
+"""
+import ipaddress
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import dns.name
+import dns.reversename
+import dns.zone
+
+# Sous-ensemble des préfixes essayés par SubdomainStrategy, dans le même ordre
+HOST_LABELS = (
+    "www", "api", "dev", "test", "staging", "mail", "vpn", "remote", "gateway", "admin", "portal",
+    "smtp", "pop", "imap", "secure", "blog", "shop", "store", "app", "m",
+)
+
+
+class ZoneBuilder:
+    def __init__(self, ttl: int = 300, negative_ttl: int = 60):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._records: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+
+    def zone(self, origin: str) -> "ZoneBuilder":
+        """
+        Déclare une zone (même vide) : ses noms obtiendront NXDOMAIN plutôt que REFUSED.
+        """
+        self._records[origin.rstrip(".").lower()]
+        return self
+
+    def add(self, name: str, rdtype: str, value: str):
+        name = name.rstrip(".").lower()
+        self._records[self._origin_of(name)].append((name, rdtype, value))
+
+    def add_address(self, name: str, address: str, ptr: bool = True):
+        ip = ipaddress.ip_address(address)
+        self.add(name, "A" if ip.version == 4 else "AAAA", str(ip))
+        if ptr:
+            reverse = dns.reversename.from_address(str(ip)).to_text(omit_final_dot=True)
+            # Zone inverse du /24 ou du /64 de l'adresse
+            labels = reverse.split(".")
+            origin = ".".join(labels[1:] if ip.version == 4 else labels[16:])
+            self.zone(origin)
+            self.add(reverse, "PTR", name.rstrip(".") + ".")
+
+    def build(self) -> List[dns.zone.Zone]:
+        zones = []
+        for origin, records in self._records.items():
+            lines = [
+                f"$TTL {self.ttl}",
+                f"{origin}. IN SOA ns1.{origin}. hostmaster.{origin}. 1 3600 600 86400 {self.negative_ttl}",
+            ]
+            if not any(name == origin and rdtype == "NS" for name, rdtype, _ in records):
+                lines.append(f"{origin}. IN NS ns1.{origin}.")
+            for name, rdtype, value in records:
+                lines.append(f"{name}. IN {rdtype} {value}")
+            zones.append(dns.zone.from_text("\n".join(lines), origin=origin, relativize=False))
+        return zones
+
+    def _origin_of(self, name: str) -> str:
+        # Zone déclarée la plus spécifique contenant le nom
+        best = None
+        for origin in self._records:
+            if (name == origin or name.endswith("." + origin)) and (best is None or len(origin) > len(best)):
+                best = origin
+        if best is None:
+            raise ValueError(f"Aucune zone déclarée pour {name}")
+        return best
+
+
+def fanout(builder: ZoneBuilder, origin: str, width: int = 10, addresses: int = 2,
+           network: str = "192.0.2.0/24", ipv6: bool = True):
+    """
+    `width` hôtes sous origin (trouvables par SubdomainStrategy), chacun avec `addresses` adresses
+    et leurs PTR, plus NS, MX et une chaîne CNAME.
+    """
+    builder.zone(origin)
+    hosts = list(network_hosts(network))
+    builder.add(origin, "NS", f"ns1.{origin}.")
+    builder.add(origin, "NS", f"ns2.{origin}.")
+    builder.add(origin, "MX", f"10 mail.{origin}.")
+    builder.add_address(f"ns1.{origin}", str(hosts[0]))
+    builder.add_address(f"ns2.{origin}", str(hosts[1]))
+    builder.add_address(origin, str(hosts[2]))
+
+    labels = [label for label in HOST_LABELS if label != "m"][:width]
+    cursor = 3
+    for label in labels:
+        for _ in range(addresses):
+            builder.add_address(f"{label}.{origin}", str(hosts[cursor % len(hosts)]))
+            cursor += 1
+        if ipv6:
+            builder.add_address(f"{label}.{origin}", f"2001:db8::{cursor:x}")
+    if labels:
+        builder.add(f"m.{origin}", "CNAME", f"{labels[0]}.{origin}.")
+
+
+def wildcard(builder: ZoneBuilder, origin: str, address: str = "203.0.113.1"):
+    """
+    Joker : tout sous-domaine existe, le pire cas du brute-force de sous-domaines.
+    """
+    builder.zone(origin)
+    builder.add_address(origin, address)
+    builder.add(f"*.{origin}", "A", address)
+
+
+def spf_chain(builder: ZoneBuilder, origin: str, length: int = 8, network: str = "203.0.113.0/24"):
+    """
+    Chaîne d'include SPF de `length` maillons, chacun ajoutant un préfixe, plus un DMARC.
+    """
+    builder.zone(origin)
+    hosts = list(network_hosts(network))
+    builder.add(origin, "TXT", f'"v=spf1 mx include:_spf1.{origin} -all"')
+    for index in range(1, length + 1):
+        include = f" include:_spf{index + 1}.{origin}" if index < length else ""
+        builder.add(f"_spf{index}.{origin}", "TXT", f'"v=spf1 ip4:{hosts[index % len(hosts)]}/32 ip4:198.18.{index}.0/24{include} ~all"')
+    builder.add(f"_dmarc.{origin}", "TXT", f'"v=DMARC1; p=none; rua=mailto:reports@dmarc.{origin}"')
+    builder.add_address(f"dmarc.{origin}", str(hosts[0]))
+
+
+def ptr_block(builder: ZoneBuilder, origin: str, network: str = "198.51.100.0/24", count: int = 64, stride: int = 3):
+    """
+    `count` hôtes espacés de `stride` dans le réseau, avec leurs PTR : la matière des stratégies de voisinage.
+    """
+    builder.zone(origin)
+    hosts = list(network_hosts(network))
+    for index in range(count):
+        builder.add_address(f"host{index}.{origin}", str(hosts[(index * stride) % len(hosts)]))
+    builder.add(f"www.{origin}", "CNAME", f"host0.{origin}.")
+
+
+def network_hosts(network: str):
+    return ipaddress.ip_network(network).hosts()
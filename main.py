@@ -1,15 +1,24 @@
 import argparse
-from src.tui.rich_app import RichDNSApp
+import sys
 
 def main():
-    parser = argparse.ArgumentParser(description="DNS Scanner")
+    # Sous-commandes sans interface : imports minimaux pour un démarrage rapide
+    if len(sys.argv) > 1 and sys.argv[1] == "headless":
+        from src.headless import main as headless_main
+        return headless_main(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == "daemon":
+        from src.daemon.server import main as daemon_main
+        return daemon_main(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="DNS Scanner", epilog="Sous-commandes : headless, daemon (voir main.py headless -h)")
     parser.add_argument("domain", nargs="?", help="Choisit la cible du domaine à scanner")
     parser.add_argument("-d", "--depth", type=int, default=3, help="Profondeur de la récursion (par défaut : 3)")
     
     args = parser.parse_args()
     
+    from src.tui.rich_app import RichDNSApp
     app = RichDNSApp()
     app.run(domain=args.domain, depth=args.depth)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
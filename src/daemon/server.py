@@ -0,0 +1,293 @@
+"""
+Démon de scan : garde moteurs, stratégies et cache DNS chauds, et accepte des scans
+via une API HTTP locale (TCP ou socket Unix).
+
+    POST /scans               {"domain": "example.com", "depth": 3}  -> {"id": ..., "status": "queued"}
+    GET  /scans/<id>          état et statistiques du scan
+    GET  /scans/<id>/results  résultats en JSON Lines, diffusés au fil du scan
+    GET  /health              état du démon
+"""
+import argparse
+import codecs
+import json
+import os
+import queue
+import socketserver
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+from src.export.jsonl import JsonLinesExporter
+from src.models.graph import Node, NodeType
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """
+    Un scan soumis au démon. Les lignes JSON produites sont conservées pour
+    permettre à plusieurs clients de suivre le flux, même en cours de route :
+    en mémoire jusqu'à spool_size octets, puis dans un fichier temporaire.
+    """
+
+    # Taille du tampon en mémoire avant débordement sur disque
+    SPOOL_SIZE = 1 << 20
+    # Octets lus à la fois par chaque client du flux
+    READ_SIZE = 1 << 16
+
+    def __init__(self, domain: str, depth: int, spool_size: int = SPOOL_SIZE):
+        self.id = uuid.uuid4().hex[:12]
+        self.domain = domain
+        self.depth = depth
+        self.status = QUEUED
+        self.error: Optional[str] = None
+        self.stats: Dict = {}
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        # Fichier anonyme : supprimé à sa fermeture, au plus tard quand le Job est libéré
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=spool_size)
+        self._size = 0
+        self._cond = threading.Condition()
+
+    # Interface fichier pour JsonLinesExporter
+    def write(self, text: str):
+        data = text.encode("utf-8")
+        with self._cond:
+            self._buffer.seek(self._size)
+            self._buffer.write(data)
+            self._size += len(data)
+            self._cond.notify_all()
+
+    def flush(self):
+        pass
+
+    def finish(self, status: str, error: Optional[str] = None):
+        with self._cond:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+            self._cond.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def spooled(self) -> bool:
+        """Vrai si les résultats ont débordé sur disque."""
+        return self._buffer._rolled
+
+    def stream(self, timeout: float = 1.0):
+        """
+        Itère sur le texte produit, par blocs d'au plus READ_SIZE octets, en attendant
+        la suite jusqu'à la fin du scan. Chaque client lit à son rythme depuis sa propre position.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        offset = 0
+        while True:
+            with self._cond:
+                while offset >= self._size and not self.finished:
+                    self._cond.wait(timeout)
+                self._buffer.seek(offset)
+                data = self._buffer.read(min(self._size - offset, self.READ_SIZE))
+                finished = self.finished and offset + len(data) >= self._size
+            offset += len(data)
+            # Un bloc peut couper un caractère multi-octets : le décodeur garde la fin
+            text = decoder.decode(data, final=finished)
+            if text:
+                yield text
+            if finished:
+                return
+
+    def describe(self) -> Dict:
+        return {
+            "id": self.id,
+            "domain": self.domain,
+            "depth": self.depth,
+            "status": self.status,
+            "error": self.error,
+            "stats": self.stats,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ScanDaemon:
+    """
+    File de scans exécutés en parallèle sur un pool de moteurs préconstruits.
+    Chaque moteur n'exécute qu'un scan à la fois ; le cache DNS est partagé entre tous.
+    """
+
+    def __init__(self, workers: int = 4, strategies=None, max_depth: int = 3,
+                 cache_size: int = 100000, max_jobs: int = 1000,
+                 engine_factory: Optional[Callable] = None):
+        import dns.resolver
+        from src.strategies.registry import DEFAULT_STRATEGIES, build_engine
+
+        self.max_depth = max_depth
+        self.max_jobs = max_jobs
+        self.cache = dns.resolver.LRUCache(cache_size)
+        if engine_factory is None:
+            names = strategies or DEFAULT_STRATEGIES
+            engine_factory = lambda: build_engine(names, max_depth, cache=self.cache)
+
+        self._engines: "queue.Queue" = queue.Queue()
+        for _ in range(workers):
+            self._engines.put(engine_factory())
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, domain: str, depth: Optional[int] = None) -> Job:
+        job = Job(domain, depth if depth is not None else self.max_depth)
+        with self._lock:
+            self._jobs[job.id] = job
+            # Oublier les plus anciens scans terminés, sans s'arrêter à un scan encore en cours
+            excess = len(self._jobs) - self.max_jobs
+            if excess > 0:
+                evicted = [job_id for job_id, old in self._jobs.items() if old.finished][:excess]
+                for job_id in evicted:
+                    del self._jobs[job_id]
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def health(self) -> Dict:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"jobs": counts, "cache_entries": len(self.cache.data), "cache_hits": self.cache.hits}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: Job):
+        engine = self._engines.get()
+        exporter = JsonLinesExporter(job)
+        try:
+            job.status = RUNNING
+            engine.max_depth = job.depth
+            engine.add_listener(exporter)
+            try:
+                engine.scan(Node(value=job.domain, type=NodeType.DOMAIN))
+            finally:
+                engine.remove_listener(exporter)
+            job.stats = engine.get_stats()
+            exporter.close()
+            job.finish(DONE)
+        except Exception as e:
+            job.finish(FAILED, str(e))
+        finally:
+            self._engines.put(engine)
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.0 : le flux de résultats se termine à la fermeture de la connexion
+    protocol_version = "HTTP/1.0"
+    daemon: ScanDaemon = None
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["health"]:
+            return self._send_json(200, self.daemon.health())
+        if len(parts) in (2, 3) and parts[0] == "scans":
+            job = self.daemon.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": "scan inconnu"})
+            if len(parts) == 2:
+                return self._send_json(200, job.describe())
+            if parts[2] == "results":
+                return self._stream(job)
+        self._send_json(404, {"error": "introuvable"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/scans":
+            return self._send_json(404, {"error": "introuvable"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            domain = body["domain"]
+            depth = body.get("depth")
+            if depth is not None:
+                depth = int(depth)
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_json(400, {"error": f"requête invalide : {e}"})
+        job = self.daemon.submit(domain, depth)
+        self._send_json(202, job.describe())
+
+    def _stream(self, job: Job):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for text in job.stream():
+                self.wfile.write(text.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_json(self, status: int, payload: Dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Sur socket Unix, client_address est une chaîne vide
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(daemon: ScanDaemon, host: str = "127.0.0.1", port: int = 8053, unix_socket: Optional[str] = None):
+    handler = type("BoundDaemonRequestHandler", (DaemonRequestHandler,), {"daemon": daemon})
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        return ThreadingUnixHTTPServer(unix_socket, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DNS Scanner - démon")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute (par défaut : 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8053, help="Port d'écoute (par défaut : 8053)")
+    parser.add_argument("--socket", help="Écouter sur une socket Unix plutôt qu'en TCP")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Scans simultanés (par défaut : 4)")
+    parser.add_argument("-d", "--depth", type=int, default=3, help="Profondeur par défaut (par défaut : 3)")
+    parser.add_argument("-s", "--strategies", help="Stratégies, séparées par des virgules")
+    args = parser.parse_args(argv)
+
+    from src.strategies.registry import parse_names
+    daemon = ScanDaemon(workers=args.workers, strategies=parse_names(args.strategies), max_depth=args.depth)
+    server = make_server(daemon, args.host, args.port, args.socket)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.shutdown()
+
+
+if __name__ == "__main__":
+    main()
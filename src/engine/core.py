@@ -1,66 +1,188 @@
-from typing import Set, List, Optional
+from collections import Counter
+from typing import List, Optional, Tuple
+from src.engine.events import ScanListener
+from src.engine.metrics import ScanMetrics
+from src.engine.resolver import ObservedResolver
+from src.engine.retry import NegativeCache, RetryPolicy
 from src.models.graph import Node, Edge
+from src.models.store import GraphStore
 from src.strategies.base import Strategy
 
 class ScannerEngine:
-    def __init__(self, max_depth: int = 3):
-        self.nodes: Set[Node] = set()
-        self.edges: Set[Edge] = set()
-        self.visited: Set[Node] = set() 
+    def __init__(self, max_depth: int = 3, instrument: bool = True,
+                 retry: Optional[RetryPolicy] = None, negative_cache: Optional[NegativeCache] = None,
+                 store=None):
+        # Graphe interné : nodes, edges et visited sont des vues sur ce store
+        # (ex: src.storage.spill.SpillGraphStore pour un crawl à mémoire bornée)
+        self.store = store if store is not None else GraphStore()
         self.max_depth = max_depth
         self.strategies: List[Strategy] = []
+        self.listeners: List[ScanListener] = []
+        # Compteurs par stratégie et par rdtype, exposés par get_stats()
+        self.metrics = ScanMetrics() if instrument else None
+        if self.metrics is not None:
+            self.listeners.append(self.metrics)
+        # Relances des échecs transitoires et cache des réponses négatives, partagés par les stratégies
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.negative_cache = negative_cache if negative_cache is not None else NegativeCache()
+        # Nœuds en attente d'expansion par profondeur, et demande d'arrêt (cancel)
+        self.frontier: Counter = Counter()
+        self.cancelled = False
+
+    @property
+    def nodes(self):
+        return self.store.nodes
+
+    @property
+    def edges(self):
+        return self.store.edges
+
+    @property
+    def visited(self):
+        return self.store.visited
 
     def register_strategy(self, strategy: Strategy):
+        # Les requêtes de la stratégie sont observées pour les listeners (on_query)
+        resolver = getattr(strategy, "resolver", None)
+        if resolver is not None and not isinstance(resolver, ObservedResolver):
+            strategy.resolver = ObservedResolver(resolver, type(strategy).__name__, self.listeners,
+                                                 retry=self.retry, negative_cache=self.negative_cache)
         self.strategies.append(strategy)
 
+    def add_listener(self, listener: ScanListener):
+        """
+        Abonne un listener aux événements du scan (nœuds et arêtes au fil de l'eau).
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: ScanListener):
+        self.listeners.remove(listener)
+
     def scan(self, root_node: Node):
         """
         Scanne à partir de root_node en utilisant une pile itérative (DFS).
         """
-        self.nodes.clear()
-        self.edges.clear()
-        self.visited.clear()
-        
-        self.nodes.add(root_node)
-        
-        # La pile stocke des tuples de (Node, profondeur)
-        stack = [(root_node, 0)]
-        
-        while stack:
-            node, depth = stack.pop()
-            
+        self.store.clear()
+        self.retry.reset()
+        self.cancelled = False
+
+        for listener in self.listeners:
+            listener.on_scan_start(root_node)
+
+        # La pile stocke des tuples de (id du nœud, profondeur)
+        self.crawl([(self.add_node(root_node), 0)])
+
+        for listener in self.listeners:
+            listener.on_scan_end()
+
+    def cancel(self):
+        """
+        Demande l'arrêt du scan en cours (depuis un autre thread) : le nœud en cours d'expansion
+        est terminé, le graphe partiel est conservé.
+        """
+        self.cancelled = True
+
+    def crawl(self, stack: List[Tuple[int, int]]):
+        """
+        Poursuit l'exploration à partir d'une pile de (id du nœud, profondeur), sans réinitialiser le graphe.
+        Les nœuds déjà visités ne sont pas réexplorés.
+        """
+        store = self.store
+        frontier = self.frontier
+        for _, depth in stack:
+            frontier[depth] += 1
+        while stack and not self.cancelled:
+            node_id, depth = stack.pop()
+            frontier[depth] -= 1
+
             if depth >= self.max_depth:
                 continue
-            
-            if node in self.visited:
+
+            if not store.mark_visited(node_id):
                 continue
-            self.visited.add(node)
-            
+            node = store.node(node_id)
+
+            for listener in self.listeners:
+                listener.on_expand_start(node, depth)
+
             # Exécuter les stratégies
             new_edges = []
             for strategy in self.strategies:
-                try:
-                    results = strategy.execute(node)
-                    for _, edge in results:
-                        new_edges.append(edge)
-                except Exception:
-                    pass 
-            
+                new_edges.extend(self.run_strategy(strategy, node))
+
+            for listener in self.listeners:
+                listener.on_expand_end(node)
+
             # Traiter les résultats
             # Nous itérons en sens inverse pour maintenir l'ordre lors de l'ajout à la pile (optionnel mais sympa)
             for edge in reversed(new_edges):
-                if edge not in self.edges:
-                    self.edges.add(edge)
-                    target = edge.target
-                    if target not in self.nodes:
-                        self.nodes.add(target)
-                    
+                is_new, target_id = self.add_edge(edge)
+                if is_new:
                     # Ajouter à la pile
-                    stack.append((target, depth + 1))
+                    stack.append((target_id, depth + 1))
+                    frontier[depth + 1] += 1
+        frontier.clear()
+
+    def run_strategy(self, strategy: Strategy, node: Node) -> List[Edge]:
+        """
+        Exécute une stratégie sur un nœud et retourne les arêtes produites.
+        Les exceptions de la stratégie sont avalées (et signalées aux listeners).
+        """
+        listeners = self.listeners
+        resolver = getattr(strategy, "resolver", None)
+        if isinstance(resolver, ObservedResolver):
+            resolver.reset()
+        else:
+            resolver = None
+
+        for listener in listeners:
+            listener.on_strategy_start(strategy, node)
+
+        edges = []
+        error = None
+        try:
+            for _, edge in strategy.execute(node):
+                edges.append(edge)
+                if listeners:
+                    query = resolver.last_event if resolver is not None else None
+                    for listener in listeners:
+                        listener.on_result(strategy, node, edge, query)
+        except Exception as e:
+            error = e
+
+        for listener in listeners:
+            listener.on_strategy_end(strategy, node, error)
+        return edges
+
+    def add_node(self, node: Node) -> int:
+        node_id, is_new = self.store.add_node(node)
+        if is_new:
+            for listener in self.listeners:
+                listener.on_node(node)
+        return node_id
+
+    def add_edge(self, edge: Edge) -> Tuple[bool, int]:
+        """
+        Ajoute une arête au graphe. Retourne (nouvelle ?, id de la cible).
+        """
+        source_id = self.add_node(edge.source)
+        target_id = self.add_node(edge.target)
+        is_new = self.store.add_edge_ids(source_id, target_id, edge.type)
+        if is_new:
+            for listener in self.listeners:
+                listener.on_edge(edge)
+        return is_new, target_id
 
     def get_stats(self):
-        return {
+        stats = {
             "nodes": len(self.nodes),
             "edges": len(self.edges),
-            "visited": len(self.visited)
+            "visited": len(self.visited),
+            "retries": {**self.retry.stats(), "negative_hits": self.negative_cache.hits},
         }
+        store_stats = getattr(self.store, "stats", None)
+        if store_stats is not None:
+            stats["store"] = store_stats()
+        if self.metrics is not None:
+            stats["strategies"] = self.metrics.snapshot()
+        return stats
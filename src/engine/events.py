@@ -0,0 +1,49 @@
+from src.models.graph import Node, Edge
+
+class ScanListener:
+    """
+    Reçoit les événements d'un scan au fil de l'eau.
+    Toutes les méthodes sont optionnelles : les sous-classes ne surchargent que ce qui les intéresse.
+    """
+    def on_scan_start(self, root: Node):
+        pass
+
+    def on_node(self, node: Node):
+        """Un nouveau nœud vient d'être découvert."""
+        pass
+
+    def on_edge(self, edge: Edge):
+        """Une nouvelle arête vient d'être ajoutée (ses deux nœuds ont déjà été signalés)."""
+        pass
+
+    def on_expand_start(self, node: Node, depth: int):
+        """Début de l'expansion d'un nœud (exécution de toutes les stratégies)."""
+        pass
+
+    def on_expand_end(self, node: Node):
+        pass
+
+    def on_strategy_start(self, strategy, node: Node):
+        pass
+
+    def on_strategy_end(self, strategy, node: Node, error: Exception = None):
+        """Fin d'exécution d'une stratégie sur un nœud ; error est l'exception avalée, le cas échéant."""
+        pass
+
+    def on_query_start(self, strategy: str, qname: str, rdtype: str):
+        """Une requête (ou une tentative) part ; suivie d'un on_query à son aboutissement."""
+        pass
+
+    def on_query(self, event):
+        """Une requête DNS d'une stratégie a abouti (QueryEvent, voir src.engine.resolver)."""
+        pass
+
+    def on_result(self, strategy, node: Node, edge: Edge, query=None):
+        """
+        Une stratégie a produit une arête (nouvelle ou non). query est le dernier QueryEvent
+        émis par la stratégie avant ce résultat, c'est-à-dire sa provenance probable.
+        """
+        pass
+
+    def on_scan_end(self):
+        pass
@@ -0,0 +1,177 @@
+import json
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+from src.engine.events import ScanListener
+from src.engine.resolver import OUTCOMES, QueryEvent
+from src.models.graph import Node, Edge
+
+# Bornes supérieures (secondes) des tranches de l'histogramme de latence
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class QueryStats:
+    """
+    Compteurs d'une paire (stratégie, rdtype).
+    """
+    __slots__ = ("queries", "cache_hits", "retries", "outcomes", "buckets", "latency_sum")
+
+    def __init__(self):
+        self.queries = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.outcomes: Counter = Counter()
+        # Une tranche de plus pour +Inf
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+
+    @property
+    def wire_queries(self) -> int:
+        return self.queries - self.cache_hits
+
+    def to_dict(self) -> Dict:
+        cumulative = []
+        total = 0
+        for count in self.buckets:
+            total += count
+            cumulative.append(total)
+        return {
+            "queries": self.queries,
+            "wire_queries": self.wire_queries,
+            "cache_hits": self.cache_hits,
+            "retries": self.retries,
+            "outcomes": {outcome: self.outcomes.get(outcome, 0) for outcome in OUTCOMES},
+            "latency": {
+                "sum": round(self.latency_sum, 6),
+                "buckets": {str(bound): count for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), cumulative)},
+            },
+        }
+
+
+class ScanMetrics(ScanListener):
+    """
+    Instrumentation par stratégie et par rdtype : requêtes envoyées, hits de cache, classes de
+    résultat, histogrammes de latence et rendement (arêtes produites par requête).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.queries: Dict[Tuple[str, str], QueryStats] = defaultdict(QueryStats)
+        self.runs: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.results: Counter = Counter()
+
+    # --- Événements du moteur ---
+
+    def on_scan_start(self, root: Node):
+        self.reset()
+
+    def on_query(self, event: QueryEvent):
+        with self._lock:
+            stats = self.queries[(event.strategy, event.rdtype)]
+            stats.queries += 1
+            stats.outcomes[event.outcome] += 1
+            if event.attempt > 1:
+                stats.retries += 1
+            if event.cached:
+                stats.cache_hits += 1
+            else:
+                # La latence d'un hit de cache ne dit rien du réseau
+                stats.buckets[bisect_left(LATENCY_BUCKETS, event.elapsed)] += 1
+                stats.latency_sum += event.elapsed
+
+    def on_strategy_end(self, strategy, node: Node, error: Exception = None):
+        name = type(strategy).__name__
+        self.runs[name] += 1
+        if error is not None:
+            self.errors[name] += 1
+
+    def on_result(self, strategy, node: Node, edge: Edge, query=None):
+        self.results[type(strategy).__name__] += 1
+
+    # --- Exports ---
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            strategies: Dict[str, Dict] = {}
+            names = set(self.runs) | {strategy for strategy, _ in self.queries}
+            for name in sorted(names):
+                by_rdtype = {
+                    rdtype: stats.to_dict()
+                    for (strategy, rdtype), stats in sorted(self.queries.items())
+                    if strategy == name
+                }
+                wire = sum(entry["wire_queries"] for entry in by_rdtype.values())
+                strategies[name] = {
+                    "runs": self.runs.get(name, 0),
+                    "errors": self.errors.get(name, 0),
+                    "results": self.results.get(name, 0),
+                    "wire_queries": wire,
+                    "results_per_query": round(self.results.get(name, 0) / wire, 4) if wire else None,
+                    "rdtypes": by_rdtype,
+                }
+            return strategies
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "dns_checker") -> str:
+        """
+        Format d'exposition texte de Prometheus.
+        """
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        with self._lock:
+            items = sorted(self.queries.items())
+
+            family("queries_total", "counter", "Requêtes DNS par stratégie, rdtype et résultat.")
+            for (strategy, rdtype), stats in items:
+                for outcome in OUTCOMES:
+                    labels = _labels(strategy=strategy, rdtype=rdtype, outcome=outcome)
+                    lines.append(f"{prefix}_queries_total{labels} {stats.outcomes.get(outcome, 0)}")
+
+            family("cache_hits_total", "counter", "Requêtes servies par le cache du resolver.")
+            for (strategy, rdtype), stats in items:
+                lines.append(f"{prefix}_cache_hits_total{_labels(strategy=strategy, rdtype=rdtype)} {stats.cache_hits}")
+
+            family("retries_total", "counter", "Relances après un échec transitoire.")
+            for (strategy, rdtype), stats in items:
+                lines.append(f"{prefix}_retries_total{_labels(strategy=strategy, rdtype=rdtype)} {stats.retries}")
+
+            family("query_duration_seconds", "histogram", "Latence des requêtes envoyées sur le réseau.")
+            for (strategy, rdtype), stats in items:
+                total = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    total += count
+                    labels = _labels(strategy=strategy, rdtype=rdtype, le=str(bound))
+                    lines.append(f"{prefix}_query_duration_seconds_bucket{labels} {total}")
+                labels = _labels(strategy=strategy, rdtype=rdtype)
+                lines.append(f"{prefix}_query_duration_seconds_sum{labels} {stats.latency_sum:.6f}")
+                lines.append(f"{prefix}_query_duration_seconds_count{labels} {total}")
+
+            for name, counter, help_text in (
+                ("strategy_runs_total", self.runs, "Exécutions de chaque stratégie."),
+                ("strategy_errors_total", self.errors, "Exceptions levées par chaque stratégie."),
+                ("strategy_results_total", self.results, "Arêtes produites par chaque stratégie."),
+            ):
+                family(name, "counter", help_text)
+                for strategy in sorted(set(self.runs) | set(counter)):
+                    lines.append(f"{prefix}_{name}{_labels(strategy=strategy)} {counter.get(strategy, 0)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
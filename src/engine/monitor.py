@@ -0,0 +1,276 @@
+import heapq
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from src.engine.core import ScannerEngine
+from src.engine.events import ScanListener
+from src.engine.resolver import NOERROR, NXDOMAIN, NODATA, QueryEvent
+from src.models.graph import Node, Edge
+
+ADDED = "added"
+REMOVED = "removed"
+
+# (nœud, indice de la stratégie dans engine.strategies) : une exécution de stratégie est la plus
+# petite unité rejouable (ses requêtes s'enchaînent et son interprétation des réponses lui est
+# propre) ; les (qname, rdtype) émis sont gardés comme provenance des arêtes.
+Key = Tuple[Node, int]
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    action: str  # ADDED ou REMOVED
+    edge: Edge
+    qname: Optional[str] = None
+    rdtype: Optional[str] = None
+
+
+class ScanMonitor(ScanListener):
+    """
+    Surveillance continue d'un scan, pilotée par les TTL.
+    Chaque exécution (nœud, stratégie) est replanifiée à l'expiration du plus petit TTL
+    des requêtes qu'elle a émises ; seules les exécutions expirées sont rejouées, et seuls
+    les sous-graphes dont les réponses ont changé sont réexplorés.
+    """
+
+    def __init__(self, engine: ScannerEngine, min_ttl: float = 30, max_ttl: float = 86400,
+                 default_ttl: float = 300, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.engine = engine
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.sleep = sleep
+        self.handlers: List[Callable[[ChangeEvent], None]] = []
+        self.refreshes = 0
+        self._running = False
+        # Vrai pendant un rafraîchissement : chaque nouvelle arête, y compris celles trouvées
+        # en réexplorant, donne un événement ADDED
+        self._refreshing = False
+        self._reset()
+        engine.add_listener(self)
+
+    def _reset(self):
+        # Échéancier : (échéance, numéro de séquence, clé) ; les entrées périmées sont ignorées
+        self._heap: List[Tuple[float, int, Key]] = []
+        self._seq = 0
+        self._scheduled: Dict[Key, int] = {}
+        self._produced: Dict[Key, Set[Edge]] = {}
+        self._owners: Counter = Counter()
+        self._provenance: Dict[Edge, Tuple[str, str, Optional[int]]] = {}
+        self._depth: Dict[Node, int] = {}
+        self._root: Optional[Node] = None
+        self._current: Optional[Key] = None
+        self._current_ttl: Optional[float] = None
+        self._current_edges: Set[Edge] = set()
+        self._orphans: List[Edge] = []
+
+    def add_handler(self, handler: Callable[[ChangeEvent], None]):
+        self.handlers.append(handler)
+
+    def provenance(self, edge: Edge) -> Optional[Tuple[str, str, Optional[int]]]:
+        """
+        (qname, rdtype, ttl) de la requête ayant produit l'arête, si connue.
+        """
+        return self._provenance.get(edge)
+
+    def next_due(self) -> Optional[float]:
+        while self._heap and self._scheduled.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # --- Boucle de surveillance ---
+
+    def start(self, root: Node):
+        """
+        Scan initial : remplit l'échéancier.
+        """
+        self.engine.scan(root)
+
+    def run(self, duration: Optional[float] = None):
+        """
+        Rejoue les exécutions expirées jusqu'à stop() ou l'écoulement de duration secondes.
+        """
+        self._running = True
+        deadline = None if duration is None else self.clock() + duration
+        while self._running:
+            due = self.next_due()
+            if due is None:
+                break
+            now = self.clock()
+            if due <= now:
+                self.run_pending()
+                continue
+            if deadline is not None and now >= deadline:
+                break
+            self.sleep((due if deadline is None else min(due, deadline)) - now)
+        self._running = False
+
+    def stop(self):
+        self._running = False
+
+    def run_pending(self) -> int:
+        """
+        Rejoue toutes les exécutions arrivées à échéance. Retourne leur nombre.
+        """
+        count = 0
+        now = self.clock()
+        while True:
+            due = self.next_due()
+            if due is None or due > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            del self._scheduled[key]
+            self.refresh(key)
+            count += 1
+        return count
+
+    def refresh(self, key: Key):
+        node, strategy_index = key
+        engine = self.engine
+        self.refreshes += 1
+        self._refreshing = True
+        try:
+            # Les hooks on_strategy_* mettent à jour _produced et replanifient la clé
+            edges = engine.run_strategy(engine.strategies[strategy_index], node)
+
+            stack = []
+            depth = self._depth.get(node, 0)
+            for edge in edges:
+                is_new, target_id = engine.add_edge(edge)
+                if is_new:
+                    stack.append((target_id, depth + 1))
+
+            # Arêtes que plus aucune exécution ne produit
+            removed = False
+            for edge in self._orphans:
+                removed |= self._remove_edge(edge)
+            self._orphans = []
+            if removed:
+                self._prune_unreachable()
+
+            # Réexplorer uniquement ce qui vient d'apparaître
+            engine.crawl(stack)
+        finally:
+            self._refreshing = False
+
+    def _remove_edge(self, edge: Edge) -> bool:
+        store = self.engine.store
+        source_id = store.node_id(edge.source)
+        target_id = store.node_id(edge.target)
+        removed = source_id is not None and target_id is not None and store.remove_edge_ids(source_id, target_id, edge.type)
+        if removed:
+            self._emit(REMOVED, edge)
+        self._provenance.pop(edge, None)
+        return removed
+
+    def _prune_unreachable(self):
+        """
+        Retire les sous-graphes que plus rien ne relie à la racine : leurs arêtes sont supprimées
+        (événements REMOVED) et leurs exécutions déplanifiées, pour que le coût suive le
+        renouvellement du parc et non son historique. Parcours sans requête, seulement après une suppression.
+        """
+        store = self.engine.store
+        root_id = store.node_id(self._root) if self._root is not None else None
+        if root_id is None:
+            return
+        reachable = {root_id}
+        stack = [root_id]
+        while stack:
+            for index in store.out_edges(stack.pop()):
+                target_id = store.edge_ids(index)[1]
+                if target_id not in reachable:
+                    reachable.add(target_id)
+                    stack.append(target_id)
+
+        dead = {node for node in self._depth if store.node_id(node) not in reachable}
+        if not dead:
+            return
+        for node in dead:
+            node_id = store.node_id(node)
+            del self._depth[node]
+            if node_id is None:
+                continue
+            for index in list(store.out_edges(node_id)):
+                self._remove_edge(store.edge(index))
+            # Un nœud qui réapparaîtra devra être redéveloppé
+            store.unmark_visited(node_id)
+        for key in [key for key in self._produced if key[0] in dead]:
+            for edge in self._produced.pop(key):
+                self._owners[edge] -= 1
+                if self._owners[edge] <= 0:
+                    del self._owners[edge]
+        # Les entrées du tas deviennent périmées et sont ignorées par next_due()
+        for key in [key for key in self._scheduled if key[0] in dead]:
+            del self._scheduled[key]
+
+    def _emit(self, action: str, edge: Edge):
+        qname, rdtype, _ = self._provenance.get(edge, (None, None, None))
+        event = ChangeEvent(action=action, edge=edge, qname=qname, rdtype=rdtype)
+        for handler in self.handlers:
+            handler(event)
+
+    def _schedule(self, key: Key, ttl: float):
+        self._seq += 1
+        self._scheduled[key] = self._seq
+        heapq.heappush(self._heap, (self.clock() + ttl, self._seq, key))
+
+    # --- Événements du moteur ---
+
+    def on_scan_start(self, root: Node):
+        self._reset()
+        self._root = root
+        self._depth[root] = 0
+
+    def on_edge(self, edge: Edge):
+        if self._refreshing:
+            self._emit(ADDED, edge)
+
+    def on_strategy_start(self, strategy, node: Node):
+        self._current = (node, self.engine.strategies.index(strategy))
+        self._current_ttl = None
+        self._current_edges = set()
+
+    def on_query(self, event: QueryEvent):
+        if self._current is None:
+            return
+        if event.outcome in (NOERROR, NXDOMAIN, NODATA):
+            ttl = event.ttl if event.ttl is not None else self.default_ttl
+        else:
+            # Échec transitoire : réessayer au plus tôt
+            ttl = self.min_ttl
+        ttl = max(self.min_ttl, min(self.max_ttl, ttl))
+        if self._current_ttl is None or ttl < self._current_ttl:
+            self._current_ttl = ttl
+
+    def on_result(self, strategy, node: Node, edge: Edge, query: QueryEvent = None):
+        self._current_edges.add(edge)
+        self._depth.setdefault(edge.target, self._depth.get(node, 0) + 1)
+        if query is not None:
+            self._provenance[edge] = (query.qname, query.rdtype, query.ttl)
+
+    def on_strategy_end(self, strategy, node: Node, error: Exception = None):
+        key = self._current
+        if key is None:
+            return
+        self._current = None
+
+        old = self._produced.get(key, set())
+        new = self._current_edges
+        self._produced[key] = new
+        for edge in new - old:
+            self._owners[edge] += 1
+        for edge in old - new:
+            self._owners[edge] -= 1
+            if self._owners[edge] <= 0:
+                del self._owners[edge]
+                self._orphans.append(edge)
+
+        ttl = self._current_ttl
+        if ttl is None:
+            # Stratégie sans requête observée (ex: ParentStrategy) : rien à rafraîchir
+            if not hasattr(strategy, "resolver"):
+                return
+            ttl = self.default_ttl
+        self._schedule(key, ttl)
@@ -0,0 +1,247 @@
+import copy
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+# Classes de résultat d'une requête DNS
+NOERROR = "NOERROR"
+NXDOMAIN = "NXDOMAIN"
+NODATA = "NODATA"
+SERVFAIL = "SERVFAIL"
+TIMEOUT = "TIMEOUT"
+ERROR = "ERROR"
+REFUSED = "REFUSED"
+
+# Ajouts en fin de tuple uniquement : les transcriptions enregistrent l'indice
+OUTCOMES = (NOERROR, NXDOMAIN, NODATA, SERVFAIL, TIMEOUT, ERROR, REFUSED)
+
+
+@dataclass
+class QueryEvent:
+    """
+    Une requête émise par une stratégie et son résultat.
+    """
+    strategy: str
+    qname: str
+    rdtype: str
+    outcome: str
+    ttl: Optional[int]
+    elapsed: float
+    answer: Any = None
+    error: Optional[BaseException] = None
+    cached: bool = False
+    attempt: int = 1
+    # Serveur amont qui a répondu (ou le dernier essayé en cas d'échec), si connu
+    server: Optional[str] = None
+
+
+def classify(error: Optional[BaseException]) -> str:
+    if error is None:
+        return NOERROR
+    # Imports différés : dnspython n'est chargé que si une stratégie s'en sert
+    import dns.exception
+    import dns.resolver
+    if isinstance(error, dns.resolver.NXDOMAIN):
+        return NXDOMAIN
+    if isinstance(error, dns.resolver.NoAnswer):
+        return NODATA
+    if isinstance(error, dns.resolver.NoNameservers):
+        # Refus de tous les serveurs : permanent ; sinon (SERVFAIL, erreurs réseau) transitoire
+        return REFUSED if is_refused(error) else SERVFAIL
+    if isinstance(error, dns.exception.Timeout):
+        return TIMEOUT
+    return ERROR
+
+
+def is_refused(error: BaseException) -> bool:
+    """
+    NoNameservers dont chaque serveur a répondu REFUSED (kwargs["errors"] : (serveur, tcp, port, erreur, réponse)).
+    """
+    import dns.rcode
+    try:
+        errors = error.kwargs.get("errors") or []
+    except AttributeError:
+        return False
+    if not errors:
+        return False
+    for entry in errors:
+        response = entry[4] if len(entry) > 4 else None
+        rcode = response.rcode() if hasattr(response, "rcode") else None
+        if rcode != dns.rcode.REFUSED and str(entry[3]) != "REFUSED":
+            return False
+    return True
+
+
+def negative_ttl(error: BaseException) -> Optional[int]:
+    """
+    Durée de cache d'une réponse négative (RFC 2308) : min(TTL, MINIMUM) du SOA de la section autorité.
+    """
+    import dns.rdatatype
+    import dns.resolver
+    try:
+        if isinstance(error, dns.resolver.NXDOMAIN):
+            responses = list(error.kwargs.get("responses", {}).values())
+        else:
+            responses = [error.kwargs.get("response")]
+    except AttributeError:
+        return None
+    for response in responses:
+        for rrset in getattr(response, "authority", None) or []:
+            if rrset.rdtype == dns.rdatatype.SOA:
+                return min(rrset.ttl, rrset[0].minimum)
+    return None
+
+
+def upstream(answer, error: Optional[BaseException], inner) -> Optional[str]:
+    """
+    Serveur amont d'une requête : celui de la réponse, sinon le dernier essayé d'après l'erreur,
+    sinon le premier serveur configuré.
+    """
+    server = getattr(answer, "nameserver", None)
+    if server is None and error is not None:
+        try:
+            errors = error.kwargs.get("errors") or []
+        except AttributeError:
+            errors = []
+        if errors:
+            server = errors[-1][0]
+    if server is None:
+        nameservers = getattr(inner, "nameservers", None) or []
+        server = nameservers[0] if nameservers else None
+    return None if server is None else str(server)
+
+
+def _rdtype_text(rdtype) -> str:
+    import dns.rdatatype
+    return dns.rdatatype.to_text(rdtype)
+
+
+class ObservedResolver:
+    """
+    Enveloppe un dns.resolver.Resolver : chaque resolve() est chronométré, classé et signalé
+    aux listeners (on_query). Les autres attributs (lifetime, nameservers, cache...) sont
+    délégués au resolver d'origine.
+
+    Avec une RetryPolicy, les échecs transitoires sont relancés (chaque tentative est signalée) ;
+    avec un NegativeCache, les NXDOMAIN / NODATA sont mémorisés et resservis sans requête.
+    """
+    _OWN = ("inner", "strategy", "listeners", "retry", "negative_cache", "_local")
+
+    def __init__(self, inner, strategy: str, listeners: List, retry=None, negative_cache=None):
+        object.__setattr__(self, "inner", inner)
+        object.__setattr__(self, "strategy", strategy)
+        object.__setattr__(self, "listeners", listeners)
+        object.__setattr__(self, "retry", retry)
+        object.__setattr__(self, "negative_cache", negative_cache)
+        object.__setattr__(self, "_local", threading.local())
+
+    @property
+    def last_event(self) -> Optional[QueryEvent]:
+        """
+        Dernière requête émise par le thread courant (provenance des résultats d'une stratégie).
+        """
+        return getattr(self._local, "event", None)
+
+    def reset(self):
+        self._local.event = None
+
+    def resolve(self, qname, rdtype="A", *args, **kwargs):
+        rdtype_text = rdtype if isinstance(rdtype, str) else _rdtype_text(rdtype)
+        negative = self.negative_cache
+        if negative is not None:
+            key = str(qname).lower().rstrip(".")
+            hit = negative.get(key, rdtype_text)
+            if hit is not None:
+                outcome, ttl, error = hit
+                self._start(qname, rdtype_text)
+                self._emit(QueryEvent(self.strategy, str(qname), rdtype_text, outcome, ttl, 0.0,
+                                      error=error, cached=True))
+                # Copie neuve : relancer l'objet en cache allongerait sa trace à chaque hit
+                raise copy.copy(error)
+
+        attempt = 1
+        while True:
+            cached = self._is_cached(qname, rdtype)
+            self._start(qname, rdtype_text)
+            start = time.perf_counter()
+            try:
+                answer = self.inner.resolve(qname, rdtype, *args, **kwargs)
+            except Exception as e:
+                event = self._notify(qname, rdtype, None, e, time.perf_counter() - start, cached, attempt)
+                if negative is not None:
+                    negative.put(key, rdtype_text, event.outcome, event.ttl, e)
+                if self.retry is not None and self.retry.should_retry(event.outcome, attempt):
+                    self.retry.wait(attempt)
+                    attempt += 1
+                    continue
+                raise
+            self._notify(qname, rdtype, answer, None, time.perf_counter() - start, cached, attempt)
+            return answer
+
+    def _is_cached(self, qname, rdtype) -> bool:
+        """
+        La réponse sera-t-elle servie par le cache du resolver (sans requête sur le réseau) ?
+        Consulte directement le dict du cache pour ne pas fausser ses statistiques ni son ordre LRU.
+        """
+        cache = getattr(self.inner, "cache", None)
+        data = getattr(cache, "data", None)
+        if not data:
+            return False
+        import dns.name
+        import dns.rdataclass
+        import dns.rdatatype
+        try:
+            name = qname if isinstance(qname, dns.name.Name) else dns.name.from_text(qname)
+            key = (name, dns.rdatatype.RdataType.make(rdtype), dns.rdataclass.IN)
+        except Exception:
+            return False
+        entry = data.get(key)
+        if entry is None:
+            return False
+        # LRUCache stocke des nœuds de liste chaînée, Cache directement les réponses
+        entry = getattr(entry, "value", entry)
+        return getattr(entry, "expiration", 0) > time.time()
+
+    def _notify(self, qname, rdtype, answer, error, elapsed, cached=False, attempt=1) -> QueryEvent:
+        if error is None:
+            rrset = getattr(answer, "rrset", None)
+            ttl = getattr(rrset, "ttl", None)
+        else:
+            ttl = negative_ttl(error)
+        event = QueryEvent(
+            strategy=self.strategy,
+            qname=str(qname),
+            rdtype=rdtype if isinstance(rdtype, str) else _rdtype_text(rdtype),
+            outcome=classify(error),
+            ttl=ttl if isinstance(ttl, int) else None,
+            elapsed=elapsed,
+            answer=answer,
+            error=error,
+            cached=cached,
+            attempt=attempt,
+            server=None if cached else upstream(answer, error, self.inner),
+        )
+        self._emit(event)
+        return event
+
+    def _start(self, qname, rdtype_text: str):
+        for listener in self.listeners:
+            listener.on_query_start(self.strategy, str(qname), rdtype_text)
+
+    def _emit(self, event: QueryEvent):
+        self._local.event = event
+        for listener in self.listeners:
+            listener.on_query(event)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def __setattr__(self, name, value):
+        if name in self._OWN:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.inner, name, value)
+
+    def __delattr__(self, name):
+        delattr(self.inner, name)
@@ -0,0 +1,128 @@
+"""
+Politique de relance des requêtes DNS, selon la classe du résultat.
+
+Seuls les échecs transitoires (TIMEOUT, SERVFAIL) sont relancés, avec un délai exponentiel
+et une gigue, dans la limite d'un budget par scan. Les négatifs faisant autorité (NXDOMAIN,
+NODATA) et les refus (REFUSED) ne sont jamais relancés : ils vont dans un cache négatif qui
+court-circuite les requêtes identiques jusqu'à expiration.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from src.engine.resolver import NXDOMAIN, NODATA, REFUSED, SERVFAIL, TIMEOUT
+
+
+class RetryPolicy:
+    """
+    max_attempts : nombre total de tentatives par requête (1 = pas de relance).
+    budget : nombre total de relances autorisées par scan (None = illimité).
+    Le délai avant la tentative n est tiré dans [0, min(max_delay, base_delay * 2^(n-2))] ("full jitter").
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, max_delay: float = 2.0,
+                 budget: Optional[int] = 200, retry_on: Iterable[str] = (TIMEOUT, SERVFAIL),
+                 sleep: Callable[[float], None] = time.sleep, rng: Callable[[], float] = random.random):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retry_on = frozenset(retry_on)
+        self.sleep = sleep
+        self.rng = rng
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Nouveau scan : le budget est rechargé.
+        """
+        with self._lock:
+            self.retries = 0
+            self.exhausted = 0
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.budget is None else max(0, self.budget - self.retries)
+
+    def should_retry(self, outcome: str, attempt: int) -> bool:
+        """
+        La tentative `attempt` (1 = première) a échoué avec `outcome` : faut-il recommencer ?
+        Consomme une unité du budget si oui.
+        """
+        if outcome not in self.retry_on or attempt >= self.max_attempts:
+            return False
+        with self._lock:
+            if self.budget is not None and self.retries >= self.budget:
+                self.exhausted += 1
+                return False
+            self.retries += 1
+        return True
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Délai avant la tentative attempt + 1.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling * self.rng()
+
+    def wait(self, attempt: int):
+        delay = self.backoff(attempt)
+        if delay > 0:
+            self.sleep(delay)
+
+    def stats(self) -> Dict:
+        return {"retries": self.retries, "budget_left": self.remaining, "exhausted": self.exhausted}
+
+
+class NegativeCache:
+    """
+    Réponses NXDOMAIN / NODATA / REFUSED par (qname, rdtype), conservées pendant leur TTL négatif
+    (SOA minimum, RFC 2308) borné par [min_ttl, max_ttl], ou default_ttl s'il est inconnu.
+    """
+
+    def __init__(self, default_ttl: float = 60, min_ttl: float = 5, max_ttl: float = 3600,
+                 max_entries: int = 65536, clock: Callable[[], float] = time.monotonic):
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str, Optional[int], BaseException]]" = OrderedDict()
+            self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, qname: str, rdtype: str) -> Optional[Tuple[str, Optional[int], BaseException]]:
+        """
+        (classe, ttl, exception) si la réponse négative est encore valide.
+        """
+        key = (qname, rdtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, outcome, ttl, error = entry
+            if expires <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return outcome, ttl, error
+
+    def put(self, qname: str, rdtype: str, outcome: str, ttl: Optional[int], error: BaseException):
+        if outcome not in (NXDOMAIN, NODATA, REFUSED):
+            return
+        lifetime = self.default_ttl if ttl is None else max(self.min_ttl, min(self.max_ttl, ttl))
+        with self._lock:
+            self._entries[(qname, rdtype)] = (self.clock() + lifetime, outcome, ttl, error)
+            self._entries.move_to_end((qname, rdtype))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
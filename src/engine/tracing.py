@@ -0,0 +1,162 @@
+"""
+Traçage et profilage d'un scan.
+
+ScanTracer transforme les événements du moteur en spans (scan, expansion d'un nœud,
+stratégie, requête DNS) envoyés à un sink. ChromeTraceSink écrit le format
+"Trace Event" lisible par chrome://tracing, Perfetto ou speedscope.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, TextIO, Union
+from src.engine.events import ScanListener
+from src.models.graph import Node
+
+
+class TraceSink(ABC):
+    """
+    Destination des événements de trace (dicts au format Trace Event).
+    """
+    @abstractmethod
+    def emit(self, event: Dict):
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink(TraceSink):
+    """
+    Un événement JSON par ligne.
+    """
+    def __init__(self, target: Union[str, TextIO]):
+        self._owns_file = isinstance(target, str)
+        self._file = open(target, "w", encoding="utf-8", buffering=1 << 16) if self._owns_file else target
+        self._lock = threading.Lock()
+
+    def emit(self, event: Dict):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class ChromeTraceSink(JsonLinesSink):
+    """
+    Tableau JSON d'événements, un par ligne. Le format tolère un tableau non refermé,
+    donc une trace interrompue reste lisible ; close() le referme proprement.
+    """
+    def __init__(self, target: Union[str, TextIO]):
+        super().__init__(target)
+        self._file.write("[\n")
+        self._first = True
+
+    def emit(self, event: Dict):
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line if self._first else ",\n" + line)
+            self._first = False
+
+    def close(self):
+        with self._lock:
+            self._file.write("\n]\n")
+        super().close()
+
+
+class ScanTracer(ScanListener):
+    """
+    Émet un span par scan, par expansion de nœud et par exécution de stratégie,
+    un événement complet par requête DNS et un événement instantané par nœud découvert.
+    """
+
+    def __init__(self, sink: TraceSink, queries: bool = True, discoveries: bool = True):
+        self.sink = sink
+        self.queries = queries
+        self.discoveries = discoveries
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    def _ts(self, at: Optional[float] = None) -> float:
+        # Microsecondes depuis la création du traceur
+        return round(((at if at is not None else time.perf_counter()) - self._origin) * 1e6, 1)
+
+    def _emit(self, phase: str, name: str, category: str, args: Optional[Dict] = None, **extra):
+        # ts=0.0 (événement à l'origine du traceur) est un horodatage valide
+        ts = extra.pop("ts", None)
+        if ts is None:
+            ts = self._ts()
+        event = {"name": name, "cat": category, "ph": phase, "ts": ts,
+                 "pid": self._pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        event.update(extra)
+        self.sink.emit(event)
+
+    def on_scan_start(self, root: Node):
+        self._emit("B", f"scan {root.value}", "scan", {"root": repr(root)})
+
+    def on_scan_end(self):
+        self._emit("E", "scan", "scan")
+
+    def on_expand_start(self, node: Node, depth: int):
+        self._emit("B", repr(node), "node", {"depth": depth})
+
+    def on_expand_end(self, node: Node):
+        self._emit("E", repr(node), "node")
+
+    def on_strategy_start(self, strategy, node: Node):
+        self._emit("B", type(strategy).__name__, "strategy")
+
+    def on_strategy_end(self, strategy, node: Node, error: Exception = None):
+        args = {"error": repr(error)} if error is not None else None
+        self._emit("E", type(strategy).__name__, "strategy", args)
+
+    def on_query(self, event):
+        if not self.queries:
+            return
+        end = time.perf_counter()
+        self._emit(
+            "X", f"{event.rdtype} {event.qname}", "query",
+            {"outcome": event.outcome, "ttl": event.ttl, "cached": event.cached, "strategy": event.strategy},
+            ts=self._ts(end - event.elapsed), dur=round(event.elapsed * 1e6, 1),
+        )
+
+    def on_node(self, node: Node):
+        if self.discoveries:
+            self._emit("i", repr(node), "discovery", s="t")
+
+
+def profile_scan(engine, root: Node, report: Union[str, TextIO], sort: str = "cumulative",
+                 limit: int = 50, dump: Optional[str] = None) -> pstats.Stats:
+    """
+    Exécute engine.scan(root) sous cProfile et écrit un rapport texte trié par `sort`.
+    Si dump est fourni, les statistiques brutes y sont aussi enregistrées (snakeviz, pstats...).
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        engine.scan(root)
+    finally:
+        profiler.disable()
+
+    if dump:
+        profiler.dump_stats(dump)
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats(sort).print_stats(limit)
+    if isinstance(report, str):
+        with open(report, "w", encoding="utf-8") as f:
+            f.write(buffer.getvalue())
+    else:
+        report.write(buffer.getvalue())
+    return stats
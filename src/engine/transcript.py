@@ -0,0 +1,208 @@
+"""
+Enregistrement et rejeu des requêtes DNS d'un scan.
+
+TranscriptRecorder (listener) ajoute chaque requête envoyée sur le réseau à un fichier binaire
+en ajout seul : (qname, rdtype, classe de résultat, durée, réponse au format wire).
+ReplayResolver sert ensuite ces réponses à la place d'un dns.resolver.Resolver, avec une latence
+simulée optionnelle : un scan de production peut être rejoué hors ligne, à l'identique.
+
+Format : l'en-tête MAGIC, puis des enregistrements
+    !dfBHHI (décalage depuis le début, durée, classe, rdtype, taille du qname, taille du wire)
+suivis du qname (ASCII) et de la réponse wire (vide pour un timeout).
+"""
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+from src.engine.events import ScanListener
+from src.engine.resolver import NOERROR, NXDOMAIN, NODATA, REFUSED, SERVFAIL, TIMEOUT, OUTCOMES, QueryEvent
+
+MAGIC = b"DNSTRC1\n"
+RECORD = struct.Struct("!dfBHHI")
+
+
+@dataclass(frozen=True)
+class TranscriptRecord:
+    offset: float
+    elapsed: float
+    outcome: str
+    qname: str
+    rdtype: str
+    wire: bytes
+
+
+def transcript_key(qname, rdtype) -> tuple:
+    if not isinstance(rdtype, str):
+        import dns.rdatatype
+        rdtype = dns.rdatatype.to_text(rdtype)
+    return str(qname).lower().rstrip("."), rdtype.upper()
+
+
+class TranscriptRecorder(ScanListener):
+    """
+    Ajoute au fichier chaque requête non servie par un cache. Le fichier est ouvert en ajout :
+    plusieurs scans peuvent se succéder dans la même transcription.
+    """
+
+    def __init__(self, path: str):
+        self._file: BinaryIO = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self.records = 0
+
+    def on_query(self, event: QueryEvent):
+        if event.cached:
+            return
+        qname, rdtype = transcript_key(event.qname, event.rdtype)
+        wire = _response_wire(event)
+        encoded = qname.encode("ascii", "replace")
+        offset = time.perf_counter() - self._start - event.elapsed
+        header = RECORD.pack(offset, event.elapsed, OUTCOMES.index(event.outcome),
+                             _rdtype_value(rdtype), len(encoded), len(wire))
+        with self._lock:
+            self._file.write(header + encoded + wire)
+            self.records += 1
+
+    def on_scan_end(self):
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def read_transcript(path: str) -> Iterator[TranscriptRecord]:
+    import dns.rdatatype
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} n'est pas une transcription DNS")
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                # Fin du fichier (ou dernier enregistrement interrompu)
+                return
+            offset, elapsed, outcome, rdtype, qname_len, wire_len = RECORD.unpack(header)
+            qname = f.read(qname_len).decode("ascii")
+            wire = f.read(wire_len)
+            if len(wire) < wire_len:
+                return
+            yield TranscriptRecord(offset, elapsed, OUTCOMES[outcome], qname,
+                                   dns.rdatatype.to_text(rdtype), wire)
+
+
+class ReplayResolver:
+    """
+    Remplace un dns.resolver.Resolver en servant les réponses d'une transcription.
+
+    latency : None (immédiat), "recorded" (durées enregistrées, multipliées par scale)
+    ou un délai fixe en secondes. Les requêtes absentes de la transcription répondent NXDOMAIN.
+    Une même requête enregistrée plusieurs fois (relances) est rejouée dans l'ordre,
+    puis la dernière réponse est resservie.
+    """
+
+    def __init__(self, path: str, latency: Union[None, str, float] = None, scale: float = 1.0,
+                 sleep=time.sleep):
+        self.latency = latency
+        self.scale = scale
+        self.sleep = sleep
+        self.cache = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._records: Dict[tuple, List[TranscriptRecord]] = {}
+        self._cursor: Dict[tuple, int] = {}
+        for record in read_transcript(path):
+            self._records.setdefault((record.qname, record.rdtype), []).append(record)
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+
+    def install(self, engine):
+        """
+        Branche ce resolver sous toutes les stratégies du moteur.
+        """
+        from src.engine.resolver import ObservedResolver
+        for strategy in engine.strategies:
+            resolver = getattr(strategy, "resolver", None)
+            if isinstance(resolver, ObservedResolver):
+                resolver.inner = self
+            elif resolver is not None:
+                strategy.resolver = self
+
+    def resolve(self, qname, rdtype="A", *args, **kwargs):
+        import dns.exception
+        import dns.message
+        import dns.name
+        import dns.rdataclass
+        import dns.rdatatype
+        import dns.resolver
+
+        key = transcript_key(qname, rdtype)
+        with self._lock:
+            records = self._records.get(key)
+            if records:
+                index = self._cursor.get(key, 0)
+                record = records[min(index, len(records) - 1)]
+                self._cursor[key] = index + 1
+                self.hits += 1
+            else:
+                record = None
+                self.misses += 1
+
+        name = qname if isinstance(qname, dns.name.Name) else dns.name.from_text(qname)
+        if record is None:
+            raise dns.resolver.NXDOMAIN(qnames=[name])
+
+        self._wait(record)
+        response = dns.message.from_wire(record.wire) if record.wire else None
+        outcome = record.outcome
+        if outcome == NOERROR:
+            return dns.resolver.Answer(name, dns.rdatatype.RdataType.make(rdtype), dns.rdataclass.IN, response)
+        if outcome == NXDOMAIN:
+            responses = {name: response} if response is not None else {}
+            raise dns.resolver.NXDOMAIN(qnames=[name], responses=responses)
+        if outcome == NODATA:
+            raise dns.resolver.NoAnswer(response=response)
+        if outcome in (SERVFAIL, REFUSED):
+            request = dns.message.make_query(name, rdtype)
+            errors = [("transcript", False, 53, outcome, response)] if outcome == REFUSED else []
+            raise dns.resolver.NoNameservers(request=request, errors=errors)
+        if outcome == TIMEOUT:
+            raise dns.exception.Timeout()
+        raise dns.exception.DNSException(f"réponse enregistrée : {outcome}")
+
+    def _wait(self, record: TranscriptRecord):
+        if self.latency is None:
+            return
+        delay = record.elapsed * self.scale if self.latency == "recorded" else float(self.latency)
+        if delay > 0:
+            self.sleep(delay)
+
+
+def _response_wire(event: QueryEvent) -> bytes:
+    response = None
+    if event.answer is not None:
+        response = getattr(event.answer, "response", None)
+    elif event.error is not None:
+        kwargs = getattr(event.error, "kwargs", None) or {}
+        response = kwargs.get("response")
+        if response is None and kwargs.get("responses"):
+            response = next(iter(kwargs["responses"].values()))
+    if response is None:
+        return b""
+    try:
+        return response.to_wire()
+    except Exception:
+        return b""
+
+
+def _rdtype_value(rdtype: str) -> int:
+    import dns.rdatatype
+    return int(dns.rdatatype.from_text(rdtype))
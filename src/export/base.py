@@ -0,0 +1,97 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, TextIO, Union
+from src.engine.events import ScanListener
+from src.models.graph import Node, Edge
+from src.models.ids import stable_id
+
+# Taille du tampon d'écriture des fichiers d'export
+BUFFER_SIZE = 1 << 20
+
+class GraphExporter(ScanListener, ABC):
+    """
+    Écrit un graphe en flux, nœud par nœud et arête par arête, sans copie en mémoire.
+    Utilisable comme gestionnaire de contexte, ou branché sur un scan via engine.add_listener().
+    Les nœuds doivent être écrits avant les arêtes qui les référencent.
+    """
+    extension = ""
+
+    def __init__(self, target: Union[str, TextIO]):
+        if isinstance(target, str):
+            self._file: TextIO = open(target, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self._closed = False
+        self._write(self.header())
+
+    def __enter__(self) -> "GraphExporter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Événements du scan
+    def on_node(self, node: Node):
+        self.write_node(node)
+
+    def on_edge(self, edge: Edge):
+        self.write_edge(edge)
+
+    def write_node(self, node: Node):
+        self._write(self.format_node(stable_id(node), node))
+
+    def write_edge(self, edge: Edge):
+        self._write(self.format_edge(stable_id(edge.source), stable_id(edge.target), edge))
+
+    def export(self, nodes: Iterable[Node], edges: Iterable[Edge]):
+        for node in nodes:
+            self.write_node(node)
+        for edge in edges:
+            self.write_edge(edge)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._write(self.footer())
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def _write(self, text: str):
+        if text:
+            self._file.write(text)
+
+    # À fournir par chaque format
+    def header(self) -> str:
+        return ""
+
+    def footer(self) -> str:
+        return ""
+
+    @abstractmethod
+    def format_node(self, node_id: str, node: Node) -> str:
+        pass
+
+    @abstractmethod
+    def format_edge(self, source_id: str, target_id: str, edge: Edge) -> str:
+        pass
+
+FORMATS = ("dot", "jsonl", "graphml")
+
+def open_exporter(fmt: str, target: Union[str, TextIO]) -> GraphExporter:
+    """
+    Instancie l'exporteur du format demandé ("dot", "jsonl" ou "graphml").
+    """
+    if fmt == "dot":
+        from src.export.dot import DotExporter
+        return DotExporter(target)
+    if fmt == "jsonl":
+        from src.export.jsonl import JsonLinesExporter
+        return JsonLinesExporter(target)
+    if fmt == "graphml":
+        from src.export.graphml import GraphMLExporter
+        return GraphMLExporter(target)
+    raise ValueError(f"Format d'export inconnu : {fmt}")
@@ -0,0 +1,37 @@
+from src.export.base import GraphExporter
+from src.models.graph import Node, Edge, NodeType
+
+COLORS = {
+    NodeType.IP_V4: "gold",
+    NodeType.IP_V6: "orange",
+    NodeType.PREFIX_V4: "khaki",
+    NodeType.PREFIX_V6: "khaki",
+    NodeType.TLD: "lightgrey",
+    NodeType.SERVICE: "pink",
+}
+
+def _quote(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class DotExporter(GraphExporter):
+    """
+    Export Graphviz (DOT).
+    """
+    extension = "dot"
+
+    def header(self) -> str:
+        return (
+            "digraph G {\n"
+            "  rankdir=LR;\n"
+            "  node [style=filled, fontname=\"Helvetica\"];\n"
+        )
+
+    def footer(self) -> str:
+        return "}\n"
+
+    def format_node(self, node_id: str, node: Node) -> str:
+        color = COLORS.get(node.type, "lightblue")
+        return f'  "n{node_id}" [label="{_quote(node.value)}", fillcolor="{color}", shape=box];\n'
+
+    def format_edge(self, source_id: str, target_id: str, edge: Edge) -> str:
+        return f'  "n{source_id}" -> "n{target_id}" [label="{edge.type.value}"];\n'
@@ -0,0 +1,40 @@
+from xml.sax.saxutils import escape
+from src.export.base import GraphExporter
+from src.models.graph import Node, Edge
+
+# Caractères de contrôle interdits en XML 1.0 (hors tabulation et fins de ligne)
+_INVALID_XML = {code: "\ufffd" for code in range(32) if code not in (9, 10, 13)}
+
+def _text(value: str) -> str:
+    return escape(value.translate(_INVALID_XML))
+
+class GraphMLExporter(GraphExporter):
+    """
+    Export GraphML (lisible par networkx, Gephi, yEd...).
+    """
+    extension = "graphml"
+
+    def header(self) -> str:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            '  <key id="type" for="node" attr.name="type" attr.type="string"/>\n'
+            '  <key id="value" for="node" attr.name="value" attr.type="string"/>\n'
+            '  <key id="etype" for="edge" attr.name="type" attr.type="string"/>\n'
+            '  <graph id="G" edgedefault="directed">\n'
+        )
+
+    def footer(self) -> str:
+        return "  </graph>\n</graphml>\n"
+
+    def format_node(self, node_id: str, node: Node) -> str:
+        return (
+            f'    <node id="n{node_id}"><data key="type">{node.type.value}</data>'
+            f'<data key="value">{_text(node.value)}</data></node>\n'
+        )
+
+    def format_edge(self, source_id: str, target_id: str, edge: Edge) -> str:
+        return (
+            f'    <edge source="n{source_id}" target="n{target_id}">'
+            f'<data key="etype">{edge.type.value}</data></edge>\n'
+        )
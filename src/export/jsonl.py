@@ -0,0 +1,17 @@
+import json
+from src.export.base import GraphExporter
+from src.models.graph import Node, Edge
+
+class JsonLinesExporter(GraphExporter):
+    """
+    Export JSON Lines : un objet par ligne, {"kind": "node"|"edge", ...}.
+    """
+    extension = "jsonl"
+
+    def format_node(self, node_id: str, node: Node) -> str:
+        record = {"kind": "node", "id": node_id, "type": node.type.value, "value": node.value}
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def format_edge(self, source_id: str, target_id: str, edge: Edge) -> str:
+        record = {"kind": "edge", "source": source_id, "target": target_id, "type": edge.type.value}
+        return json.dumps(record, ensure_ascii=False) + "\n"
@@ -0,0 +1,154 @@
+"""
+Mode non interactif : scanne un domaine et écrit le graphe sur la sortie standard (JSON Lines par défaut).
+
+N'importe que ce dont les stratégies choisies ont besoin : ni rich, ni networkx, ni l'interface.
+Pensé pour être lancé des milliers de fois par un ordonnanceur, le temps de démarrage compte.
+"""
+import argparse
+import json
+import sys
+import time
+
+START = time.perf_counter()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py headless", description="DNS Scanner - mode non interactif")
+    parser.add_argument("domain", help="Domaine à scanner")
+    parser.add_argument("-d", "--depth", type=int, default=3, help="Profondeur de la récursion (par défaut : 3)")
+    parser.add_argument("-s", "--strategies", help="Stratégies, séparées par des virgules (par défaut : dns,txt,ptr,parents)")
+    parser.add_argument("-f", "--format", default="jsonl", choices=("jsonl", "dot", "graphml"), help="Format de sortie (par défaut : jsonl)")
+    parser.add_argument("-o", "--output", help="Fichier de sortie (par défaut : sortie standard)")
+    parser.add_argument("--monitor", type=float, metavar="SECONDES",
+                        help="Après le scan, surveiller les changements pendant SECONDES (événements JSON Lines)")
+    parser.add_argument("--metrics", metavar="FICHIER",
+                        help="Écrire les métriques par stratégie (JSON, ou texte Prometheus si FICHIER finit par .prom)")
+    parser.add_argument("--trace", metavar="FICHIER",
+                        help="Écrire une trace des spans du scan (format Chrome, chrome://tracing ou Perfetto)")
+    parser.add_argument("--profile", metavar="FICHIER",
+                        help="Profiler le scan avec cProfile et écrire le rapport dans FICHIER")
+    parser.add_argument("--record", metavar="FICHIER",
+                        help="Enregistrer les réponses DNS du scan dans une transcription (ajout en fin de fichier)")
+    parser.add_argument("--replay", metavar="FICHIER",
+                        help="Rejouer une transcription au lieu d'interroger le réseau")
+    parser.add_argument("--replay-latency", default=None, metavar="SECONDES|recorded",
+                        help="Latence simulée au rejeu : délai fixe, ou \"recorded\" pour les durées enregistrées")
+    parser.add_argument("--memory-limit", type=float, metavar="MIO",
+                        help="Mémoire bornée : graphe sur disque, filtres de Bloom plafonnés à MIO Mio (grands crawls)")
+    parser.add_argument("--spill", metavar="FICHIER",
+                        help="Fichier SQLite du graphe en mode mémoire bornée (par défaut : fichier temporaire)")
+    parser.add_argument("--timing", action="store_true", help="Écrire les temps de démarrage et de scan sur stderr")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from src.strategies.registry import parse_names
+
+    try:
+        names = parse_names(args.strategies)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    store = None
+    if args.memory_limit is not None or args.spill:
+        from src.storage.spill import DEFAULT_MEMORY_LIMIT, SpillGraphStore
+        memory_limit = int(args.memory_limit * 1024 * 1024) if args.memory_limit is not None else DEFAULT_MEMORY_LIMIT
+        store = SpillGraphStore(args.spill, memory_limit=memory_limit)
+
+    try:
+        return run(args, names, store)
+    finally:
+        # Fichier temporaire supprimé même si le scan, l'export ou la surveillance échoue
+        if store is not None:
+            store.close()
+
+
+def run(args, names, store) -> int:
+    from src.export.base import open_exporter
+    from src.models.graph import Node, NodeType
+    from src.strategies.registry import build_engine
+
+    engine = build_engine(names, max_depth=args.depth, store=store)
+    if args.replay:
+        from src.engine.transcript import ReplayResolver
+        latency = args.replay_latency
+        if latency not in (None, "recorded"):
+            latency = float(latency)
+        ReplayResolver(args.replay, latency=latency).install(engine)
+    recorder = None
+    if args.record:
+        from src.engine.transcript import TranscriptRecorder
+        recorder = TranscriptRecorder(args.record)
+        engine.add_listener(recorder)
+    ready = time.perf_counter()
+
+    exporter = open_exporter(args.format, args.output or sys.stdout)
+    engine.add_listener(exporter)
+    root = Node(value=args.domain, type=NodeType.DOMAIN)
+
+    monitor = None
+    if args.monitor:
+        from src.engine.monitor import ScanMonitor
+        monitor = ScanMonitor(engine)
+        monitor.add_handler(lambda change: print(json.dumps({
+            "kind": "change",
+            "action": change.action,
+            "type": change.edge.type.value,
+            "source": change.edge.source.value,
+            "target": change.edge.target.value,
+            "qname": change.qname,
+            "rdtype": change.rdtype,
+        }), flush=True))
+
+    tracer = None
+    if args.trace:
+        from src.engine.tracing import ChromeTraceSink, ScanTracer
+        tracer = ScanTracer(ChromeTraceSink(args.trace))
+        engine.add_listener(tracer)
+
+    try:
+        if args.profile:
+            from src.engine.tracing import profile_scan
+            profile_scan(engine, root, args.profile)
+        else:
+            engine.scan(root)
+    finally:
+        engine.remove_listener(exporter)
+        exporter.close()
+        if tracer is not None:
+            engine.remove_listener(tracer)
+            tracer.sink.close()
+        if recorder is not None:
+            engine.remove_listener(recorder)
+            recorder.close()
+    done = time.perf_counter()
+
+    if args.timing:
+        stats = engine.get_stats()
+        stats.pop("strategies", None)
+        print(json.dumps({
+            "startup_s": round(ready - START, 4),
+            "scan_s": round(done - ready, 4),
+            **stats,
+        }), file=sys.stderr)
+
+    if args.metrics and engine.metrics is not None:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            if args.metrics.endswith(".prom"):
+                f.write(engine.metrics.to_prometheus())
+            else:
+                f.write(engine.metrics.to_json(indent=2))
+
+    if monitor is not None:
+        try:
+            monitor.run(duration=args.monitor)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
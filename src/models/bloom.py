@@ -0,0 +1,172 @@
+"""
+Filtres de Bloom sur tableau de bits, pour des tests d'appartenance en mémoire bornée.
+
+ScalableBloomFilter ajoute des tranches de capacité croissante (taux d'erreur resserré à chaque
+tranche) tant que le plafond mémoire le permet ; au-delà, la dernière tranche se remplit et le taux
+de faux positifs monte, sans jamais dépasser le plafond. Les deux exposent leur taux estimé.
+"""
+import hashlib
+import math
+from typing import List, Optional, Tuple
+
+
+def hash_pair(key: bytes) -> Tuple[int, int]:
+    """
+    Deux empreintes 64 bits d'une clé ; les k positions en sont dérivées (h1 + i·h2).
+    """
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+def bloom_bits(capacity: int, error_rate: float) -> int:
+    """
+    Nombre de bits pour capacity éléments au taux de faux positifs error_rate.
+    """
+    return max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom de taille fixe : m bits dans un bytearray, k positions par clé.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-3):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = bloom_bits(capacity, error_rate)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self.bits_set = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, key: bytes) -> bool:
+        return self.contains_hashed(*hash_pair(key))
+
+    def add(self, key: bytes) -> bool:
+        """
+        Ajoute la clé. Retourne True si elle était peut-être déjà présente (rien n'a changé).
+        """
+        return self.add_hashed(*hash_pair(key))
+
+    def contains_hashed(self, h1: int, h2: int) -> bool:
+        bits, size = self.bits, self.size
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add_hashed(self, h1: int, h2: int) -> bool:
+        bits, size = self.bits, self.size
+        present = True
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                self.bits_set += 1
+                present = False
+        if not present:
+            self.count += 1
+        return present
+
+    def false_positive_rate(self) -> float:
+        """
+        Taux de faux positifs estimé d'après le remplissage réel : (bits à 1 / m)^k.
+        """
+        return (self.bits_set / self.size) ** self.hashes
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+        self.bits_set = 0
+
+
+class ScalableBloomFilter:
+    """
+    Suite de BloomFilter : capacité multipliée par growth et taux d'erreur par tightening à chaque
+    tranche, de sorte que le taux global reste sous error_rate. max_bytes plafonne la mémoire totale.
+    """
+
+    def __init__(self, initial_capacity: int = 1 << 16, error_rate: float = 1e-3, growth: int = 2,
+                 tightening: float = 0.5, max_bytes: Optional[int] = None):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        self.filters: List[BloomFilter] = []
+        # Plus de place pour une nouvelle tranche : la dernière se remplit au-delà de sa capacité
+        self.saturated = False
+        capacity = self.initial_capacity
+        error = self.error_rate * (1 - self.tightening)
+        if self.max_bytes is not None:
+            # Première tranche réduite si le plafond ne permet pas la capacité demandée
+            while capacity > 64 and (bloom_bits(capacity, error) + 7) // 8 > self.max_bytes:
+                capacity //= 2
+        self.filters.append(BloomFilter(capacity, error))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(f.nbytes for f in self.filters)
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self.filters)
+
+    def __contains__(self, key: bytes) -> bool:
+        h1, h2 = hash_pair(key)
+        return any(f.contains_hashed(h1, h2) for f in self.filters)
+
+    def add(self, key: bytes) -> bool:
+        """
+        Ajoute la clé. Retourne True si elle était peut-être déjà présente, False si elle est nouvelle.
+        """
+        h1, h2 = hash_pair(key)
+        filters = self.filters
+        for f in filters:
+            if f.contains_hashed(h1, h2):
+                return True
+        current = filters[-1]
+        if current.count >= current.capacity and not self.saturated:
+            current = self._grow() or current
+        current.add_hashed(h1, h2)
+        return False
+
+    def _grow(self) -> Optional[BloomFilter]:
+        last = self.filters[-1]
+        capacity = last.capacity * self.growth
+        error = last.error_rate * self.tightening
+        if self.max_bytes is not None and self.nbytes + (bloom_bits(capacity, error) + 7) // 8 > self.max_bytes:
+            self.saturated = True
+            return None
+        bloom = BloomFilter(capacity, error)
+        self.filters.append(bloom)
+        return bloom
+
+    def false_positive_rate(self) -> float:
+        """
+        Taux estimé pour une clé absente : 1 - Π(1 - taux de chaque tranche).
+        """
+        miss = 1.0
+        for f in self.filters:
+            miss *= 1 - f.false_positive_rate()
+        return 1 - miss
+
+    def stats(self) -> dict:
+        return {
+            "items": len(self),
+            "slices": len(self.filters),
+            "bytes": self.nbytes,
+            "saturated": self.saturated,
+            "false_positive_rate": self.false_positive_rate(),
+        }
@@ -1,11 +1,14 @@
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Set, Optional
+from src.models.names import canonical_value
 
 class NodeType(Enum):
     DOMAIN = "DOMAIN"
     IP_V4 = "IP_V4"
     IP_V6 = "IP_V6"
+    PREFIX_V4 = "PREFIX_V4" # Bloc CIDR IPv4 (ex: SPF ip4:10.0.0.0/16)
+    PREFIX_V6 = "PREFIX_V6" # Bloc CIDR IPv6
     TLD = "TLD"
     SERVICE = "SERVICE" # Pour les enregistrements SRV
     TXT = "TXT" # Pour le contenu brut TXT
@@ -23,15 +26,19 @@ class EdgeType(Enum):
     NEIGHBOR = "NEIGHBOR" # Voisin IP
     SUBDOMAIN = "SUBDOMAIN" # Sous-domaine brute-forcé
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Node:
     value: str
     type: NodeType
-    
+
+    def __post_init__(self):
+        # Canonicalisation : Example.COM, example.com. et example.com sont le même nœud
+        object.__setattr__(self, "value", canonical_value(self.value, self.type))
+
     def __repr__(self):
         return f"{self.type.value}:{self.value}"
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Edge:
     source: Node
     target: Node
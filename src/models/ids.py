@@ -0,0 +1,21 @@
+import hashlib
+from src.models.graph import Node, Edge
+
+def _digest(node: Node) -> bytes:
+    return hashlib.blake2b(f"{node.type.value}:{node.value}".encode("utf-8"), digest_size=8).digest()
+
+def stable_id(node: Node) -> str:
+    """
+    Identifiant déterministe d'un nœud, dérivé de son type et de sa valeur canonique.
+    Identique d'un processus à l'autre (contrairement à hash()), donc comparable entre exports.
+    """
+    return _digest(node).hex()
+
+def stable_int(node: Node) -> int:
+    """
+    Même empreinte que stable_id, sous forme d'entier signé 64 bits (clé SQLite).
+    """
+    return int.from_bytes(_digest(node), "big", signed=True)
+
+def edge_id(edge: Edge) -> str:
+    return f"{stable_id(edge.source)}-{edge.type.value}-{stable_id(edge.target)}"
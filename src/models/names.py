@@ -0,0 +1,46 @@
+import ipaddress
+import sys
+from functools import lru_cache
+
+@lru_cache(maxsize=262144)
+def canonical_value(value: str, node_type) -> str:
+    """
+    Forme canonique d'une valeur de nœud, internée pour que les valeurs égales
+    partagent un seul objet str.
+    - noms : minuscules, sans point final, labels IDN en forme ASCII (xn--)
+    - IP : forme normalisée par ipaddress (IPv6 compressée)
+    - préfixes : réseau normalisé (bits hôte remis à zéro)
+    Le contenu TXT est conservé tel quel.
+    """
+    # Import local : graph.py importe ce module à la création des nœuds
+    from src.models.graph import NodeType
+
+    if node_type == NodeType.TXT:
+        return value
+
+    value = value.strip()
+    try:
+        if node_type in (NodeType.IP_V4, NodeType.IP_V6):
+            value = str(ipaddress.ip_address(value))
+        elif node_type in (NodeType.PREFIX_V4, NodeType.PREFIX_V6):
+            value = str(ipaddress.ip_network(value, strict=False))
+        else:
+            value = canonical_name(value)
+    except ValueError:
+        pass
+    return sys.intern(value)
+
+def canonical_name(name: str) -> str:
+    name = name.rstrip(".").lower()
+    if name.isascii():
+        return name
+    labels = []
+    for label in name.split("."):
+        if not label.isascii():
+            try:
+                label = label.encode("idna").decode("ascii")
+            except UnicodeError:
+                # Label non convertible (trop long, caractères interdits) : gardé en unicode
+                pass
+        labels.append(label)
+    return ".".join(labels)
@@ -0,0 +1,175 @@
+"""
+Liste des suffixes publics (publicsuffix.org) embarquée, compilée en trie de labels inversés.
+
+Remplace tldextract : aucun accès réseau, chargement rapide via un pickle mis en cache,
+et mémoïsation LRU des recherches de domaine enregistrable.
+"""
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DATA_FILE = Path(__file__).parent / "data" / "public_suffix_list.dat"
+
+# Clés spéciales d'un nœud du trie (un label DNS ne peut être vide ni commencer par "!")
+TERMINAL = ""
+EXCEPTION = "!"
+WILDCARD = "*"
+
+ICANN = 1
+PRIVATE = 2
+
+# Incrémenter si le format du trie compilé change
+FORMAT_VERSION = 1
+
+
+class SuffixTrie:
+    """
+    Trie des règles PSL indexé par labels inversés (com -> example -> ...).
+    Chaque nœud est un dict label -> nœud ; la clé TERMINAL porte la section (ICANN/PRIVATE)
+    de la règle qui se termine là.
+    """
+    __slots__ = ("root",)
+
+    def __init__(self, root: Optional[Dict] = None):
+        self.root = root if root is not None else {}
+
+    @classmethod
+    def compile(cls, text: str) -> "SuffixTrie":
+        trie = cls()
+        section = ICANN
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("// ===BEGIN PRIVATE DOMAINS==="):
+                section = PRIVATE
+                continue
+            if not line or line.startswith("//"):
+                continue
+            rule = line.split()[0]
+            trie.add(rule, section)
+            # Les règles IDN sont aussi indexées sous leur forme ASCII (xn--)
+            ascii_rule = _to_ascii(rule)
+            if ascii_rule and ascii_rule != rule:
+                trie.add(ascii_rule, section)
+        return trie
+
+    def add(self, rule: str, section: int = ICANN):
+        is_exception = rule.startswith("!")
+        labels = rule.lstrip("!").lower().split(".")
+        node = self.root
+        for label in reversed(labels[1:] if is_exception else labels):
+            node = node.setdefault(label, {})
+        if is_exception:
+            node[EXCEPTION + labels[0]] = section
+        else:
+            node[TERMINAL] = section
+
+    def suffix_length(self, labels: List[str], private: bool = False) -> int:
+        """
+        Nombre de labels (en partant de la droite) formant le suffixe public,
+        0 si aucune règle ne correspond (TLD inconnu).
+        """
+        node = self.root
+        length = 0
+        for depth, label in enumerate(reversed(labels)):
+            if EXCEPTION + label in node:
+                # Règle d'exception : le suffixe s'arrête au-dessus de ce label
+                return depth
+            child = node.get(label)
+            if child is None:
+                child = node.get(WILDCARD)
+            if child is None:
+                break
+            node = child
+            section = node.get(TERMINAL)
+            if section is not None and (private or section == ICANN):
+                length = depth + 1
+        return length
+
+
+def _to_ascii(rule: str) -> Optional[str]:
+    if rule.isascii():
+        return rule
+    prefix = "!" if rule.startswith("!") else ""
+    try:
+        return prefix + ".".join(
+            label if label.isascii() else label.encode("idna").decode("ascii")
+            for label in rule.lstrip("!").split(".")
+        )
+    except UnicodeError:
+        return None
+
+
+def _cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "dns-checker"
+
+
+def load_trie(path: Path = DATA_FILE) -> SuffixTrie:
+    """
+    Charge le trie compilé depuis le cache pickle, ou compile la liste et met le résultat en cache.
+    Le cache est indexé par l'empreinte du fichier source.
+    """
+    raw = path.read_bytes()
+    digest = hashlib.sha1(raw).hexdigest()[:16]
+    cache_file = _cache_dir() / f"psl-{FORMAT_VERSION}-{digest}.pickle"
+
+    try:
+        with open(cache_file, "rb") as f:
+            return SuffixTrie(pickle.load(f))
+    except Exception:
+        pass
+
+    trie = SuffixTrie.compile(raw.decode("utf-8"))
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(trie.root, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError:
+        # Cache non inscriptible : on garde simplement le trie en mémoire
+        pass
+    return trie
+
+
+_TRIE: Optional[SuffixTrie] = None
+
+
+def get_trie() -> SuffixTrie:
+    global _TRIE
+    if _TRIE is None:
+        _TRIE = load_trie()
+    return _TRIE
+
+
+def _labels(name: str) -> List[str]:
+    return name.rstrip(".").lower().split(".")
+
+
+@lru_cache(maxsize=65536)
+def public_suffix(name: str, private: bool = False) -> Optional[str]:
+    """
+    Suffixe public de name (ex: co.uk pour www.example.co.uk), None si inconnu.
+    """
+    labels = _labels(name)
+    length = get_trie().suffix_length(labels, private)
+    if length == 0:
+        return None
+    return ".".join(labels[-length:])
+
+
+@lru_cache(maxsize=65536)
+def registered_domain(name: str, private: bool = False) -> Optional[str]:
+    """
+    Domaine enregistrable de name (ex: example.co.uk pour www.example.co.uk).
+    None si name est lui-même un suffixe public, une IP ou un TLD inconnu.
+    Par défaut seules les règles ICANN sont appliquées, comme tldextract.
+    """
+    labels = _labels(name)
+    length = get_trie().suffix_length(labels, private)
+    if length == 0 or length >= len(labels) or not all(labels):
+        return None
+    return ".".join(labels[-(length + 1):])
@@ -0,0 +1,257 @@
+from array import array
+from collections.abc import Set as AbstractSet
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.models.graph import Node, Edge, NodeType, EdgeType
+
+# Codes entiers des types, dans l'ordre de déclaration des enums
+NODE_TYPES: List[NodeType] = list(NodeType)
+EDGE_TYPES: List[EdgeType] = list(EdgeType)
+EDGE_TYPE_CODES: Dict[EdgeType, int] = {edge_type: code for code, edge_type in enumerate(EDGE_TYPES)}
+
+# Code de type d'une arête supprimée (l'emplacement est conservé pour garder les indices stables)
+DELETED = 255
+
+
+class GraphStore:
+    """
+    Stockage compact du graphe : chaque nœud est interné une seule fois sous un identifiant
+    entier, les arêtes sont des triplets (src_id, dst_id, type_code) rangés dans des tableaux.
+    Les vues nodes/edges/visited exposent des Node/Edge pour rester compatibles avec les sets.
+    """
+
+    def __init__(self):
+        self.nodes = NodeView(self)
+        self.edges = EdgeView(self)
+        self.visited = VisitedView(self)
+        self.clear()
+
+    def clear(self):
+        self._ids: Dict[Tuple[NodeType, str], int] = {}
+        self._nodes: List[Node] = []
+        self._src = array("L")
+        self._dst = array("L")
+        self._types = array("B")
+        # Clé entière unique par arête -> indice, pour un test d'appartenance sans hacher de dataclass
+        self._edge_keys: Dict[int, int] = {}
+        self._deleted = 0
+        self._out: List[Optional[List[int]]] = []
+        self._in: List[Optional[List[int]]] = []
+        self._visited = bytearray()
+        self._visited_count = 0
+
+    # --- Nœuds ---
+
+    def intern(self, node: Node) -> int:
+        """
+        Retourne l'identifiant du nœud, en l'ajoutant s'il est inconnu.
+        """
+        return self.add_node(node)[0]
+
+    def add_node(self, node: Node) -> Tuple[int, bool]:
+        """
+        Comme intern, mais indique aussi si le nœud vient d'être ajouté.
+        """
+        key = (node.type, node.value)
+        node_id = self._ids.get(key)
+        if node_id is not None:
+            return node_id, False
+        node_id = len(self._nodes)
+        self._ids[key] = node_id
+        self._nodes.append(node)
+        self._out.append(None)
+        self._in.append(None)
+        self._visited.append(0)
+        return node_id, True
+
+    def node_id(self, node: Node) -> Optional[int]:
+        return self._ids.get((node.type, node.value))
+
+    def node(self, node_id: int) -> Node:
+        return self._nodes[node_id]
+
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    def iter_nodes(self) -> Iterator[Node]:
+        return iter(self._nodes)
+
+    # --- Arêtes ---
+
+    def add_edge(self, edge: Edge) -> bool:
+        return self.add_edge_ids(self.intern(edge.source), self.intern(edge.target), edge.type)
+
+    def add_edge_ids(self, src: int, dst: int, edge_type: EdgeType) -> bool:
+        """
+        Ajoute l'arête si elle n'existe pas encore. Retourne True si elle est nouvelle.
+        """
+        code = EDGE_TYPE_CODES[edge_type]
+        key = self._edge_key(src, dst, code)
+        if key in self._edge_keys:
+            return False
+
+        index = len(self._types)
+        self._edge_keys[key] = index
+        self._src.append(src)
+        self._dst.append(dst)
+        self._types.append(code)
+        self._link(self._out, src, index)
+        self._link(self._in, dst, index)
+        return True
+
+    def remove_edge_ids(self, src: int, dst: int, edge_type: EdgeType) -> bool:
+        """
+        Supprime l'arête si elle existe. Retourne True si elle a été supprimée.
+        """
+        index = self._edge_keys.pop(self._edge_key(src, dst, EDGE_TYPE_CODES[edge_type]), None)
+        if index is None:
+            return False
+        self._types[index] = DELETED
+        self._out[src].remove(index)
+        self._in[dst].remove(index)
+        self._deleted += 1
+        return True
+
+    def has_edge(self, edge: Edge) -> bool:
+        src = self.node_id(edge.source)
+        dst = self.node_id(edge.target)
+        if src is None or dst is None:
+            return False
+        return self._edge_key(src, dst, EDGE_TYPE_CODES[edge.type]) in self._edge_keys
+
+    def edge(self, index: int) -> Edge:
+        return Edge(
+            source=self._nodes[self._src[index]],
+            target=self._nodes[self._dst[index]],
+            type=EDGE_TYPES[self._types[index]],
+        )
+
+    def edge_ids(self, index: int) -> Tuple[int, int, int]:
+        return self._src[index], self._dst[index], self._types[index]
+
+    def edge_count(self) -> int:
+        return len(self._types) - self._deleted
+
+    def edge_indices(self) -> Iterator[int]:
+        """
+        Indices des arêtes présentes (les emplacements supprimés sont sautés).
+        """
+        types = self._types
+        if not self._deleted:
+            return iter(range(len(types)))
+        return (index for index in range(len(types)) if types[index] != DELETED)
+
+    def iter_edges(self) -> Iterator[Edge]:
+        for index in self.edge_indices():
+            yield self.edge(index)
+
+    def out_edges(self, node_id: int) -> List[int]:
+        """
+        Indices des arêtes sortantes d'un nœud.
+        """
+        return self._out[node_id] or []
+
+    def in_edges(self, node_id: int) -> List[int]:
+        return self._in[node_id] or []
+
+    # --- Visites ---
+
+    def mark_visited(self, node_id: int) -> bool:
+        """
+        Marque le nœud comme visité. Retourne False s'il l'était déjà.
+        """
+        if self._visited[node_id]:
+            return False
+        self._visited[node_id] = 1
+        self._visited_count += 1
+        return True
+
+    def unmark_visited(self, node_id: int) -> bool:
+        """
+        Oublie la visite du nœud (il sera redéveloppé). Retourne False s'il n'était pas visité.
+        """
+        if not self._visited[node_id]:
+            return False
+        self._visited[node_id] = 0
+        self._visited_count -= 1
+        return True
+
+    def is_visited(self, node_id: int) -> bool:
+        return bool(self._visited[node_id])
+
+    def visited_count(self) -> int:
+        return self._visited_count
+
+    def iter_visited(self) -> Iterator[Node]:
+        for node_id, flag in enumerate(self._visited):
+            if flag:
+                yield self._nodes[node_id]
+
+    def _edge_key(self, src: int, dst: int, code: int) -> int:
+        return (((src << 32) | dst) << 8) | code
+
+    def _link(self, index: List[Optional[List[int]]], node_id: int, edge_index: int):
+        bucket = index[node_id]
+        if bucket is None:
+            index[node_id] = [edge_index]
+        else:
+            bucket.append(edge_index)
+
+
+class NodeView(AbstractSet):
+    """
+    Vue ensembliste (lecture seule) des nœuds du store.
+    """
+    __slots__ = ("_store",)
+
+    def __init__(self, store: GraphStore):
+        self._store = store
+
+    def __contains__(self, node) -> bool:
+        return isinstance(node, Node) and self._store.node_id(node) is not None
+
+    def __iter__(self) -> Iterator[Node]:
+        return self._store.iter_nodes()
+
+    def __len__(self) -> int:
+        return self._store.node_count()
+
+
+class EdgeView(AbstractSet):
+    """
+    Vue ensembliste des arêtes, reconstruites à la demande à partir des tableaux.
+    """
+    __slots__ = ("_store",)
+
+    def __init__(self, store: GraphStore):
+        self._store = store
+
+    def __contains__(self, edge) -> bool:
+        return isinstance(edge, Edge) and self._store.has_edge(edge)
+
+    def __iter__(self) -> Iterator[Edge]:
+        return self._store.iter_edges()
+
+    def __len__(self) -> int:
+        return self._store.edge_count()
+
+
+class VisitedView(AbstractSet):
+    """
+    Vue ensembliste des nœuds visités.
+    """
+    __slots__ = ("_store",)
+
+    def __init__(self, store: GraphStore):
+        self._store = store
+
+    def __contains__(self, node) -> bool:
+        if not isinstance(node, Node):
+            return False
+        node_id = self._store.node_id(node)
+        return node_id is not None and self._store.is_visited(node_id)
+
+    def __iter__(self) -> Iterator[Node]:
+        return self._store.iter_visited()
+
+    def __len__(self) -> int:
+        return self._store.visited_count()
@@ -0,0 +1,140 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.models.ids import stable_int
+from src.storage.sqlite import ResultStore
+
+ADDED = "added"
+REMOVED = "removed"
+
+NodeRecord = Tuple[int, str, str]   # (id stable, type, valeur)
+EdgeRecord = Tuple[int, int, str]   # (source, target, type)
+
+
+class StoreSource:
+    """
+    Scan enregistré dans un ResultStore, lu en flux dans l'ordre des clés primaires.
+    """
+    def __init__(self, store: ResultStore, scan_id: Optional[int] = None):
+        self.store = store
+        self.scan_id = store._resolve_scan(scan_id)
+
+    def iter_nodes(self) -> Iterator[NodeRecord]:
+        for node_id, node in self.store.iter_nodes(self.scan_id, order_by_id=True):
+            yield node_id, node.type.value, node.value
+
+    def iter_edges(self) -> Iterator[EdgeRecord]:
+        return self.store.iter_edges(self.scan_id, order_by_key=True)
+
+    def node(self, node_id: int) -> Optional[Node]:
+        row = self.store.conn.execute(
+            "SELECT type, value FROM nodes WHERE scan_id = ? AND id = ?", (self.scan_id, node_id)
+        ).fetchone()
+        return Node(value=row[1], type=NodeType(row[0])) if row else None
+
+
+class GraphSource:
+    """
+    Graphe en mémoire (ex: engine.nodes / engine.edges), trié une fois par identifiant stable.
+    """
+    def __init__(self, nodes: Iterable[Node], edges: Iterable[Edge]):
+        self._nodes: Dict[int, Node] = {stable_int(node): node for node in nodes}
+        self._edges = sorted(
+            (stable_int(edge.source), stable_int(edge.target), edge.type.value) for edge in edges
+        )
+
+    @classmethod
+    def from_engine(cls, engine) -> "GraphSource":
+        return cls(engine.nodes, engine.edges)
+
+    def iter_nodes(self) -> Iterator[NodeRecord]:
+        for node_id in sorted(self._nodes):
+            node = self._nodes[node_id]
+            yield node_id, node.type.value, node.value
+
+    def iter_edges(self) -> Iterator[EdgeRecord]:
+        return iter(self._edges)
+
+    def node(self, node_id: int) -> Optional[Node]:
+        return self._nodes.get(node_id)
+
+
+Source = Union[StoreSource, GraphSource]
+
+
+@dataclass(frozen=True)
+class Change:
+    action: str   # ADDED ou REMOVED
+    kind: str     # "node" ou "edge"
+    type: str     # NodeType ou EdgeType (valeur)
+    node: Optional[Node] = None
+    edge: Optional[Edge] = None
+
+
+@dataclass
+class DiffSummary:
+    added_nodes: Counter = field(default_factory=Counter)
+    removed_nodes: Counter = field(default_factory=Counter)
+    added_edges: Counter = field(default_factory=Counter)
+    removed_edges: Counter = field(default_factory=Counter)
+
+    def add(self, change: Change):
+        if change.kind == "node":
+            counter = self.added_nodes if change.action == ADDED else self.removed_nodes
+        else:
+            counter = self.added_edges if change.action == ADDED else self.removed_edges
+        counter[change.type] += 1
+
+    @property
+    def unchanged(self) -> bool:
+        return not (self.added_nodes or self.removed_nodes or self.added_edges or self.removed_edges)
+
+
+def merge_sorted(old: Iterator, new: Iterator, key: Callable = lambda record: record) -> Iterator[Tuple[str, tuple]]:
+    """
+    Fusion de deux flux triés par key : émet (REMOVED, r) pour les clés absentes de new
+    et (ADDED, r) pour celles absentes de old. Mémoire constante.
+    """
+    sentinel = object()
+    a = next(old, sentinel)
+    b = next(new, sentinel)
+    while a is not sentinel or b is not sentinel:
+        if b is sentinel or (a is not sentinel and key(a) < key(b)):
+            yield REMOVED, a
+            a = next(old, sentinel)
+        elif a is sentinel or key(b) < key(a):
+            yield ADDED, b
+            b = next(new, sentinel)
+        else:
+            a = next(old, sentinel)
+            b = next(new, sentinel)
+
+
+def diff_scans(old: Source, new: Source) -> Iterator[Change]:
+    """
+    Changements entre deux scans : nœuds puis arêtes ajoutés/retirés.
+    Les extrémités des arêtes changées sont résolues à la demande dans le scan qui les contient.
+    """
+    for action, (node_id, node_type, value) in merge_sorted(old.iter_nodes(), new.iter_nodes(), key=_first):
+        yield Change(action, "node", node_type, node=Node(value=value, type=NodeType(node_type)))
+
+    for action, (source, target, edge_type) in merge_sorted(old.iter_edges(), new.iter_edges()):
+        side = new if action == ADDED else old
+        source_node = side.node(source)
+        target_node = side.node(target)
+        edge = None
+        if source_node is not None and target_node is not None:
+            edge = Edge(source=source_node, target=target_node, type=EdgeType(edge_type))
+        yield Change(action, "edge", edge_type, edge=edge)
+
+
+def summarize(changes: Iterable[Change]) -> DiffSummary:
+    summary = DiffSummary()
+    for change in changes:
+        summary.add(change)
+    return summary
+
+
+def _first(record: tuple):
+    return record[0]
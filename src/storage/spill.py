@@ -0,0 +1,377 @@
+"""
+Graphe du scan à mémoire bornée : nœuds et arêtes exacts dans un fichier SQLite, filtres de Bloom
+en mémoire pour éviter la plupart des lectures disque.
+
+Un nom jamais vu (le cas courant d'un crawl) est écarté par le filtre sans lecture ; seuls les
+« peut-être déjà vu » sont vérifiés sur disque, ce qui garde la déduplication exacte. Quand le
+plafond mémoire empêche les filtres de grandir, leur taux de faux positifs monte : le scan ralentit
+(plus de vérifications sur disque) mais la mémoire reste bornée. La taille du crawl dépend alors
+du disque, pas de la RAM.
+"""
+import os
+import sqlite3
+import struct
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.models.bloom import ScalableBloomFilter
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.models.store import EDGE_TYPE_CODES, EDGE_TYPES, NODE_TYPES, EdgeView, NodeView, VisitedView
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    type INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS nodes_key ON nodes (value, type);
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY,
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    type INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS edges_key ON edges (source, target, type);
+CREATE INDEX IF NOT EXISTS edges_target ON edges (target);
+"""
+
+NODE_TYPE_CODES: Dict[NodeType, int] = {node_type: code for code, node_type in enumerate(NODE_TYPES)}
+
+# Plafond par défaut : filtres de Bloom et cache de pages SQLite
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+_EDGE_KEY = struct.Struct("<QQB")
+
+
+class SpillGraphStore:
+    """
+    Remplace GraphStore (même interface, mêmes vues nodes/edges/visited) avec une empreinte
+    mémoire plafonnée par memory_limit : 3/8 pour le filtre des nœuds, 3/8 pour celui des arêtes,
+    1/4 pour le cache de pages SQLite. S'y ajoutent le bitmap des visites (1 bit par nœud), le
+    tampon d'écriture (batch_size lignes) et deux caches de cache_nodes nœuds (id -> nœud, nom -> id).
+
+    Sans path, le fichier est temporaire et supprimé par close().
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                 error_rate: float = 1e-3, batch_size: int = 10000, cache_nodes: int = 10000):
+        self.memory_limit = memory_limit
+        self.batch_size = batch_size
+        self.cache_nodes = cache_nodes
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="dns-checker-", suffix=".spill.db")
+            os.close(fd)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute(f"PRAGMA cache_size=-{max(64, memory_limit // 4 // 1024)}")
+        self.conn.executescript(SCHEMA)
+
+        filter_bytes = memory_limit * 3 // 8
+        self.node_filter = ScalableBloomFilter(error_rate=error_rate, max_bytes=filter_bytes)
+        self.edge_filter = ScalableBloomFilter(error_rate=error_rate, max_bytes=filter_bytes)
+
+        self.nodes = NodeView(self)
+        self.edges = EdgeView(self)
+        self.visited = VisitedView(self)
+        self.clear()
+
+    def __enter__(self) -> "SpillGraphStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+        if self._temporary:
+            for suffix in ("", "-journal", "-wal", "-shm"):
+                try:
+                    os.remove(self.path + suffix)
+                except FileNotFoundError:
+                    pass
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM nodes")
+            self.conn.execute("DELETE FROM edges")
+        self.node_filter.clear()
+        self.edge_filter.clear()
+        self._node_count = 0
+        self._flushed_nodes = 0
+        self._pending_nodes: Dict[Tuple[int, str], int] = {}
+        self._pending_node_rows: List[Tuple[int, int, str]] = []
+        self._edge_count = 0
+        self._next_edge = 0
+        self._pending_edges: Dict[Tuple[int, int, int], int] = {}
+        self._pending_edge_rows: List[Tuple[int, int, int, int]] = []
+        self._cache: "OrderedDict[int, Node]" = OrderedDict()
+        self._recent_ids: "OrderedDict[Tuple[int, str], int]" = OrderedDict()
+        self._visited = bytearray()
+        self._visited_count = 0
+        # Vérifications sur disque demandées par les filtres, et celles qui n'ont rien trouvé
+        self.node_lookups = 0
+        self.node_false_positives = 0
+        self.edge_lookups = 0
+        self.edge_false_positives = 0
+
+    def flush(self):
+        if not self._pending_node_rows and not self._pending_edge_rows:
+            return
+        with self.conn:
+            if self._pending_node_rows:
+                self.conn.executemany("INSERT INTO nodes VALUES (?, ?, ?)", self._pending_node_rows)
+            if self._pending_edge_rows:
+                self.conn.executemany("INSERT INTO edges VALUES (?, ?, ?, ?)", self._pending_edge_rows)
+        self._flushed_nodes = self._node_count
+        self._pending_nodes.clear()
+        self._pending_node_rows.clear()
+        self._pending_edges.clear()
+        self._pending_edge_rows.clear()
+
+    # --- Nœuds ---
+
+    def intern(self, node: Node) -> int:
+        return self.add_node(node)[0]
+
+    def add_node(self, node: Node) -> Tuple[int, bool]:
+        code = NODE_TYPE_CODES[node.type]
+        key = (code, node.value)
+        node_id = self._pending_nodes.get(key)
+        if node_id is None:
+            node_id = self._recent_ids.get(key)
+            if node_id is not None:
+                self._recent_ids.move_to_end(key)
+        if node_id is not None:
+            return node_id, False
+        if self.node_filter.add(self._node_key(code, node.value)):
+            self.node_lookups += 1
+            node_id = self._select_node_id(code, node.value)
+            if node_id is not None:
+                self._remember(key, node_id)
+                return node_id, False
+            self.node_false_positives += 1
+
+        node_id = self._node_count
+        self._node_count += 1
+        self._pending_nodes[key] = node_id
+        self._pending_node_rows.append((node_id, code, node.value))
+        self._remember(key, node_id)
+        if len(self._visited) * 8 <= node_id:
+            self._visited.extend(bytes(max(1024, len(self._visited))))
+        if len(self._pending_node_rows) >= self.batch_size:
+            self.flush()
+        return node_id, True
+
+    def node_id(self, node: Node) -> Optional[int]:
+        code = NODE_TYPE_CODES[node.type]
+        node_id = self._pending_nodes.get((code, node.value))
+        if node_id is None:
+            node_id = self._recent_ids.get((code, node.value))
+        if node_id is not None or self._node_key(code, node.value) not in self.node_filter:
+            return node_id
+        return self._select_node_id(code, node.value)
+
+    def node(self, node_id: int) -> Node:
+        cache = self._cache
+        node = cache.get(node_id)
+        if node is not None:
+            cache.move_to_end(node_id)
+            return node
+        if node_id >= self._flushed_nodes:
+            _, code, value = self._pending_node_rows[node_id - self._flushed_nodes]
+        else:
+            row = self.conn.execute("SELECT type, value FROM nodes WHERE id = ?", (node_id,)).fetchone()
+            if row is None:
+                raise KeyError(node_id)
+            code, value = row
+            # Nœud relu pour être développé : ses arêtes sortantes vont le réinterner
+            self._remember((code, value), node_id)
+        node = Node(value=value, type=NODE_TYPES[code])
+        cache[node_id] = node
+        if len(cache) > self.cache_nodes:
+            cache.popitem(last=False)
+        return node
+
+    def node_count(self) -> int:
+        return self._node_count
+
+    def iter_nodes(self) -> Iterator[Node]:
+        self.flush()
+        for code, value in self.conn.execute("SELECT type, value FROM nodes ORDER BY id"):
+            yield Node(value=value, type=NODE_TYPES[code])
+
+    def _remember(self, key: Tuple[int, str], node_id: int):
+        # Noms récents (parents, serveurs NS, IP partagées reviennent souvent) : sans lecture disque
+        recent = self._recent_ids
+        recent[key] = node_id
+        if len(recent) > self.cache_nodes:
+            recent.popitem(last=False)
+
+    def _select_node_id(self, code: int, value: str) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM nodes WHERE value = ? AND type = ?", (value, code)).fetchone()
+        return row[0] if row else None
+
+    def _node_key(self, code: int, value: str) -> bytes:
+        return f"{code}:{value}".encode("utf-8")
+
+    # --- Arêtes ---
+
+    def add_edge(self, edge: Edge) -> bool:
+        return self.add_edge_ids(self.intern(edge.source), self.intern(edge.target), edge.type)
+
+    def add_edge_ids(self, src: int, dst: int, edge_type: EdgeType) -> bool:
+        code = EDGE_TYPE_CODES[edge_type]
+        key = (src, dst, code)
+        if key in self._pending_edges:
+            return False
+        if self.edge_filter.add(_EDGE_KEY.pack(*key)):
+            self.edge_lookups += 1
+            if self._select_edge_id(src, dst, code) is not None:
+                return False
+            self.edge_false_positives += 1
+
+        index = self._next_edge
+        self._next_edge += 1
+        self._edge_count += 1
+        self._pending_edges[key] = index
+        self._pending_edge_rows.append((index, src, dst, code))
+        if len(self._pending_edge_rows) >= self.batch_size:
+            self.flush()
+        return True
+
+    def remove_edge_ids(self, src: int, dst: int, edge_type: EdgeType) -> bool:
+        # Rare (surveillance) : on écrit d'abord le tampon ; le filtre garde la clé, sans conséquence
+        self.flush()
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM edges WHERE source = ? AND target = ? AND type = ?",
+                                       (src, dst, EDGE_TYPE_CODES[edge_type]))
+        if not cursor.rowcount:
+            return False
+        self._edge_count -= 1
+        return True
+
+    def has_edge(self, edge: Edge) -> bool:
+        src = self.node_id(edge.source)
+        dst = self.node_id(edge.target)
+        if src is None or dst is None:
+            return False
+        key = (src, dst, EDGE_TYPE_CODES[edge.type])
+        if key in self._pending_edges:
+            return True
+        if _EDGE_KEY.pack(*key) not in self.edge_filter:
+            return False
+        return self._select_edge_id(*key) is not None
+
+    def edge(self, index: int) -> Edge:
+        src, dst, code = self.edge_ids(index)
+        return Edge(source=self.node(src), target=self.node(dst), type=EDGE_TYPES[code])
+
+    def edge_ids(self, index: int) -> Tuple[int, int, int]:
+        self.flush()
+        row = self.conn.execute("SELECT source, target, type FROM edges WHERE id = ?", (index,)).fetchone()
+        if row is None:
+            raise KeyError(index)
+        return row
+
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    def edge_indices(self) -> Iterator[int]:
+        self.flush()
+        for (index,) in self.conn.execute("SELECT id FROM edges ORDER BY id"):
+            yield index
+
+    def iter_edges(self) -> Iterator[Edge]:
+        """
+        Arêtes lues en flux depuis le disque, nœuds reconstruits par la jointure (sans le cache).
+        """
+        self.flush()
+        rows = self.conn.execute(
+            "SELECT s.type, s.value, t.type, t.value, e.type FROM edges e "
+            "JOIN nodes s ON s.id = e.source JOIN nodes t ON t.id = e.target ORDER BY e.id"
+        )
+        for source_code, source, target_code, target, code in rows:
+            yield Edge(source=Node(value=source, type=NODE_TYPES[source_code]),
+                       target=Node(value=target, type=NODE_TYPES[target_code]),
+                       type=EDGE_TYPES[code])
+
+    def out_edges(self, node_id: int) -> List[int]:
+        self.flush()
+        return [index for (index,) in self.conn.execute("SELECT id FROM edges WHERE source = ? ORDER BY id", (node_id,))]
+
+    def in_edges(self, node_id: int) -> List[int]:
+        self.flush()
+        return [index for (index,) in self.conn.execute("SELECT id FROM edges WHERE target = ? ORDER BY id", (node_id,))]
+
+    def _select_edge_id(self, src: int, dst: int, code: int) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM edges WHERE source = ? AND target = ? AND type = ?",
+                                (src, dst, code)).fetchone()
+        return row[0] if row else None
+
+    # --- Visites (bitmap exact : les identifiants sont denses) ---
+
+    def mark_visited(self, node_id: int) -> bool:
+        byte, mask = node_id >> 3, 1 << (node_id & 7)
+        if self._visited[byte] & mask:
+            return False
+        self._visited[byte] |= mask
+        self._visited_count += 1
+        return True
+
+    def unmark_visited(self, node_id: int) -> bool:
+        byte, mask = node_id >> 3, 1 << (node_id & 7)
+        if not self._visited[byte] & mask:
+            return False
+        self._visited[byte] &= ~mask & 0xFF
+        self._visited_count -= 1
+        return True
+
+    def is_visited(self, node_id: int) -> bool:
+        byte = node_id >> 3
+        return byte < len(self._visited) and bool(self._visited[byte] & (1 << (node_id & 7)))
+
+    def visited_count(self) -> int:
+        return self._visited_count
+
+    def iter_visited(self) -> Iterator[Node]:
+        self.flush()
+        for node_id, code, value in self.conn.execute("SELECT id, type, value FROM nodes ORDER BY id"):
+            if self.is_visited(node_id):
+                yield Node(value=value, type=NODE_TYPES[code])
+
+    # --- Statistiques ---
+
+    def memory_bytes(self) -> int:
+        """
+        Mémoire des structures en RAM (filtres, bitmap des visites), hors cache SQLite et tampons.
+        """
+        return self.node_filter.nbytes + self.edge_filter.nbytes + len(self._visited)
+
+    def stats(self) -> dict:
+        try:
+            disk_bytes = os.path.getsize(self.path)
+        except OSError:
+            disk_bytes = None
+        return {
+            "path": self.path,
+            "memory_limit": self.memory_limit,
+            "memory_bytes": self.memory_bytes(),
+            "disk_bytes": disk_bytes,
+            "node_filter": self._filter_stats(self.node_filter, self.node_lookups, self.node_false_positives,
+                                              self._node_count),
+            "edge_filter": self._filter_stats(self.edge_filter, self.edge_lookups, self.edge_false_positives,
+                                              self._next_edge),
+        }
+
+    def _filter_stats(self, bloom: ScalableBloomFilter, lookups: int, false_positives: int, inserted: int) -> dict:
+        # Chaque insertion est une requête sur une clé absente : false_positives / inserted est le taux observé
+        return {
+            **bloom.stats(),
+            "disk_lookups": lookups,
+            "false_positives": false_positives,
+            "observed_false_positive_rate": false_positives / inserted if inserted else 0.0,
+        }
@@ -0,0 +1,328 @@
+import ipaddress
+import sqlite3
+import time
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+from src.engine.events import ScanListener
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.models.ids import stable_int
+from src.models.names import canonical_name
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    root TEXT,
+    label TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    scan_id INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    addr_lo BLOB,
+    addr_hi BLOB,
+    PRIMARY KEY (scan_id, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS nodes_value ON nodes (value, scan_id);
+CREATE INDEX IF NOT EXISTS nodes_type ON nodes (scan_id, type);
+CREATE INDEX IF NOT EXISTS nodes_addr ON nodes (scan_id, addr_lo, addr_hi);
+CREATE TABLE IF NOT EXISTS edges (
+    scan_id INTEGER NOT NULL,
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    PRIMARY KEY (scan_id, source, target, type)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_target ON edges (scan_id, target);
+CREATE INDEX IF NOT EXISTS edges_type ON edges (scan_id, type);
+"""
+
+# Nombre maximal de paramètres par clause IN (limite SQLite : 32766 depuis 3.32)
+IN_CHUNK = 500
+
+Network = Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+def address_range(node: Node) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """
+    Bornes d'adresses d'un nœud IP ou préfixe, sur 16 octets comparables (IPv4 mappée en ::ffff:0:0/96).
+    """
+    try:
+        if node.type in (NodeType.IP_V4, NodeType.IP_V6):
+            address = ipaddress.ip_address(node.value)
+            return _packed(address), _packed(address)
+        if node.type in (NodeType.PREFIX_V4, NodeType.PREFIX_V6):
+            network = ipaddress.ip_network(node.value, strict=False)
+            return _packed(network.network_address), _packed(network.broadcast_address)
+    except ValueError:
+        pass
+    return None, None
+
+def _packed(address) -> bytes:
+    if address.version == 4:
+        return b"\x00" * 10 + b"\xff\xff" + address.packed
+    return address.packed
+
+class ResultStore(ScanListener):
+    """
+    Stockage SQLite indexé des résultats de scan, pour interroger des graphes hors mémoire.
+    Chaque scan reçoit un identifiant ; les insertions sont regroupées en transactions par lots.
+    Branché sur un scan via engine.add_listener(), il enregistre le graphe au fil de l'eau.
+    """
+
+    def __init__(self, path: str, batch_size: int = 10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.scan_id: Optional[int] = None
+        self._node_rows: List[tuple] = []
+        self._edge_rows: List[tuple] = []
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    # --- Écriture ---
+
+    def begin_scan(self, root: Optional[Node] = None, label: Optional[str] = None) -> int:
+        self.flush()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO scans (root, label, started_at) VALUES (?, ?, ?)",
+                (root.value if root else None, label, time.time()),
+            )
+        self.scan_id = cursor.lastrowid
+        return self.scan_id
+
+    def end_scan(self):
+        self.flush()
+        if self.scan_id is not None:
+            with self.conn:
+                self.conn.execute("UPDATE scans SET finished_at = ? WHERE id = ?", (time.time(), self.scan_id))
+
+    def add_node(self, node: Node):
+        addr_lo, addr_hi = address_range(node)
+        self._node_rows.append((self._current_scan(), stable_int(node), node.type.value, node.value, addr_lo, addr_hi))
+        if len(self._node_rows) >= self.batch_size:
+            self.flush()
+
+    def add_edge(self, edge: Edge):
+        self._edge_rows.append((self._current_scan(), stable_int(edge.source), stable_int(edge.target), edge.type.value))
+        if len(self._edge_rows) >= self.batch_size:
+            self.flush()
+
+    def save(self, nodes: Iterable[Node], edges: Iterable[Edge], root: Optional[Node] = None, label: Optional[str] = None) -> int:
+        """
+        Enregistre un graphe complet (ex: engine.nodes, engine.edges) comme un nouveau scan.
+        """
+        scan_id = self.begin_scan(root, label)
+        for node in nodes:
+            self.add_node(node)
+        for edge in edges:
+            self.add_edge(edge)
+        self.end_scan()
+        return scan_id
+
+    def flush(self):
+        if not self._node_rows and not self._edge_rows:
+            return
+        with self.conn:
+            if self._node_rows:
+                self.conn.executemany("INSERT OR IGNORE INTO nodes VALUES (?, ?, ?, ?, ?, ?)", self._node_rows)
+            if self._edge_rows:
+                self.conn.executemany("INSERT OR IGNORE INTO edges VALUES (?, ?, ?, ?)", self._edge_rows)
+        self._node_rows.clear()
+        self._edge_rows.clear()
+
+    def _current_scan(self) -> int:
+        if self.scan_id is None:
+            self.begin_scan()
+        return self.scan_id
+
+    # Événements du scan
+    def on_scan_start(self, root: Node):
+        self.begin_scan(root)
+
+    def on_node(self, node: Node):
+        self.add_node(node)
+
+    def on_edge(self, edge: Edge):
+        self.add_edge(edge)
+
+    def on_scan_end(self):
+        self.end_scan()
+
+    # --- Lecture ---
+
+    def scans(self) -> List[Tuple[int, Optional[str], Optional[str], float, Optional[float]]]:
+        self.flush()
+        return self.conn.execute("SELECT id, root, label, started_at, finished_at FROM scans ORDER BY id").fetchall()
+
+    def latest_scan(self) -> Optional[int]:
+        self.flush()
+        row = self.conn.execute("SELECT MAX(id) FROM scans").fetchone()
+        return row[0] if row else None
+
+    def iter_nodes(self, scan_id: Optional[int] = None, order_by_id: bool = False) -> Iterator[Tuple[int, Node]]:
+        """
+        Parcourt les nœuds d'un scan sous forme (id stable, Node), sans tout charger.
+        """
+        scan_id = self._resolve_scan(scan_id)
+        query = "SELECT id, type, value FROM nodes WHERE scan_id = ?"
+        if order_by_id:
+            query += " ORDER BY id"
+        for node_id, node_type, value in self.conn.execute(query, (scan_id,)):
+            yield node_id, Node(value=value, type=NodeType(node_type))
+
+    def iter_edges(self, scan_id: Optional[int] = None, order_by_key: bool = False) -> Iterator[Tuple[int, int, str]]:
+        """
+        Parcourt les arêtes d'un scan sous forme (source, target, type).
+        """
+        scan_id = self._resolve_scan(scan_id)
+        query = "SELECT source, target, type FROM edges WHERE scan_id = ?"
+        if order_by_key:
+            query += " ORDER BY source, target, type"
+        yield from self.conn.execute(query, (scan_id,))
+
+    def find(self, value: str, node_type: Optional[NodeType] = None, scan_id: Optional[int] = None) -> List[Node]:
+        scan_id = self._resolve_scan(scan_id)
+        value = self._canonical(value, node_type)
+        query = "SELECT type, value FROM nodes WHERE value = ? AND scan_id = ?"
+        params: list = [value, scan_id]
+        if node_type is not None:
+            query += " AND type = ?"
+            params.append(node_type.value)
+        return [Node(value=v, type=NodeType(t)) for t, v in self.conn.execute(query, params)]
+
+    def sources_of(self, value: str, node_type: Optional[NodeType] = None,
+                   edge_types: Optional[Iterable[EdgeType]] = None, scan_id: Optional[int] = None) -> List[Tuple[Node, EdgeType]]:
+        """
+        Recherche inverse : nœuds qui pointent vers value (ex: domaines résolvant vers une IP).
+        """
+        scan_id = self._resolve_scan(scan_id)
+        targets = [stable_int(node) for node in self.find(value, node_type, scan_id)]
+        if not targets:
+            return []
+        query = (
+            "SELECT s.type, s.value, e.type FROM edges e "
+            "JOIN nodes s ON s.scan_id = e.scan_id AND s.id = e.source "
+            f"WHERE e.scan_id = ? AND e.target IN ({','.join('?' * len(targets))})"
+        )
+        params: list = [scan_id, *targets]
+        query, params = self._filter_edge_types(query, params, edge_types)
+        return [(Node(value=v, type=NodeType(t)), EdgeType(et)) for t, v, et in self.conn.execute(query, params)]
+
+    def nodes_in(self, network: Network, scan_id: Optional[int] = None) -> List[Node]:
+        """
+        Nœuds IP et préfixes entièrement contenus dans network (ex: "203.0.113.0/24").
+        """
+        scan_id = self._resolve_scan(scan_id)
+        low, high = self._network_bounds(network)
+        query = "SELECT type, value FROM nodes WHERE scan_id = ? AND addr_lo >= ? AND addr_lo <= ? AND addr_hi <= ?"
+        return [Node(value=v, type=NodeType(t)) for t, v in self.conn.execute(query, (scan_id, low, high, high))]
+
+    def resolving_into(self, network: Network, scan_id: Optional[int] = None,
+                       edge_types: Iterable[EdgeType] = (EdgeType.A, EdgeType.AAAA)) -> List[Tuple[Node, Node]]:
+        """
+        Couples (nœud source, IP) dont l'IP tombe dans network : "quels domaines résolvent dans 203.0.113.0/24".
+        """
+        scan_id = self._resolve_scan(scan_id)
+        low, high = self._network_bounds(network)
+        query = (
+            "SELECT s.type, s.value, t.type, t.value FROM nodes t "
+            "JOIN edges e ON e.scan_id = t.scan_id AND e.target = t.id "
+            "JOIN nodes s ON s.scan_id = e.scan_id AND s.id = e.source "
+            "WHERE t.scan_id = ? AND t.addr_lo >= ? AND t.addr_lo <= ? AND t.addr_hi <= ?"
+        )
+        params: list = [scan_id, low, high, high]
+        query, params = self._filter_edge_types(query, params, edge_types)
+        return [
+            (Node(value=sv, type=NodeType(st)), Node(value=tv, type=NodeType(tt)))
+            for st, sv, tt, tv in self.conn.execute(query, params)
+        ]
+
+    def neighbourhood(self, value: str, hops: int = 2, node_type: Optional[NodeType] = None,
+                      scan_id: Optional[int] = None) -> Tuple[Set[Node], Set[Edge]]:
+        """
+        Sous-graphe à au plus `hops` arêtes de value, dans les deux sens.
+        Parcours en largeur niveau par niveau, chaque niveau servi par les index source/target.
+        """
+        scan_id = self._resolve_scan(scan_id)
+        frontier = {stable_int(node) for node in self.find(value, node_type, scan_id)}
+        seen = set(frontier)
+        edge_rows = set()
+
+        for _ in range(hops):
+            if not frontier:
+                break
+            next_frontier = set()
+            for chunk in self._chunks(list(frontier)):
+                marks = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT source, target, type FROM edges WHERE scan_id = ? AND source IN ({marks}) "
+                    f"UNION SELECT source, target, type FROM edges WHERE scan_id = ? AND target IN ({marks})",
+                    (scan_id, *chunk, scan_id, *chunk),
+                )
+                for source, target, edge_type in rows:
+                    edge_rows.add((source, target, edge_type))
+                    for node_id in (source, target):
+                        if node_id not in seen:
+                            seen.add(node_id)
+                            next_frontier.add(node_id)
+            frontier = next_frontier
+
+        nodes = {}
+        for chunk in self._chunks(list(seen)):
+            rows = self.conn.execute(
+                f"SELECT id, type, value FROM nodes WHERE scan_id = ? AND id IN ({','.join('?' * len(chunk))})",
+                (scan_id, *chunk),
+            )
+            for node_id, node_type_value, node_value in rows:
+                nodes[node_id] = Node(value=node_value, type=NodeType(node_type_value))
+
+        edges = {
+            Edge(source=nodes[source], target=nodes[target], type=EdgeType(edge_type))
+            for source, target, edge_type in edge_rows
+            if source in nodes and target in nodes
+        }
+        return set(nodes.values()), edges
+
+    def _resolve_scan(self, scan_id: Optional[int]) -> int:
+        self.flush()
+        if scan_id is None:
+            scan_id = self.latest_scan()
+        if scan_id is None:
+            raise LookupError("Aucun scan enregistré")
+        return scan_id
+
+    def _canonical(self, value: str, node_type: Optional[NodeType]) -> str:
+        if node_type is not None:
+            return Node(value=value, type=node_type).value
+        try:
+            return str(ipaddress.ip_address(value.strip()))
+        except ValueError:
+            return canonical_name(value.strip())
+
+    def _network_bounds(self, network: Network) -> Tuple[bytes, bytes]:
+        network = ipaddress.ip_network(network, strict=False)
+        return _packed(network.network_address), _packed(network.broadcast_address)
+
+    def _filter_edge_types(self, query: str, params: list, edge_types: Optional[Iterable[EdgeType]]):
+        if edge_types is None:
+            return query, params
+        edge_types = [edge_type.value for edge_type in edge_types]
+        query += f" AND e.type IN ({','.join('?' * len(edge_types))})"
+        return query, params + edge_types
+
+    def _chunks(self, items: list) -> Iterator[list]:
+        for start in range(0, len(items), IN_CHUNK):
+            yield items[start:start + IN_CHUNK]
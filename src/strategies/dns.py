@@ -1,3 +1,4 @@
+import dns.exception
 import dns.resolver
 from typing import Generator, Tuple
 from src.models.graph import Node, Edge, NodeType, EdgeType
@@ -46,5 +47,5 @@ class BasicDNSStrategy(Strategy):
 
                     edge = Edge(source=node, target=new_node, type=edge_type)
                     yield new_node, edge
-            except Exception:
+            except dns.exception.DNSException:
                 continue
@@ -1,18 +1,67 @@
+import dns.exception
 import dns.reversename
 import dns.resolver
 import ipaddress
-from typing import Generator, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Generator, Iterable, List, Set, Tuple
+from src.engine.resolver import is_refused
 from src.models.graph import Node, Edge, NodeType, EdgeType
 from src.strategies.base import Strategy
 
+# Résultats possibles d'une sonde PTR
+FOUND = "found"
+NXDOMAIN = "nxdomain"
+NODATA = "nodata"
+REFUSED = "refused"
+SERVFAIL = "servfail"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+def probe_ptr(resolver, name) -> str:
+    """
+    Interroge un nom inverse en PTR et classe la réponse.
+    """
+    try:
+        resolver.resolve(name, "PTR")
+        return FOUND
+    except dns.resolver.NXDOMAIN:
+        return NXDOMAIN
+    except dns.resolver.NoAnswer:
+        return NODATA
+    except dns.resolver.NoNameservers as e:
+        # Tous les serveurs ont échoué : refus (permanent) ou SERVFAIL (transitoire)
+        return REFUSED if is_refused(e) else SERVFAIL
+    except dns.exception.Timeout:
+        return TIMEOUT
+    except Exception:
+        return ERROR
+
 class NeighborStrategy(Strategy):
     """
     Vérifie les voisins IP contigus (+1/-1).
     Les valide via une recherche PTR principalement.
+
+    En mode "sweep", balaie toute la fenêtre CIDR autour de l'IP (par défaut le /24)
+    avec des requêtes PTR parallèles. Chaque fenêtre n'est balayée qu'une fois, et
+    une zone in-addr.arpa qui répond NXDOMAIN/REFUSED est abandonnée.
     """
-    def __init__(self):
+    MODES = ("adjacent", "sweep")
+
+    def __init__(self, mode: str = "adjacent", window: int = 24, workers: int = 16):
+        if mode not in self.MODES:
+            raise ValueError(f"Mode inconnu : {mode}")
+        if not 24 <= window <= 32:
+            raise ValueError("La fenêtre de balayage doit être comprise entre /24 et /32")
         self.resolver = dns.resolver.Resolver()
         self.resolver.lifetime = 1.0 # Court délai pour les voisins
+        self.mode = mode
+        self.window = window
+        self.workers = workers
+        # Résultat PTR déjà connu par IP, pour ne pas resonder les voisins communs
+        self._probed: Dict[int, bool] = {}
+        # Fenêtres déjà balayées et /24 dont la zone inverse est morte
+        self._swept: Set[ipaddress.IPv4Network] = set()
+        self._dead_zones: Set[ipaddress.IPv4Network] = set()
 
     def execute(self, node: Node) -> Generator[Tuple[Node, Edge], None, None]:
         if node.type != NodeType.IP_V4:
@@ -20,29 +69,166 @@ class NeighborStrategy(Strategy):
 
         try:
             ip_obj = ipaddress.IPv4Address(node.value)
-            # Voisins naïfs : +1 et -1
-            # Nous devons faire attention à ne pas générer d'IP invalides ou broadcast/réseau
-            neighbors = []
-            if ip_obj > ipaddress.IPv4Address("0.0.0.0"):
-                neighbors.append(ip_obj - 1)
-            if ip_obj < ipaddress.IPv4Address("255.255.255.255"):
-                neighbors.append(ip_obj + 1)
-
-            for neighbor_ip in neighbors:
-                neighbor_str = str(neighbor_ip)
-                
-                # Logique de vérification : Ce voisin a-t-il un PTR ?
-                # Si oui, c'est un nœud valide à ajouter.
-                try:
-                    addr = dns.reversename.from_address(neighbor_str)
-                    _ = self.resolver.resolve(addr, "PTR")
-                    
-                    # Si le PTR existe, nous le traitons comme un voisin trouvé
-                    new_node = Node(value=neighbor_str, type=NodeType.IP_V4)
-                    edge = Edge(source=node, target=new_node, type=EdgeType.NEIGHBOR)
-                    yield new_node, edge
-                except Exception:
-                    # Pas de PTR, ou délai dépassé -> supposé inintéressant pour l'instant
-                    continue
-        except Exception:
-            pass
+        except ValueError:
+            return
+
+        if self.mode == "sweep":
+            candidates = self._sweep(ip_obj)
+        else:
+            candidates = self._adjacent(ip_obj)
+
+        for neighbor_ip in candidates:
+            # Si le PTR existe, nous le traitons comme un voisin trouvé
+            new_node = Node(value=str(neighbor_ip), type=NodeType.IP_V4)
+            edge = Edge(source=node, target=new_node, type=EdgeType.NEIGHBOR)
+            yield new_node, edge
+
+    def _adjacent(self, ip_obj: ipaddress.IPv4Address) -> List[ipaddress.IPv4Address]:
+        # Voisins naïfs : +1 et -1
+        # Nous devons faire attention à ne pas générer d'IP invalides ou broadcast/réseau
+        neighbors = []
+        if ip_obj > ipaddress.IPv4Address("0.0.0.0"):
+            neighbors.append(ip_obj - 1)
+        if ip_obj < ipaddress.IPv4Address("255.255.255.255"):
+            neighbors.append(ip_obj + 1)
+
+        found = []
+        for neighbor_ip in neighbors:
+            key = int(neighbor_ip)
+            if key not in self._probed:
+                # Pas de PTR, ou délai dépassé -> supposé inintéressant pour l'instant
+                self._probed[key] = self._probe(neighbor_ip) == FOUND
+            if self._probed[key]:
+                found.append(neighbor_ip)
+        return found
+
+    def _sweep(self, ip_obj: ipaddress.IPv4Address) -> List[ipaddress.IPv4Address]:
+        window = ipaddress.IPv4Network(f"{ip_obj}/{self.window}", strict=False)
+        zone = window.supernet(new_prefix=24) if self.window > 24 else window
+        if window in self._swept or zone in self._dead_zones:
+            return []
+        self._swept.add(window)
+
+        if not self._zone_alive(zone):
+            self._dead_zones.add(zone)
+            return []
+
+        targets = [ip for ip in window if ip != ip_obj and int(ip) not in self._probed]
+        found = [ip for ip in window if ip != ip_obj and self._probed.get(int(ip))]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for batch in self._batches(targets, self.workers * 4):
+                outcomes = list(pool.map(self._probe, batch))
+                for ip, outcome in zip(batch, outcomes):
+                    self._probed[int(ip)] = outcome == FOUND
+                    if outcome == FOUND:
+                        found.append(ip)
+                # Le serveur de la zone refuse tout : inutile de continuer le bloc
+                if outcomes and all(outcome == REFUSED for outcome in outcomes):
+                    self._dead_zones.add(zone)
+                    break
+
+        return sorted(found)
+
+    def _zone_alive(self, zone: ipaddress.IPv4Network) -> bool:
+        """
+        Interroge le nom de la zone inverse du /24 (ex: 2.0.192.in-addr.arpa).
+        NXDOMAIN signifie qu'aucun nom n'existe en dessous (RFC 8020), REFUSED que le serveur ne répondra pas.
+        Un délai dépassé ne prouve rien (perte de paquet, serveur chargé) : la zone est balayée quand même.
+        """
+        octets = str(zone.network_address).split(".")[:3]
+        name = ".".join(reversed(octets)) + ".in-addr.arpa."
+        return probe_ptr(self.resolver, name) not in (NXDOMAIN, REFUSED)
+
+    def _probe(self, ip: ipaddress.IPv4Address) -> str:
+        return probe_ptr(self.resolver, dns.reversename.from_address(str(ip)))
+
+    def _batches(self, items: List, size: int) -> Iterable[List]:
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+class Ipv6NeighborStrategy(Strategy):
+    """
+    Énumère les voisins IPv6 en parcourant l'arbre ip6.arpa sous le /48 ou /64
+    d'une adresse découverte.
+    Une réponse NXDOMAIN sur un nœud de l'arbre signifie qu'aucun nom n'existe
+    en dessous (RFC 8020) : le sous-arbre est élagué sans être exploré.
+    """
+    def __init__(self, prefix_len: int = 64, max_queries: int = 4096, workers: int = 16):
+        if prefix_len % 4 or not 0 < prefix_len < 128:
+            raise ValueError("La longueur de préfixe doit être un multiple de 4 (ex: 48 ou 64)")
+        self.resolver = dns.resolver.Resolver()
+        self.resolver.lifetime = 1.0
+        self.prefix_len = prefix_len
+        self.max_queries = max_queries
+        self.workers = workers
+        # Préfixes entièrement parcourus, pour ne pas reparcourir l'arbre depuis chaque adresse
+        self._walked: Set[str] = set()
+        # Parcours interrompus par le budget : nœuds restant à développer, repris depuis l'adresse suivante
+        self._resume: Dict[str, List[str]] = {}
+
+    def execute(self, node: Node) -> Generator[Tuple[Node, Edge], None, None]:
+        if node.type != NodeType.IP_V6:
+            return
+
+        try:
+            ip_obj = ipaddress.IPv6Address(node.value)
+        except ValueError:
+            return
+
+        prefix = f"{int(ip_obj):032x}"[:self.prefix_len // 4]
+        if prefix in self._walked:
+            return
+
+        stack = self._resume.pop(prefix, None)
+        if stack is None:
+            outcome = self._probe(prefix)
+            if outcome not in (FOUND, NODATA):
+                # Un échec transitoire (timeout, SERVFAIL) laisse le préfixe à retenter
+                if outcome in (NXDOMAIN, REFUSED):
+                    self._walked.add(prefix)
+                return
+            stack = [prefix]
+
+        found, stack = self._walk(stack)
+        if stack:
+            self._resume[prefix] = stack
+        else:
+            self._walked.add(prefix)
+
+        for address in found:
+            if address == ip_obj:
+                continue
+            new_node = Node(value=str(address), type=NodeType.IP_V6)
+            edge = Edge(source=node, target=new_node, type=EdgeType.NEIGHBOR)
+            yield new_node, edge
+
+    def _walk(self, stack: List[str]) -> Tuple[List[ipaddress.IPv6Address], List[str]]:
+        """
+        Développe les nœuds de stack dans la limite du budget.
+        Retourne les adresses trouvées et les nœuds restant à développer (vide si le parcours est terminé).
+        """
+        budget = self.max_queries - 1
+        found = []
+        stack = list(stack)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while stack and budget >= 16:
+                path = stack.pop()
+                children = [path + nibble for nibble in "0123456789abcdef"]
+                budget -= len(children)
+                outcomes = list(pool.map(self._probe, children))
+
+                # Parcours en profondeur, nibbles croissants
+                for child, outcome in reversed(list(zip(children, outcomes))):
+                    if len(child) == 32:
+                        if outcome == FOUND:
+                            found.append(ipaddress.IPv6Address(int(child, 16)))
+                    elif outcome in (FOUND, NODATA):
+                        # NOERROR : le nom existe (éventuellement non terminal vide)
+                        stack.append(child)
+
+        return sorted(found), stack
+
+    def _probe(self, path: str) -> str:
+        name = ".".join(reversed(path)) + ".ip6.arpa."
+        return probe_ptr(self.resolver, name)
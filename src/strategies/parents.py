@@ -1,6 +1,6 @@
-import tldextract
 from typing import Generator, Tuple
 from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.models.psl import registered_domain as get_registered_domain
 from src.strategies.base import Strategy
 
 class ParentStrategy(Strategy):
@@ -13,15 +13,14 @@ class ParentStrategy(Strategy):
             return
 
         domain = node.value
-        extracted = tldextract.extract(domain)
-        
-        # Reconstruit le domaine enregistrable (par ex. example.com)
-        registered_domain = extracted.registered_domain
-        
+
+        # Domaine enregistrable (par ex. example.com), via la liste des suffixes publics embarquée
+        registered_domain = get_registered_domain(domain)
+
         # Si le nœud actuel est le domaine enregistré, doit-on s'arrêter ou aller au TLD ?
         # On ne doit éviter de scanner le TLD sinon ce sera infini mdr
         # Donc nous scannons jusqu'à atteindre le domaine enregistré.
-        
+
         if not registered_domain:
             return
 
@@ -30,7 +29,7 @@ class ParentStrategy(Strategy):
         if domain != registered_domain and domain.endswith(registered_domain):
             parts = domain.split('.')
             parent = '.'.join(parts[1:])
-            
+
             if parent:
                 new_node = Node(value=parent, type=NodeType.DOMAIN)
                 edge = Edge(source=node, target=new_node, type=EdgeType.PARENT)
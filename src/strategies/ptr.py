@@ -1,3 +1,4 @@
+import dns.exception
 import dns.reversename
 import dns.resolver
 from typing import Generator, Tuple
@@ -24,5 +25,5 @@ class PtrStrategy(Strategy):
                 new_node = Node(value=hostname, type=NodeType.DOMAIN)
                 edge = Edge(source=node, target=new_node, type=EdgeType.PTR)
                 yield new_node, edge
-        except Exception:
+        except dns.exception.DNSException:
             pass
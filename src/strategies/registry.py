@@ -0,0 +1,54 @@
+from importlib import import_module
+from typing import Dict, Iterable, List, Optional
+from src.strategies.base import Strategy
+
+# Nom court -> "module:Classe". Les modules ne sont importés qu'à la demande.
+STRATEGIES: Dict[str, str] = {
+    "dns": "src.strategies.dns:BasicDNSStrategy",
+    "txt": "src.strategies.txt:TxtStrategy",
+    "ptr": "src.strategies.ptr:PtrStrategy",
+    "parents": "src.strategies.parents:ParentStrategy",
+    "neighbors": "src.strategies.neighbors:NeighborStrategy",
+    "neighbors6": "src.strategies.neighbors:Ipv6NeighborStrategy",
+    "srv": "src.strategies.srv:SrvStrategy",
+    "subdomains": "src.strategies.subdomains:SubdomainStrategy",
+}
+
+# Jeu utilisé par l'interface Rich
+DEFAULT_STRATEGIES = ("dns", "txt", "ptr", "parents")
+
+def load_strategy(name: str, **kwargs) -> Strategy:
+    try:
+        path = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Stratégie inconnue : {name} (disponibles : {', '.join(STRATEGIES)})")
+    module_name, class_name = path.split(":")
+    return getattr(import_module(module_name), class_name)(**kwargs)
+
+def build_engine(names: Iterable[str] = DEFAULT_STRATEGIES, max_depth: int = 3, cache=None, store=None):
+    """
+    Construit un ScannerEngine avec les stratégies demandées.
+    Si cache est fourni (ex: dns.resolver.LRUCache), il est partagé par tous les resolvers.
+    store remplace le GraphStore en mémoire (ex: SpillGraphStore).
+    """
+    from src.engine.core import ScannerEngine
+
+    engine = ScannerEngine(max_depth=max_depth, store=store)
+    for name in names:
+        strategy = load_strategy(name)
+        if cache is not None and getattr(strategy, "resolver", None) is not None:
+            strategy.resolver.cache = cache
+        engine.register_strategy(strategy)
+    return engine
+
+def parse_names(spec: Optional[str]) -> List[str]:
+    """
+    "dns,txt" -> ["dns", "txt"] ; None ou "" -> jeu par défaut.
+    """
+    if not spec:
+        return list(DEFAULT_STRATEGIES)
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    for name in names:
+        if name not in STRATEGIES:
+            raise ValueError(f"Stratégie inconnue : {name} (disponibles : {', '.join(STRATEGIES)})")
+    return names
@@ -0,0 +1,146 @@
+import ipaddress
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+# RFC 7208 §4.6.4 : au plus 10 termes générant des requêtes DNS par évaluation
+SPF_LOOKUP_LIMIT = 10
+
+# Mécanismes et modificateurs qui déclenchent une requête DNS lors de l'évaluation
+LOOKUP_TERMS = frozenset({"include", "a", "mx", "ptr", "exists", "redirect"})
+
+# Un seul passage : chaque terme séparé par des espaces est reconnu par cette regex
+SPF_TERM = re.compile(
+    r"""
+    (?<!\S)
+    (?:
+        (?P<qualifier>[+\-~?])?
+        (?P<mechanism>all|include|a|mx|ptr|ip4|ip6|exists)
+        (?::(?P<value>[^/\s]+))?
+        (?:/(?P<cidr4>\d{1,3}))?
+        (?://(?P<cidr6>\d{1,3}))?
+      |
+        (?P<modifier>[a-z][a-z0-9_.\-]*)=(?P<argument>\S*)
+    )
+    (?!\S)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+DMARC_TAG = re.compile(r"\s*([a-zA-Z]+)\s*=\s*([^;]*)")
+MAILTO = re.compile(r"mailto:[^@,\s]+@([a-zA-Z0-9._-]+)", re.IGNORECASE)
+
+SPF_VERSION = re.compile(r"^\s*v=spf1(?:\s|$)", re.IGNORECASE)
+DMARC_VERSION = re.compile(r"^\s*v\s*=\s*DMARC1\s*(?:;|$)", re.IGNORECASE)
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+@dataclass(frozen=True)
+class SpfTerm:
+    """
+    Un terme SPF : mécanisme (ip4, include, mx...) ou modificateur (redirect, exp).
+    """
+    name: str
+    value: Optional[str] = None
+    qualifier: str = "+"
+    cidr4: Optional[int] = None
+    cidr6: Optional[int] = None
+    is_modifier: bool = False
+
+    @property
+    def needs_lookup(self) -> bool:
+        return self.name in LOOKUP_TERMS
+
+    @property
+    def domain(self) -> Optional[str]:
+        """
+        Domaine cible du terme, sans point final.
+        Les domaines contenant des macros (%{i}...) ne sont pas exploitables hors évaluation.
+        """
+        if self.name in ("ip4", "ip6", "all") or not self.value:
+            return None
+        if "%" in self.value:
+            return None
+        return self.value.rstrip(".")
+
+    def network(self) -> Optional[Network]:
+        """
+        Réseau désigné par un mécanisme ip4/ip6, en conservant le suffixe CIDR.
+        """
+        if self.name not in ("ip4", "ip6") or not self.value:
+            return None
+        if self.name == "ip4":
+            length = self.cidr4 if self.cidr4 is not None else 32
+        else:
+            # Pour ip6, le suffixe simple "/64" est la longueur IPv6
+            length = self.cidr4 if self.cidr4 is not None else 128
+        try:
+            network = ipaddress.ip_network(f"{self.value}/{length}", strict=False)
+        except ValueError:
+            return None
+        if (self.name == "ip4") != (network.version == 4):
+            return None
+        return network
+
+
+@dataclass(frozen=True)
+class Policy:
+    """
+    Politique SPF ou DMARC analysée à partir d'un enregistrement TXT.
+    """
+    kind: str  # "spf" ou "dmarc"
+    terms: Tuple[SpfTerm, ...] = ()
+    report_domains: Tuple[str, ...] = ()
+
+    @property
+    def lookup_count(self) -> int:
+        return sum(1 for term in self.terms if term.needs_lookup)
+
+
+def parse_spf(text: str) -> Policy:
+    terms = []
+    for match in SPF_TERM.finditer(text):
+        modifier = match.group("modifier")
+        if modifier:
+            name = modifier.lower()
+            if name == "v":
+                continue
+            terms.append(SpfTerm(name=name, value=match.group("argument") or None, is_modifier=True))
+            continue
+
+        cidr4 = match.group("cidr4")
+        cidr6 = match.group("cidr6")
+        terms.append(
+            SpfTerm(
+                name=match.group("mechanism").lower(),
+                value=match.group("value"),
+                qualifier=match.group("qualifier") or "+",
+                cidr4=int(cidr4) if cidr4 is not None else None,
+                cidr6=int(cidr6) if cidr6 is not None else None,
+            )
+        )
+    return Policy(kind="spf", terms=tuple(terms))
+
+
+def parse_dmarc(text: str) -> Policy:
+    domains = []
+    for tag, value in DMARC_TAG.findall(text):
+        if tag.lower() not in ("rua", "ruf"):
+            continue
+        for domain in MAILTO.findall(value):
+            domain = domain.rstrip(".")
+            if domain not in domains:
+                domains.append(domain)
+    return Policy(kind="dmarc", report_domains=tuple(domains))
+
+
+def parse_policy(text: str) -> Optional[Policy]:
+    """
+    Analyse un contenu TXT. Retourne None s'il ne s'agit ni de SPF ni de DMARC.
+    """
+    if SPF_VERSION.match(text):
+        return parse_spf(text)
+    if DMARC_VERSION.match(text):
+        return parse_dmarc(text)
+    return None
@@ -1,3 +1,4 @@
+import dns.exception
 import dns.resolver
 from typing import Generator, Tuple
 from src.models.graph import Node, Edge, NodeType, EdgeType
@@ -48,5 +49,5 @@ class SrvStrategy(Strategy):
                     # On pourrait aussi générer un nœud "Service" comme "_xmpp-server._tcp.example.com"
                     # pointant vers "xmpp.example.com", mais le graphe pourrait devenir encombré.
                     
-            except Exception:
+            except dns.exception.DNSException:
                 continue
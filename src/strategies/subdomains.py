@@ -1,3 +1,4 @@
+import dns.exception
 import dns.resolver
 from typing import Generator, Tuple
 from src.models.graph import Node, Edge, NodeType, EdgeType
@@ -36,5 +37,5 @@ class SubdomainStrategy(Strategy):
                 # On peut Vérifier AAAA aussi ? Généralement A suffit pour prouver l'existence.
                 yield new_node, Edge(source=node, target=new_node, type=EdgeType.SUBDOMAIN)
                 
-            except Exception:
+            except dns.exception.DNSException:
                 continue
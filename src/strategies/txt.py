@@ -1,57 +1,136 @@
+import time
+import dns.exception
 import dns.resolver
-import re
-from typing import Generator, Tuple
+from collections import OrderedDict
+from typing import Callable, Generator, List, Set, Tuple
+from src.engine.resolver import negative_ttl
 from src.models.graph import Node, Edge, NodeType, EdgeType
 from src.strategies.base import Strategy
+from src.strategies.spf import SPF_LOOKUP_LIMIT, Policy, parse_policy
 
 class TxtStrategy(Strategy):
     """
     Récupère et analyse les enregistrements TXT (SPF, DMARC, etc.) pour extraire des IP et domaines cachés.
+    Les include/redirect SPF sont suivis dans la limite des 10 requêtes de la RFC 7208.
+    La politique DMARC est lue sous _dmarc.<domaine> (RFC 7489) pour ses domaines de rapport.
     """
-    
-    # Regex pour les motifs courants
-    REGEX_IPV4 = r"ip4:(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"
-    REGEX_IPV6 = r"ip6:([a-fA-F0-9:]+)"
-    REGEX_INCLUDE = r"include:([a-zA-Z0-9._-]+)"
-    REGEX_REDIRECT = r"redirect=([a-zA-Z0-9._-]+)"
-    # Une regex de domaine simple et large pourrait correspondre à trop de déchets dans les chaînes base64, 
-    # donc nous nous concentrons sur des préfixes structurels comme les mécanismes include/redirect/ptr/mx dans SPF.
-    
-    def __init__(self):
+
+    # Nombre de domaines dont les politiques analysées sont conservées
+    CACHE_SIZE = 4096
+    # Durée de cache si la réponse ne porte pas de TTL (positif, puis négatif sans SOA)
+    DEFAULT_TTL = 300
+    NEGATIVE_TTL = 60
+
+    def __init__(self, lookup_limit: int = SPF_LOOKUP_LIMIT, clock: Callable[[], float] = time.monotonic):
         self.resolver = dns.resolver.Resolver()
         self.resolver.lifetime = 2.0
+        self.lookup_limit = lookup_limit
+        self.clock = clock
+        # domaine -> (échéance, politiques)
+        self._policies: "OrderedDict[str, Tuple[float, Tuple[Policy, ...]]]" = OrderedDict()
 
     def execute(self, node: Node) -> Generator[Tuple[Node, Edge], None, None]:
         if node.type != NodeType.DOMAIN:
             return
 
+        # Compteur partagé par toute la chaîne d'include d'une évaluation
+        lookups = [0]
+        yield from self._expand(node, lookups, {node.value})
+        yield from self._dmarc(node)
+
+    def _dmarc(self, node: Node) -> Generator[Tuple[Node, Edge], None, None]:
+        if node.value.startswith("_dmarc."):
+            return
+        for policy in self.get_policies(f"_dmarc.{node.value}"):
+            if policy.kind != "dmarc":
+                continue
+            for domain in policy.report_domains:
+                new_node = Node(value=domain, type=NodeType.DOMAIN)
+                yield new_node, Edge(source=node, target=new_node, type=EdgeType.TXT)
+
+    def _expand(self, node: Node, lookups: List[int], seen: Set[str]) -> Generator[Tuple[Node, Edge], None, None]:
+        for policy in self.get_policies(node.value):
+            for domain in policy.report_domains:
+                new_node = Node(value=domain, type=NodeType.DOMAIN)
+                yield new_node, Edge(source=node, target=new_node, type=EdgeType.TXT)
+
+            for term in policy.terms:
+                network = term.network()
+                if network is not None:
+                    new_node = self._network_node(network)
+                    yield new_node, Edge(source=node, target=new_node, type=EdgeType.TXT)
+                    continue
+
+                if not term.needs_lookup:
+                    continue
+                lookups[0] += 1
+
+                domain = term.domain
+                if not domain:
+                    continue
+                new_node = Node(value=domain, type=NodeType.DOMAIN)
+                yield new_node, Edge(source=node, target=new_node, type=EdgeType.TXT)
+
+                # Seuls include et redirect portent une politique à évaluer
+                if term.name not in ("include", "redirect") or domain in seen:
+                    continue
+                if lookups[0] > self.lookup_limit:
+                    continue
+                seen.add(domain)
+                yield from self._expand(new_node, lookups, seen)
+
+    def get_policies(self, domain: str) -> Tuple[Policy, ...]:
+        """
+        Politiques SPF/DMARC publiées par un domaine, mises en cache pendant le TTL de la réponse.
+        Seules les réponses faisant autorité (TXT, NXDOMAIN, NODATA) sont cachées : un échec
+        transitoire (timeout, SERVFAIL) rend () sans masquer la politique aux requêtes suivantes.
+        """
+        now = self.clock()
+        cached = self._policies.get(domain)
+        if cached is not None:
+            expires, policies = cached
+            if expires > now:
+                self._policies.move_to_end(domain)
+                return policies
+            del self._policies[domain]
+
+        policies = []
         try:
-            answers = self.resolver.resolve(node.value, "TXT")
+            answers = self.resolver.resolve(domain, "TXT")
             for rdata in answers:
-                txt_content = str(rdata).strip('"')
-                
-                # Scan pour IPv4
-                for ip in re.findall(self.REGEX_IPV4, txt_content):
-                    new_node = Node(value=ip, type=NodeType.IP_V4)
-                    edge = Edge(source=node, target=new_node, type=EdgeType.TXT)
-                    yield new_node, edge
-                    
-                # Scan pour IPv6
-                for ip in re.findall(self.REGEX_IPV6, txt_content):
-                    new_node = Node(value=ip, type=NodeType.IP_V6)
-                    edge = Edge(source=node, target=new_node, type=EdgeType.TXT)
-                    yield new_node, edge
-
-                # Scan pour Domaines (include/redirect)
-                for domain in re.findall(self.REGEX_INCLUDE, txt_content):
-                    new_node = Node(value=domain, type=NodeType.DOMAIN)
-                    edge = Edge(source=node, target=new_node, type=EdgeType.TXT)
-                    yield new_node, edge
-
-                for domain in re.findall(self.REGEX_REDIRECT, txt_content):
-                    new_node = Node(value=domain, type=NodeType.DOMAIN)
-                    edge = Edge(source=node, target=new_node, type=EdgeType.TXT)
-                    yield new_node, edge
-
-        except Exception:
-            pass
+                policy = parse_policy(self._txt_content(rdata))
+                if policy is not None:
+                    policies.append(policy)
+            ttl = self._answer_ttl(answers)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+            ttl = negative_ttl(e)
+            if ttl is None:
+                ttl = self.NEGATIVE_TTL
+        except dns.exception.DNSException:
+            return ()
+
+        result = tuple(policies)
+        self._policies[domain] = (now + ttl, result)
+        if len(self._policies) > self.CACHE_SIZE:
+            self._policies.popitem(last=False)
+        return result
+
+    def _answer_ttl(self, answers) -> int:
+        ttl = getattr(getattr(answers, "rrset", None), "ttl", None)
+        return ttl if isinstance(ttl, int) else self.DEFAULT_TTL
+
+    def _txt_content(self, rdata) -> str:
+        # Un TXT peut être découpé en plusieurs chaînes de 255 octets à concaténer
+        strings = getattr(rdata, "strings", None)
+        if isinstance(strings, (tuple, list)):
+            return b"".join(strings).decode("utf-8", errors="replace")
+        return str(rdata).strip('"')
+
+    def _network_node(self, network) -> Node:
+        if network.version == 4:
+            if network.prefixlen == network.max_prefixlen:
+                return Node(value=str(network.network_address), type=NodeType.IP_V4)
+            return Node(value=str(network), type=NodeType.PREFIX_V4)
+        if network.prefixlen == network.max_prefixlen:
+            return Node(value=str(network.network_address), type=NodeType.IP_V6)
+        return Node(value=str(network), type=NodeType.PREFIX_V6)
@@ -0,0 +1,203 @@
+"""
+Tableau de bord Rich d'un scan en cours, alimenté par les événements du moteur.
+
+Les listeners ne font que mettre à jour des compteurs (sous verrou : certaines stratégies
+interrogent depuis un pool de threads) ; le rendu est fait par le thread de rafraîchissement
+de rich.live, à fréquence fixe, sans ralentir le scan.
+"""
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.table import Table
+from rich.text import Text
+
+from src.engine.events import ScanListener
+from src.engine.resolver import TIMEOUT, QueryEvent
+from src.models.graph import Node
+
+
+class ScanDashboard(ScanListener):
+    """
+    Débit (requêtes/s sur une fenêtre glissante), requêtes en cours, frontière par profondeur,
+    taux de hits de cache, timeouts par serveur amont et dernières découvertes.
+    """
+
+    def __init__(self, engine, window: float = 5.0, recent: int = 10, clock: Callable[[], float] = time.monotonic):
+        self.engine = engine
+        self.window = window
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._recent_size = recent
+        self.reset()
+
+    def reset(self):
+        self.started = self.clock()
+        self.queries = 0
+        self.cache_hits = 0
+        self.in_flight = 0
+        self.nodes = 0
+        self.timeouts: Counter = Counter()
+        self.outcomes: Counter = Counter()
+        # (seconde, requêtes terminées dans cette seconde), pour le débit glissant
+        self._per_second: Deque[List] = deque()
+        self.recent: Deque[Tuple[float, Node]] = deque(maxlen=self._recent_size)
+        self.current: Optional[Tuple[Node, int]] = None
+
+    # --- Événements du moteur ---
+
+    def on_scan_start(self, root: Node):
+        with self._lock:
+            self.reset()
+
+    def on_node(self, node: Node):
+        with self._lock:
+            self.nodes += 1
+            self.recent.append((self.clock(), node))
+
+    def on_expand_start(self, node: Node, depth: int):
+        self.current = (node, depth)
+
+    def on_expand_end(self, node: Node):
+        self.current = None
+
+    def on_query_start(self, strategy: str, qname: str, rdtype: str):
+        with self._lock:
+            self.in_flight += 1
+
+    def on_query(self, event: QueryEvent):
+        now = self.clock()
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.queries += 1
+            self.outcomes[event.outcome] += 1
+            if event.cached:
+                self.cache_hits += 1
+            if event.outcome == TIMEOUT:
+                self.timeouts[event.server or "?"] += 1
+            second = int(now)
+            buckets = self._per_second
+            if buckets and buckets[-1][0] == second:
+                buckets[-1][1] += 1
+            else:
+                buckets.append([second, 1])
+
+    # --- Lecture ---
+
+    def rate(self) -> float:
+        """Requêtes terminées par seconde sur la fenêtre glissante."""
+        now = self.clock()
+        with self._lock:
+            horizon = now - self.window
+            buckets = self._per_second
+            while buckets and buckets[0][0] + 1 <= horizon:
+                buckets.popleft()
+            total = sum(count for _, count in buckets)
+        span = min(self.window, max(now - self.started, 1e-9))
+        return total / span
+
+    def hit_rate(self) -> Optional[float]:
+        with self._lock:
+            return self.cache_hits / self.queries if self.queries else None
+
+    def snapshot(self) -> dict:
+        frontier = {depth: count for depth, count in sorted(dict(self.engine.frontier).items()) if count > 0}
+        with self._lock:
+            snapshot = {
+                "elapsed": self.clock() - self.started,
+                "queries": self.queries,
+                "in_flight": self.in_flight,
+                "nodes": self.nodes,
+                "cache_hits": self.cache_hits,
+                "timeouts": dict(self.timeouts.most_common()),
+                "outcomes": dict(self.outcomes),
+                "recent": list(self.recent),
+            }
+        snapshot["rate"] = self.rate()
+        snapshot["hit_rate"] = self.hit_rate()
+        snapshot["frontier"] = frontier
+        snapshot["current"] = self.current
+        return snapshot
+
+    def __rich__(self) -> Group:
+        return self.render()
+
+    def render(self) -> Group:
+        snap = self.snapshot()
+        summary = Table.grid(padding=(0, 3))
+        hit_rate = "-" if snap["hit_rate"] is None else f"{snap['hit_rate']:.0%}"
+        summary.add_row(
+            Text.assemble(("Requêtes/s ", "grey50"), (f"{snap['rate']:.1f}", "bold cyan")),
+            Text.assemble(("En cours ", "grey50"), (str(snap["in_flight"]), "bold")),
+            Text.assemble(("Requêtes ", "grey50"), (str(snap["queries"]), "bold")),
+            Text.assemble(("Cache ", "grey50"), (hit_rate, "bold green")),
+            Text.assemble(("Nœuds ", "grey50"), (str(snap["nodes"]), "bold")),
+            Text.assemble(("Durée ", "grey50"), (f"{snap['elapsed']:.1f}s", "bold")),
+        )
+
+        frontier = Table(title="Frontière", title_justify="left", show_edge=False, expand=False)
+        frontier.add_column("Profondeur", justify="right")
+        frontier.add_column("En attente", justify="right")
+        for depth, count in snap["frontier"].items():
+            frontier.add_row(str(depth), str(count))
+
+        timeouts = Table(title="Timeouts par serveur", title_justify="left", show_edge=False, expand=False)
+        timeouts.add_column("Serveur")
+        timeouts.add_column("Timeouts", justify="right")
+        for server, count in list(snap["timeouts"].items())[:5]:
+            timeouts.add_row(server, str(count))
+
+        side = Table.grid(padding=(0, 4))
+        side.add_row(frontier, timeouts)
+
+        recent = Table(title="Dernières découvertes", title_justify="left", show_edge=False, expand=False)
+        recent.add_column("Âge", justify="right", style="grey50")
+        recent.add_column("Type", style="grey50")
+        recent.add_column("Nœud")
+        now = self.clock()
+        for seen, node in reversed(snap["recent"]):
+            recent.add_row(f"{now - seen:.1f}s", node.type.value, node.value)
+
+        parts = [summary, side, recent]
+        if snap["current"] is not None:
+            node, depth = snap["current"]
+            parts.insert(1, Text.assemble(("Expansion ", "grey50"), (node.value, "bold"), (f"  (profondeur {depth})", "grey50")))
+        return Group(*parts)
+
+
+def run_with_dashboard(engine, root: Node, console: Console, refresh_per_second: float = 4.0,
+                       dashboard: Optional[ScanDashboard] = None) -> bool:
+    """
+    Lance engine.scan(root) dans un thread et affiche le tableau de bord jusqu'à la fin du scan.
+    Ctrl-C demande l'arrêt coopératif (engine.cancel) : le graphe partiel est conservé.
+    Retourne True si le scan est allé à son terme.
+    """
+    dashboard = dashboard or ScanDashboard(engine)
+    engine.add_listener(dashboard)
+    errors: List[BaseException] = []
+
+    def target():
+        try:
+            engine.scan(root)
+        except BaseException as e:  # remonté dans le thread principal
+            errors.append(e)
+
+    worker = threading.Thread(target=target, name="scan", daemon=True)
+    try:
+        with Live(dashboard, console=console, refresh_per_second=refresh_per_second, transient=False):
+            worker.start()
+            try:
+                while worker.is_alive():
+                    worker.join(0.1)
+            except KeyboardInterrupt:
+                engine.cancel()
+                console.print("[yellow]Arrêt demandé, fin de l'expansion en cours...[/yellow]")
+                worker.join()
+    finally:
+        engine.remove_listener(dashboard)
+    if errors:
+        raise errors[0]
+    return not engine.cancelled
@@ -1,5 +1,5 @@
 import time
-from typing import Dict, List, Set, Tuple
+from typing import Optional
 
 from rich.console import Console
 from rich.panel import Panel
@@ -10,93 +10,106 @@ from rich.tree import Tree
 
 from src.engine.core import ScannerEngine
 from src.models.graph import Node, NodeType
+from src.tui.dashboard import run_with_dashboard
+from src.tui.tree import (MAX_CHILDREN, MAX_DEPTH, MAX_LINES, AdjacencyIndex, more_label, print_lines, tree_lines,
+                          truncated_label, walk)
+
+# Styles construits une fois : l'arbre en demande un par ligne
+NODE_STYLES = {
+    NodeType.DOMAIN: Style(color="bright_blue", bold=True),
+    NodeType.IP_V4: Style(color="yellow", bold=True),
+    NodeType.IP_V6: Style(color="red", bold=True),
+    NodeType.PREFIX_V4: Style(color="yellow"),
+    NodeType.PREFIX_V6: Style(color="yellow"),
+    NodeType.TLD: Style(color="magenta"),
+    NodeType.SERVICE: Style(color="green"),
+    NodeType.TXT: Style(color="white", dim=True),
+}
+EDGE_STYLES = {
+    "A": Style(color="cyan"),
+    "AAAA": Style(color="cyan"),
+    "CNAME": Style(color="bright_blue"),
+    "NS": Style(color="blue"),
+    "MX": Style(color="bright_magenta"),
+    "PTR": Style(color="bright_green"),
+    "TXT": Style(color="bright_yellow"),
+    "SRV": Style(color="green"),
+    "PARENT": Style(color="magenta"),
+    "NEIGHBOR": Style(color="grey70"),
+    "SUBDOMAIN": Style(color="grey70"),
+}
+DEFAULT_STYLE = Style(color="white")
 
 class RichDNSApp:
     def __init__(self):
         self.console = Console()
         self.engine = ScannerEngine(max_depth=3)
+        # Adjacence triée tenue à jour pendant le scan, pour l'arbre des résultats
+        self.adjacency = AdjacencyIndex()
+        self.engine.add_listener(self.adjacency)
         self.register_strategies()
 
     def register_strategies(self):
-        from src.strategies.dns import BasicDNSStrategy
-        from src.strategies.txt import TxtStrategy
-        from src.strategies.ptr import PtrStrategy
-        from src.strategies.parents import ParentStrategy
-        self.engine.register_strategy(BasicDNSStrategy())
-        self.engine.register_strategy(TxtStrategy())
-        self.engine.register_strategy(PtrStrategy())
-        self.engine.register_strategy(ParentStrategy())
+        from src.strategies.registry import DEFAULT_STRATEGIES, load_strategy
+        for name in DEFAULT_STRATEGIES:
+            self.engine.register_strategy(load_strategy(name))
 
     def generate_dot(self, filename="scan.dot"):
+        return self.export(filename, "dot")
+
+    def export(self, filename: str, fmt: str = "dot") -> bool:
+        """
+        Écrit le graphe en flux dans filename (dot, jsonl ou graphml), sans copie des nœuds/arêtes.
+        """
+        from src.export.base import open_exporter
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write("digraph G {\n")
-                f.write("  rankdir=LR;\n")
-                f.write("  node [style=filled, fontname=\"Helvetica\"];\n")
-                
-                nodes = list(self.engine.nodes)
-                edges = list(self.engine.edges)
-                
-                for node in nodes:
-                    color = "lightblue"
-                    if node.type == NodeType.IP_V4: color = "gold"
-                    elif node.type == NodeType.IP_V6: color = "orange"
-                    elif node.type == NodeType.TLD: color = "lightgrey"
-                    elif node.type == NodeType.SERVICE: color = "pink"
-                    
-                    safe_id = str(hash(node))
-                    label = node.value.replace('"', '\\"')
-                    f.write(f'  "{safe_id}" [label="{label}", fillcolor="{color}", shape=box];\n')
-                
-                for edge in edges:
-                    safe_src = str(hash(edge.source))
-                    safe_tgt = str(hash(edge.target))
-                    f.write(f'  "{safe_src}" -> "{safe_tgt}" [label="{edge.type.value}"];\n')
-                
-                f.write("}\n")
+            with open_exporter(fmt, filename) as exporter:
+                exporter.export(self.engine.nodes, self.engine.edges)
             return True
         except Exception as e:
-            self.console.print(f"[red]Error generating DOT:[/red] {e}")
+            self.console.print(f"[red]Error generating {fmt.upper()}:[/red] {e}")
             return False
 
-    def build_rich_tree(self, root_node: Node) -> Tree:
+    def build_rich_tree(self, root_node: Node, max_children: Optional[int] = MAX_CHILDREN,
+                        max_depth: Optional[int] = MAX_DEPTH, max_lines: Optional[int] = MAX_LINES) -> Tree:
+        """
+        Arbre Rich des résultats, construit itérativement (voir src.tui.tree.walk).
+        """
         root_label = self._node_label(root_node, is_root=True)
         tree = Tree(root_label, guide_style="grey50")
 
-        adj = self._build_adjacency()
-        visited = set([root_node])
-        self._add_children(root_node, tree, adj, visited)
+        # Nœud de l'arbre de chaque niveau en cours
+        parents = [tree]
+        for level, item, _, repeated in walk(self._adjacency(), root_node, max_children, max_depth, max_lines):
+            del parents[level:]
+            if item is None:
+                label = truncated_label(max_lines)
+            elif isinstance(item, int):
+                label = more_label(item)
+            else:
+                label = self._edge_label(item, item.target)
+                if repeated:
+                    label.stylize("dim")
+            parents.append(parents[level - 1].add(label))
         return tree
 
-    def _build_adjacency(self) -> Dict[Node, List]:
-        adj: Dict[Node, List] = {}
-        for edge in self.engine.edges:
-            adj.setdefault(edge.source, []).append(edge)
-        for edges in adj.values():
-            edges.sort(key=lambda edge: (self._node_sort_key(edge.target), edge.type.value))
-        return adj
-
-    def _node_sort_key(self, node: Node) -> Tuple[int, str]:
-        type_rank = {
-            NodeType.DOMAIN: 0,
-            NodeType.TLD: 1,
-            NodeType.SERVICE: 2,
-            NodeType.IP_V4: 3,
-            NodeType.IP_V6: 4,
-        }
-        return type_rank.get(node.type, 99), node.value
-
-    def _add_children(self, node: Node, tree_node: Tree, adj: Dict, visited: Set[Node]):
-        for edge in adj.get(node, []):
-            target = edge.target
-            label = self._edge_label(edge, target)
-            if target in visited:
-                label.stylize("dim")
-                tree_node.add(label)
-                continue
-            visited.add(target)
-            child = tree_node.add(label)
-            self._add_children(target, child, adj, visited)
+    def print_tree(self, root_node: Node, console: Console = None, max_children: Optional[int] = MAX_CHILDREN,
+                   max_depth: Optional[int] = MAX_DEPTH, max_lines: Optional[int] = MAX_LINES):
+        """
+        Affiche l'arbre en flux, sans le construire : temps et mémoire bornés par les limites d'affichage.
+        """
+        console = console or self.console
+        lines = tree_lines(self._adjacency(), root_node, self._node_label(root_node, is_root=True),
+                           lambda edge: self._edge_label(edge, edge.target), max_children, max_depth, max_lines)
+        print_lines(console, lines)
+
+    def _adjacency(self) -> AdjacencyIndex:
+        # Arêtes ajoutées sans passer par les listeners (moteur remplacé...) : reconstruire l'index
+        if self.adjacency.edge_count != len(self.engine.edges):
+            self.adjacency.clear()
+            for edge in self.engine.edges:
+                self.adjacency.on_edge(edge)
+        return self.adjacency
 
     def _node_label(self, node: Node, is_root: bool = False) -> Text:
         label = Text()
@@ -116,35 +129,10 @@ class RichDNSApp:
         return label
 
     def _node_style(self, node: Node) -> Style:
-        if node.type == NodeType.DOMAIN:
-            return Style(color="bright_blue", bold=True)
-        if node.type == NodeType.IP_V4:
-            return Style(color="yellow", bold=True)
-        if node.type == NodeType.IP_V6:
-            return Style(color="red", bold=True)
-        if node.type == NodeType.TLD:
-            return Style(color="magenta")
-        if node.type == NodeType.SERVICE:
-            return Style(color="green")
-        if node.type == NodeType.TXT:
-            return Style(color="white", dim=True)
-        return Style(color="white")
+        return NODE_STYLES.get(node.type, DEFAULT_STYLE)
 
     def _edge_style(self, edge_type: str) -> Style:
-        palette = {
-            "A": Style(color="cyan"),
-            "AAAA": Style(color="cyan"),
-            "CNAME": Style(color="bright_blue"),
-            "NS": Style(color="blue"),
-            "MX": Style(color="bright_magenta"),
-            "PTR": Style(color="bright_green"),
-            "TXT": Style(color="bright_yellow"),
-            "SRV": Style(color="green"),
-            "PARENT": Style(color="magenta"),
-            "NEIGHBOR": Style(color="grey70"),
-            "SUBDOMAIN": Style(color="grey70"),
-        }
-        return palette.get(edge_type, Style(color="white"))
+        return EDGE_STYLES.get(edge_type, DEFAULT_STYLE)
 
     def run(self, domain: str = None, depth: int = 3):
         self.console.clear()
@@ -168,20 +156,21 @@ class RichDNSApp:
         self.engine.max_depth = depth
         root = Node(value=domain, type=NodeType.DOMAIN)
         
-        # Scan Synchrone
-        with self.console.status("Scanning...", spinner="dots"):
-             self.engine.scan(root)
-             
+        # Scan dans un thread, tableau de bord en direct ; Ctrl-C arrête en gardant le graphe partiel
+        completed = run_with_dashboard(self.engine, root, self.console)
+
         duration = time.time() - start_time
         stats = self.engine.get_stats()
-        
-        self.console.print(f"[bold green]Scan termine en {duration:.2f}s[/bold green]")
+
+        if completed:
+            self.console.print(f"[bold green]Scan termine en {duration:.2f}s[/bold green]")
+        else:
+            self.console.print(f"[bold yellow]Scan interrompu apres {duration:.2f}s (resultats partiels)[/bold yellow]")
         self.console.print(f"Nodes: {stats['nodes']} | Edges: {stats['edges']}")
         
         # Affichage de l'Arbre
         self.console.print("\n[bold]Carte des resultats:[/bold]")
-        tree = self.build_rich_tree(root)
-        self.console.print(tree)
+        self.print_tree(root)
 
         # Génération du DOT
         self.console.print("\nGeneration du DOT...")
@@ -0,0 +1,176 @@
+"""
+Arbre des résultats sans récursion : index d'adjacence trié tenu à jour pendant le scan,
+parcours itératif avec pagination des enfants et profondeur maximale, sortie en flux.
+"""
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from rich.console import Console
+from rich.text import Text
+
+from src.engine.events import ScanListener
+from src.models.graph import Edge, Node, NodeType
+
+TYPE_RANK = {
+    NodeType.DOMAIN: 0,
+    NodeType.TLD: 1,
+    NodeType.SERVICE: 2,
+    NodeType.IP_V4: 3,
+    NodeType.IP_V6: 4,
+    NodeType.PREFIX_V4: 5,
+    NodeType.PREFIX_V6: 6,
+}
+
+# Guides de rich.tree.Tree : espace, continuation, branche, dernière branche
+GUIDES = ("    ", "│   ", "├── ", "└── ")
+ASCII_GUIDES = ("    ", "|   ", "+-- ", "`-- ")
+
+# Limites par défaut de l'affichage
+MAX_CHILDREN = 100
+MAX_DEPTH = 64
+MAX_LINES = 10000
+
+_first = itemgetter(0)
+
+
+def sort_key(edge: Edge) -> Tuple[int, str, str]:
+    target = edge.target
+    return TYPE_RANK.get(target.type, 99), target.value, edge.type.value
+
+
+class AdjacencyIndex(ScanListener):
+    """
+    Arêtes sortantes de chaque nœud, triées par (type, valeur, type d'arête) de la cible.
+    Alimenté au fil du scan (on_edge) ; la clé de tri est calculée une fois par arête et
+    chaque liste n'est retriée que si elle a reçu des arêtes depuis la dernière lecture.
+    """
+
+    def __init__(self, edges: Iterable[Edge] = ()):
+        self._children: Dict[Node, List[Tuple[Tuple[int, str, str], Edge]]] = {}
+        self._unsorted: Set[Node] = set()
+        self.edge_count = 0
+        for edge in edges:
+            self.on_edge(edge)
+
+    def on_scan_start(self, root: Node):
+        self.clear()
+
+    def on_edge(self, edge: Edge):
+        children = self._children.get(edge.source)
+        if children is None:
+            children = self._children[edge.source] = []
+        elif edge.source not in self._unsorted and sort_key(edge) < children[-1][0]:
+            self._unsorted.add(edge.source)
+        children.append((sort_key(edge), edge))
+        self.edge_count += 1
+
+    def clear(self):
+        self._children.clear()
+        self._unsorted.clear()
+        self.edge_count = 0
+
+    def children(self, node: Node) -> List[Tuple[Tuple[int, str, str], Edge]]:
+        children = self._children.get(node)
+        if children is None:
+            return []
+        if node in self._unsorted:
+            children.sort(key=_first)
+            self._unsorted.discard(node)
+        return children
+
+
+def walk(index: AdjacencyIndex, root: Node, max_children: Optional[int] = MAX_CHILDREN,
+         max_depth: Optional[int] = MAX_DEPTH,
+         max_lines: Optional[int] = None) -> Iterator[Tuple[int, Union[Edge, int, None], bool, bool]]:
+    """
+    Parcours en profondeur itératif, dans l'ordre de l'arbre affiché : (niveau, arête, dernière ?,
+    déjà vue ?). Un nœud déjà affiché réapparaît sans ses enfants ; au-delà de max_children enfants
+    ou de max_depth niveaux, les enfants restants sont résumés par leur nombre à la place de l'arête.
+    Après max_lines entrées, le parcours s'arrête sur une entrée None.
+    """
+    budget = max_lines if max_lines is not None else -1
+    visited = {root}
+    root_children = index.children(root)
+    # Pile de [arêtes enfants, position suivante, nombre affiché, niveau]
+    stack = [[root_children, 0, _shown(root_children, max_children), 1]]
+    while stack:
+        frame = stack[-1]
+        children, position, shown, level = frame
+        if position >= shown:
+            stack.pop()
+            if len(children) > shown:
+                yield level, len(children) - shown, True, False
+            continue
+        if budget == 0:
+            yield 1, None, True, False
+            return
+        budget -= 1
+        frame[1] = position + 1
+        edge = children[position][1]
+        target = edge.target
+        repeated = target in visited
+        yield level, edge, position == len(children) - 1, repeated
+        if repeated:
+            continue
+        visited.add(target)
+        grandchildren = index.children(target)
+        if not grandchildren:
+            continue
+        if max_depth is not None and level >= max_depth:
+            yield level + 1, len(grandchildren), True, False
+            continue
+        stack.append([grandchildren, 0, _shown(grandchildren, max_children), level + 1])
+
+
+def tree_lines(index: AdjacencyIndex, root: Node, root_label: Text, edge_label: Callable[[Edge], Text],
+               max_children: Optional[int] = MAX_CHILDREN, max_depth: Optional[int] = MAX_DEPTH,
+               max_lines: Optional[int] = MAX_LINES, guides: Tuple[str, str, str, str] = GUIDES, guide_style: str = "grey50") -> Iterator[Text]:
+    """
+    Lignes de l'arbre, avec les guides de rich.tree.Tree, sans construire l'arbre.
+    """
+    yield root_label
+    # Guides de continuation des ancêtres, un par niveau
+    prefixes = [""]
+    for level, item, last, repeated in walk(index, root, max_children, max_depth, max_lines):
+        del prefixes[level:]
+        prefix = prefixes[level - 1]
+        if item is None:
+            label = truncated_label(max_lines)
+        elif isinstance(item, int):
+            label = more_label(item)
+        else:
+            label = edge_label(item)
+            if repeated:
+                label.stylize("dim")
+        line = Text(prefix + guides[3 if last else 2], style=guide_style, end="")
+        line.append_text(label)
+        yield line
+        prefixes.append(prefix + guides[0 if last else 1])
+
+
+def more_label(hidden: int) -> Text:
+    return Text(f"… +{hidden} more", style="dim")
+
+
+def truncated_label(max_lines: int) -> Text:
+    return Text(f"… truncated after {max_lines} lines", style="dim")
+
+
+def _shown(children: List, max_children: Optional[int]) -> int:
+    if max_children is None:
+        return len(children)
+    return min(len(children), max_children)
+
+
+def print_lines(console: Console, lines: Iterable[Text], chunk: int = 500):
+    """
+    Écrit les lignes par paquets : mémoire bornée par la taille d'un paquet, pas par l'arbre.
+    """
+    batch: List[Text] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= chunk:
+            console.print(Text("\n").join(batch), no_wrap=True, overflow="ellipsis", soft_wrap=False)
+            batch = []
+    if batch:
+        console.print(Text("\n").join(batch), no_wrap=True, overflow="ellipsis", soft_wrap=False)
@@ -0,0 +1,256 @@
+import ipaddress
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from src.models.graph import NodeType
+from src.models.psl import registered_domain
+
+# Grouping modes
+BY_DOMAIN = "domain"  # names by registered domain
+BY_PREFIX = "prefix"  # addresses by /24 (IPv4) or /48 (IPv6)
+BY_TYPE = "type"      # every node by NodeType
+AUTO = "auto"         # names by registered domain, addresses by prefix, the rest by NodeType
+MODES = (AUTO, BY_DOMAIN, BY_PREFIX, BY_TYPE)
+
+NAME_TYPES = frozenset((NodeType.DOMAIN, NodeType.SERVICE, NodeType.TLD))
+ADDRESS_TYPES = frozenset((NodeType.IP_V4, NodeType.IP_V6, NodeType.PREFIX_V4, NodeType.PREFIX_V6))
+
+ClusterKey = Tuple[str, str]
+
+
+def cluster_key(node, mode: str = AUTO) -> ClusterKey:
+    """(kind, label) of the cluster a node belongs to."""
+    ntype = getattr(node, "type", None)
+    value = getattr(node, "value", str(node))
+    if mode in (AUTO, BY_DOMAIN) and ntype in NAME_TYPES:
+        # Service names (_sip._tcp.example.com) and bare suffixes fall back to the name itself
+        return "domain", registered_domain(value) or value
+    if mode in (AUTO, BY_PREFIX) and ntype in ADDRESS_TYPES:
+        return "prefix", _prefix(value, ntype)
+    return "type", ntype.value if ntype is not None else type(node).__name__
+
+
+def _prefix(value: str, ntype: NodeType) -> str:
+    if ntype == NodeType.IP_V4:
+        # Canonical dotted quad: no need for ipaddress
+        return value.rsplit(".", 1)[0] + ".0/24"
+    length = 24 if ntype == NodeType.PREFIX_V4 else 48
+    try:
+        network = ipaddress.ip_network(value, strict=False)
+    except ValueError:
+        return value
+    if network.prefixlen > length:
+        network = network.supernet(new_prefix=length)
+    return str(network)
+
+
+class ClusterNode:
+    """Stand-in for the members of a collapsed cluster; hashable by its key."""
+    __slots__ = ("key", "type", "count", "_hash")
+
+    def __init__(self, key: ClusterKey, ntype):
+        self.key = key
+        self.type = ntype
+        self.count = 0
+        self._hash = hash(("cluster",) + key)
+
+    @property
+    def value(self) -> str:
+        return f"{self.key[1]} [{self.count}]"
+
+    def __eq__(self, other):
+        return isinstance(other, ClusterNode) and other.key == self.key
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"CLUSTER:{self.key[0]}:{self.key[1]}"
+
+
+class ClusterIndex:
+    """Cluster membership and cluster-level edge counts, updated as edges arrive.
+
+    Nodes and clusters are interned as ints (hashing a Node is the bulk of the cost on big
+    scans). view() is the graph to display: collapsed clusters appear as a single ClusterNode,
+    expanded ones as their members. Building it costs O(clusters + links + expanded members),
+    independent of the total number of nodes.
+    """
+
+    def __init__(self, mode: str = AUTO):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cluster mode: {mode}")
+        self.mode = mode
+        self._ids: Dict[Hashable, int] = {}
+        self._nodes: List[Hashable] = []
+        self._node_cluster: List[int] = []
+        self._out: List[List[int]] = []
+        self._in: List[List[int]] = []
+        self._edges: Set[int] = set()
+        self._cluster_ids: Dict[ClusterKey, int] = {}
+        self._clusters: List[ClusterNode] = []
+        self._members: List[List[int]] = []
+        # Edge counts between distinct clusters, keyed by (source cluster id, target cluster id)
+        self._links: Dict[Tuple[int, int], int] = defaultdict(int)
+        self.expanded: Set[ClusterKey] = set()
+
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph, mode: str = AUTO) -> "ClusterIndex":
+        index = cls(mode)
+        index.add_nodes(graph.nodes)
+        index.add_edges(graph.edges)
+        return index
+
+    def __len__(self):
+        return len(self._clusters)
+
+    def __contains__(self, node):
+        return node in self._ids
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def clusters(self) -> Dict[ClusterKey, ClusterNode]:
+        return {cluster.key: cluster for cluster in self._clusters}
+
+    def members(self, target) -> List[Hashable]:
+        key = self._resolve(target)
+        if key is None:
+            return []
+        nodes = self._nodes
+        return [nodes[member] for member in self._members[self._cluster_ids[key]]]
+
+    def links(self) -> Dict[Tuple[ClusterKey, ClusterKey], int]:
+        clusters = self._clusters
+        return {(clusters[source].key, clusters[target].key): count for (source, target), count in self._links.items()}
+
+    def key_of(self, node) -> ClusterKey:
+        return self._clusters[self._node_cluster[self._ids[node]]].key
+
+    def representative(self, node):
+        """The node as displayed: itself if its cluster is expanded, else its ClusterNode."""
+        cluster = self._clusters[self._node_cluster[self._ids[node]]]
+        return node if cluster.key in self.expanded else cluster
+
+    # --- Updates ---
+
+    def add_nodes(self, nodes: Iterable[Hashable]) -> Set[ClusterNode]:
+        changed = set()
+        for node in nodes:
+            if node not in self._ids:
+                changed.add(self._clusters[self._node_cluster[self._add_node(node)]])
+        return changed
+
+    def add_edges(self, edges: Iterable[Tuple[Hashable, Hashable]]) -> Tuple[List[Tuple[Hashable, Hashable]], Set[ClusterNode]]:
+        """Index new edges; returns the displayed edges they map to and the clusters that grew."""
+        displayed = []
+        changed = set()
+        ids = self._ids
+        node_cluster = self._node_cluster
+        clusters = self._clusters
+        expanded = self.expanded
+        for source, target in edges:
+            source_id = ids.get(source)
+            if source_id is None:
+                source_id = self._add_node(source)
+                changed.add(clusters[node_cluster[source_id]])
+            target_id = ids.get(target)
+            if target_id is None:
+                target_id = self._add_node(target)
+                changed.add(clusters[node_cluster[target_id]])
+            code = (source_id << 32) | target_id
+            if code in self._edges:
+                continue
+            self._edges.add(code)
+            self._out[source_id].append(target_id)
+            self._in[target_id].append(source_id)
+
+            source_cluster = node_cluster[source_id]
+            target_cluster = node_cluster[target_id]
+            if source_cluster != target_cluster:
+                self._links[(source_cluster, target_cluster)] += 1
+            source_open = clusters[source_cluster].key in expanded
+            target_open = clusters[target_cluster].key in expanded
+            if source_open or target_open or source_cluster != target_cluster:
+                displayed.append((source if source_open else clusters[source_cluster],
+                                  target if target_open else clusters[target_cluster]))
+        return displayed, changed
+
+    def _add_node(self, node) -> int:
+        node_id = self._ids[node] = len(self._nodes)
+        self._nodes.append(node)
+        self._out.append([])
+        self._in.append([])
+        key = cluster_key(node, self.mode)
+        cluster_id = self._cluster_ids.get(key)
+        if cluster_id is None:
+            cluster_id = self._cluster_ids[key] = len(self._clusters)
+            self._clusters.append(ClusterNode(key, getattr(node, "type", None)))
+            self._members.append([])
+        self._node_cluster.append(cluster_id)
+        self._members[cluster_id].append(node_id)
+        self._clusters[cluster_id].count += 1
+        return node_id
+
+    # --- Level of detail ---
+
+    def expand(self, target) -> bool:
+        """Expand a cluster given its key, its ClusterNode or one of its members."""
+        key = self._resolve(target)
+        if key is None or key in self.expanded:
+            return False
+        self.expanded.add(key)
+        return True
+
+    def collapse(self, target) -> bool:
+        key = self._resolve(target)
+        if key not in self.expanded:
+            return False
+        self.expanded.discard(key)
+        return True
+
+    def collapse_all(self) -> bool:
+        changed = bool(self.expanded)
+        self.expanded.clear()
+        return changed
+
+    def _resolve(self, target) -> Optional[ClusterKey]:
+        if isinstance(target, ClusterNode):
+            return target.key
+        if isinstance(target, tuple) and target in self._cluster_ids:
+            return target
+        node_id = self._ids.get(target)
+        return None if node_id is None else self._clusters[self._node_cluster[node_id]].key
+
+    def view(self) -> nx.DiGraph:
+        view = nx.DiGraph()
+        clusters = self._clusters
+        nodes = self._nodes
+        expanded_ids = {self._cluster_ids[key] for key in self.expanded}
+
+        def shown(node_id):
+            cluster_id = self._node_cluster[node_id]
+            return nodes[node_id] if cluster_id in expanded_ids else clusters[cluster_id]
+
+        for cluster_id, cluster in enumerate(clusters):
+            if cluster_id in expanded_ids:
+                view.add_nodes_from(nodes[member] for member in self._members[cluster_id])
+            else:
+                view.add_node(cluster)
+        for source, target in self._links:
+            if source not in expanded_ids and target not in expanded_ids:
+                view.add_edge(clusters[source], clusters[target])
+        # Edges touching an expanded cluster are taken from its members
+        for cluster_id in expanded_ids:
+            for member in self._members[cluster_id]:
+                for target in self._out[member]:
+                    view.add_edge(nodes[member], shown(target))
+                for source in self._in[member]:
+                    if self._node_cluster[source] not in expanded_ids:
+                        view.add_edge(clusters[self._node_cluster[source]], nodes[member])
+        view.remove_edges_from(list(nx.selfloop_edges(view)))
+        return view
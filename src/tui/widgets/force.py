@@ -0,0 +1,251 @@
+import math
+import random
+import time
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import networkx as nx
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional: fall back to networkx's spring layout
+    np = None
+
+Position = Tuple[float, float]
+
+
+class ForceLayout:
+    """Fruchterman-Reingold force layout with Barnes-Hut repulsion, vectorized with numpy.
+
+    Repulsion is approximated on a quadtree of uniform grid levels: at each level a cell
+    receives the pull of the centers of mass of the cells that are well separated from it but
+    not from its parent (the Barnes-Hut interaction list), as a first-order expansion evaluated
+    at each of its nodes; nodes of neighbouring leaf cells interact directly. One iteration is
+    O(N log N) instead of O(N^2).
+
+    layout() warm-starts from previous positions: known nodes keep their place, new nodes start
+    next to an already placed neighbour and the temperature starts low, so that an update of a
+    big graph only moves what changed. refine() yields intermediate positions for progressive
+    display.
+    """
+
+    def __init__(self, iterations: int = 50, leaf_size: int = 4, max_depth: int = 10,
+                 warm_temperature: float = 0.02, seed: Optional[int] = 42):
+        self.iterations = iterations
+        self.leaf_size = leaf_size
+        self.max_depth = max_depth
+        # Fraction of the layout span a node may move per iteration when warm-starting
+        self.warm_temperature = warm_temperature
+        self.seed = seed
+
+    def layout(self, graph: nx.Graph, initial: Optional[Dict[Hashable, Position]] = None,
+               iterations: Optional[int] = None, time_budget: Optional[float] = None) -> Dict[Hashable, Position]:
+        """Positions of the graph's nodes, rescaled to [-1, 1] around the origin."""
+        positions = {}
+        for positions in self.refine(graph, initial, iterations, time_budget, every=0):
+            pass
+        return positions
+
+    def refine(self, graph: nx.Graph, initial: Optional[Dict[Hashable, Position]] = None,
+               iterations: Optional[int] = None, time_budget: Optional[float] = None,
+               every: int = 10) -> Iterator[Dict[Hashable, Position]]:
+        """Run the layout, yielding the positions every `every` iterations and at the end.
+
+        Stops early once `time_budget` seconds are spent; the last yield is always the final layout.
+        """
+        iterations = self.iterations if iterations is None else iterations
+        nodes = list(graph.nodes)
+        if not nodes:
+            yield {}
+            return
+        if np is None:
+            yield self._spring_layout(graph, initial, iterations)
+            return
+
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = np.array([(index[u], index[v]) for u, v in graph.edges if u != v], dtype=np.int64).reshape(-1, 2)
+        pos, warm = self._initial_positions(graph, nodes, initial)
+
+        n = len(nodes)
+        k = math.sqrt(1.0 / n)
+        span = max(float(np.ptp(pos[:, 0])), float(np.ptp(pos[:, 1])), 1e-9)
+        temperature = span * (self.warm_temperature if warm else 0.1)
+        cooling = temperature / (iterations + 1)
+
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        for step in range(iterations):
+            displacement = self._repulsion(pos, k) + self._attraction(pos, edges, k)
+            length = np.hypot(displacement[:, 0], displacement[:, 1])
+            np.maximum(length, 1e-12, out=length)
+            pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+            temperature -= cooling
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if every and (step + 1) % every == 0 and step + 1 < iterations:
+                yield self._rescale(nodes, pos)
+        yield self._rescale(nodes, pos)
+
+    # --- Forces ---
+
+    def _attraction(self, pos, edges, k: float):
+        force = np.zeros_like(pos)
+        if not len(edges):
+            return force
+        delta = pos[edges[:, 1]] - pos[edges[:, 0]]
+        # |d|^2 / k along the edge
+        pull = delta * (np.hypot(delta[:, 0], delta[:, 1]) / k)[:, None]
+        for axis in (0, 1):
+            force[:, axis] += np.bincount(edges[:, 0], weights=pull[:, axis], minlength=len(pos))
+            force[:, axis] -= np.bincount(edges[:, 1], weights=pull[:, axis], minlength=len(pos))
+        return force
+
+    def _repulsion(self, pos, k: float):
+        """k^2 / d repulsion between all pairs, Barnes-Hut approximated."""
+        n = len(pos)
+        force = np.zeros_like(pos)
+        k2 = k * k
+        origin = pos.min(axis=0)
+        extent = max(float((pos.max(axis=0) - origin).max()), 1e-9)
+        unit = (pos - origin) / extent
+
+        # Deep enough for ~leaf_size nodes per leaf; deeper where nodes cluster (hubs and their
+        # leaves), which would otherwise blow up the number of direct pairs
+        depth = 2
+        while depth < self.max_depth and n > self.leaf_size * 4 ** depth:
+            depth += 1
+        while True:
+            side = 1 << depth
+            cells = np.minimum((unit * side).astype(np.int64), side - 1)
+            counts = np.bincount(cells[:, 0] * side + cells[:, 1], minlength=side * side)
+            if depth >= self.max_depth or int((counts * counts).sum()) <= 2 * self.leaf_size * n:
+                break
+            depth += 1
+        x, y = pos[:, 0], pos[:, 1]
+
+        # Far field: the interaction list of each occupied cell is summed into a first-order
+        # expansion around the cell's center of mass, then evaluated at each of its nodes
+        for level in range(2, depth + 1):
+            shift = depth - level
+            size = 1 << level
+            ix = cells[:, 0] >> shift
+            iy = cells[:, 1] >> shift
+            cell_id = ix * size + iy
+            mass = np.bincount(cell_id, minlength=size * size).astype(float)
+            occupied = np.maximum(mass, 1)
+            com_x = np.bincount(cell_id, weights=x, minlength=size * size) / occupied
+            com_y = np.bincount(cell_id, weights=y, minlength=size * size) / occupied
+
+            targets = np.nonzero(mass)[0]
+            tx, ty = targets // size, targets % size
+            px, py = com_x[targets], com_y[targets]
+            fx, fy = np.zeros(len(targets)), np.zeros(len(targets))
+            jxx, jxy, jyy = np.zeros(len(targets)), np.zeros(len(targets)), np.zeros(len(targets))
+            base_x = (tx >> 1) * 2
+            base_y = (ty >> 1) * 2
+            for dx in range(-2, 4):
+                sx = base_x + dx
+                valid_x = (sx >= 0) & (sx < size)
+                far_x = np.abs(sx - tx) > 1
+                for dy in range(-2, 4):
+                    sy = base_y + dy
+                    valid = valid_x & (sy >= 0) & (sy < size) & (far_x | (np.abs(sy - ty) > 1))
+                    source = np.where(valid, sx * size + sy, 0)
+                    rx = px - com_x[source]
+                    ry = py - com_y[source]
+                    inverse = 1.0 / np.maximum(rx * rx + ry * ry, 1e-12)
+                    scale = k2 * np.where(valid, mass[source], 0.0) * inverse
+                    fx += rx * scale
+                    fy += ry * scale
+                    # Jacobian of k^2 m r / |r|^2
+                    curvature = 2.0 * scale * inverse
+                    jxx += scale - curvature * rx * rx
+                    jyy += scale - curvature * ry * ry
+                    jxy -= curvature * rx * ry
+
+            slot = np.searchsorted(targets, cell_id)
+            ox = x - px[slot]
+            oy = y - py[slot]
+            force[:, 0] += fx[slot] + jxx[slot] * ox + jxy[slot] * oy
+            force[:, 1] += fy[slot] + jxy[slot] * ox + jyy[slot] * oy
+
+        # Near field: exact interactions with the nodes of the 3x3 neighbouring leaf cells
+        leaf = cells[:, 0] * side + cells[:, 1]
+        order = np.argsort(leaf, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        for dx in (-1, 0, 1):
+            cx = cells[:, 0] + dx
+            for dy in (-1, 0, 1):
+                cy = cells[:, 1] + dy
+                inside = (cx >= 0) & (cx < side) & (cy >= 0) & (cy < side)
+                sources = np.nonzero(inside)[0]
+                neighbour = cx[sources] * side + cy[sources]
+                per_node = counts[neighbour]
+                total = int(per_node.sum())
+                if not total:
+                    continue
+                i = np.repeat(sources, per_node)
+                offsets = np.arange(total) - np.repeat(np.cumsum(per_node) - per_node, per_node)
+                j = order[np.repeat(starts[neighbour], per_node) + offsets]
+                keep = i != j
+                i, j = i[keep], j[keep]
+                ddx = x[i] - x[j]
+                ddy = y[i] - y[j]
+                scale = k2 / np.maximum(ddx * ddx + ddy * ddy, 1e-12)
+                force[:, 0] += np.bincount(i, weights=ddx * scale, minlength=n)
+                force[:, 1] += np.bincount(i, weights=ddy * scale, minlength=n)
+        return force
+
+    # --- Helpers ---
+
+    def _initial_positions(self, graph: nx.Graph, nodes, initial: Optional[Dict[Hashable, Position]]):
+        rng = random.Random(self.seed)
+        known = {node: initial[node] for node in nodes if initial and node in initial}
+        pos = np.empty((len(nodes), 2))
+        if not known:
+            for i in range(len(nodes)):
+                pos[i] = (rng.random(), rng.random())
+            return pos, False
+
+        # New nodes start next to a placed neighbour (BFS from the known ones)
+        jitter = 0.01
+        placed: Dict[Hashable, Position] = dict(known)
+        frontier = list(known)
+        while frontier:
+            following = []
+            for node in frontier:
+                px, py = placed[node]
+                for neighbour in nx.all_neighbors(graph, node) if graph.is_directed() else graph.neighbors(node):
+                    if neighbour not in placed:
+                        placed[neighbour] = (px + rng.uniform(-jitter, jitter), py + rng.uniform(-jitter, jitter))
+                        following.append(neighbour)
+            frontier = following
+        for i, node in enumerate(nodes):
+            pos[i] = placed.get(node) or (rng.uniform(-1, 1), rng.uniform(-1, 1))
+        return pos, True
+
+    @staticmethod
+    def _rescale(nodes, pos) -> Dict[Hashable, Position]:
+        centered = pos - pos.mean(axis=0)
+        limit = float(np.abs(centered).max())
+        if limit > 0:
+            centered = centered / limit
+        return {node: (float(px), float(py)) for node, (px, py) in zip(nodes, centered)}
+
+    def _spring_layout(self, graph: nx.Graph, initial: Optional[Dict[Hashable, Position]],
+                       iterations: int) -> Dict[Hashable, Position]:
+        initial = {node: position for node, position in (initial or {}).items() if node in graph}
+        return nx.spring_layout(graph, pos=initial or None, iterations=iterations,
+                                center=(0, 0), scale=1, seed=self.seed)
+
+
+def layout_in_background(layout: ForceLayout, graph: nx.Graph, initial: Optional[Dict[Hashable, Position]],
+                         on_update: Callable[[Dict[Hashable, Position]], None], cancelled: Callable[[], bool],
+                         **kwargs):
+    """
+    Thread target: feed each refinement to on_update until done or cancelled.
+    graph must not be shared with the UI thread, and on_update runs on this thread: it should only hand
+    the positions over.
+    """
+    for positions in layout.refine(graph, initial, **kwargs):
+        if cancelled():
+            return
+        on_update(positions)
@@ -10,6 +10,27 @@ from textual.strip import Strip
 from textual.widget import Widget
 
 from src.models.graph import NodeType
+from src.tui.widgets.clusters import ClusterIndex, ClusterNode
+from src.tui.widgets.spatial import SpatialIndex
+
+BLANK = (" ", Style())
+ARROWS = frozenset("<>^v")
+# _merge_line_char tables for "=" and "|"; other characters are kept
+MERGE_HORIZONTAL = {" ": "=", "=": "=", "|": "+", "+": "+"}
+MERGE_VERTICAL = {" ": "|", "|": "|", "=": "+", "+": "+"}
+# Layer of nodes unreachable from the root, always stacked last
+ORPHAN_LAYER = 1 << 30
+
+
+class LayerGeometry:
+    __slots__ = ("cell_width", "label_width", "start_x", "height", "y")
+
+    def __init__(self, cell_width: int, label_width: int, start_x: int, height: int):
+        self.cell_width = cell_width
+        self.label_width = label_width
+        self.start_x = start_x
+        self.height = height
+        self.y = 0
 
 
 class GraphWidget(Widget):
@@ -31,6 +52,7 @@ class GraphWidget(Widget):
         Binding("+", "zoom_in", "Zoom In"),
         Binding("-", "zoom_out", "Zoom Out"),
         Binding("r", "recompute_layout", "Re-Layout"),
+        Binding("c", "collapse_clusters", "Collapse"),
         Binding("left", "pan_left", "Pan Left"),
         Binding("right", "pan_right", "Pan Right"),
         Binding("up", "pan_up", "Pan Up"),
@@ -55,13 +77,36 @@ class GraphWidget(Widget):
         self._layout: Dict[object, Tuple[int, int]] = {}
         self._labels: Dict[object, List[str]] = {}
         self._strips: List[Strip] = []
+        # Draw order is the graph's edge order, then layout order; indexes give ids
+        self._edge_list: List[Tuple[object, object]] = []
+        self._edge_ids: Dict[Tuple[object, object], int] = {}
+        self._node_list: List[object] = []
+        self._node_ids: Dict[object, int] = {}
+        # Layer state kept between layouts for add_nodes/add_edges
+        self._layers: Dict[object, int] = {}
+        # Slot of each node in its layer and next free slot per layer
+        self._slots: Dict[object, int] = {}
+        self._layer_size: Dict[int, int] = {}
+        self._geometry: Dict[int, LayerGeometry] = {}
+        self._layout_width = 0
+        self._top = 0
+        self._gap = 0
+        self._edge_index = SpatialIndex()
+        self._node_index = SpatialIndex()
+        self._rendered_pan: Optional[Tuple[int, int]] = None
         self._layout_dirty = True
         self._render_dirty = True
         self._layer_gap = 3
         self._max_label_width = 64
         self._pan_x = 0
         self._pan_y = 0
+        # Level of detail: with a ClusterIndex, self.graph is its view and root the raw root
+        self.clusters: Optional[ClusterIndex] = None
+        self._source_root = None
+        # Members a zoom-in may reveal at once
+        self.expand_budget = 400
         self._dragging = False
+        self._dragged = False
         self._last_mouse = None
 
     def set_graph(self, graph: nx.DiGraph, root=None):
@@ -73,11 +118,61 @@ class GraphWidget(Widget):
         self.refresh()
 
     def set_root(self, root):
+        if self.clusters is not None:
+            self._source_root = root
+            root = self.clusters.representative(root) if root in self.clusters else None
         self.root = root
         self._layout_dirty = True
         self._render_dirty = True
         self.refresh()
 
+    def set_clusters(self, clusters: Optional[ClusterIndex], root=None):
+        """Display clusters.view() instead of the raw graph; None goes back to the raw graph."""
+        self.clusters = clusters
+        if clusters is None:
+            self.set_graph(nx.DiGraph(), root)
+            return
+        self._source_root = root
+        self._show_clusters()
+
+    def _show_clusters(self):
+        root = self._source_root
+        if root is not None and root in self.clusters:
+            root = self.clusters.representative(root)
+        else:
+            root = None
+        self.root = root
+        self.set_graph(self.clusters.view())
+
+    def add_nodes(self, nodes: Iterable[object]):
+        """Add nodes without a full relayout; existing nodes keep their place."""
+        if self.clusters is not None:
+            nodes = list(nodes)
+            self._relabel(self.clusters.add_nodes(nodes))
+            nodes = [self.clusters.representative(node) for node in nodes]
+        nodes = [node for node in nodes if node not in self.graph]
+        self.graph.add_nodes_from(nodes)
+        self._extend_layout(nodes, [])
+
+    def add_edges(self, edges: Iterable[Tuple[object, object]]):
+        """Add edges (and their missing endpoints) without a full relayout."""
+        if self.clusters is not None:
+            # Raw edges go to the index; only the cluster edges they map to are displayed
+            edges, changed = self.clusters.add_edges(edges)
+            self._relabel(changed)
+            if self.root is None and self._source_root in self.clusters:
+                self.set_root(self._source_root)
+        edges = [edge for edge in edges if not self.graph.has_edge(*edge)]
+        nodes = []
+        seen = set()
+        for source, target in edges:
+            for node in (source, target):
+                if node not in self.graph and node not in seen:
+                    seen.add(node)
+                    nodes.append(node)
+        self.graph.add_edges_from(edges)
+        self._extend_layout(nodes, edges)
+
     def recompute_layout(self):
         self._layout_dirty = True
         self._render_dirty = True
@@ -90,41 +185,80 @@ class GraphWidget(Widget):
 
     def action_zoom_in(self):
         self._layer_gap = min(6, self._layer_gap + 1)
+        if self.clusters is not None:
+            self.expand_visible()
         self._render_dirty = True
         self.refresh()
 
     def action_zoom_out(self):
         self._layer_gap = max(2, self._layer_gap - 1)
+        if self.clusters is not None and self.clusters.collapse_all():
+            self._show_clusters()
         self._render_dirty = True
         self.refresh()
 
+    def action_collapse_clusters(self):
+        if self.clusters is not None and self.clusters.collapse_all():
+            self._show_clusters()
+
+    def expand_visible(self) -> int:
+        """Expand the clusters in the viewport, largest first, within expand_budget members."""
+        if self._layout_dirty:
+            self._build_render_cache()
+        left, top = -self._pan_x, -self._pan_y
+        right, bottom = left + self.size.width - 1, top + self.size.height - 1
+        visible = [self._node_list[index] for index in self._node_index.query(left, top, right, bottom)]
+        budget = self.expand_budget
+        expanded = 0
+        for cluster in sorted((node for node in visible if isinstance(node, ClusterNode)),
+                              key=lambda cluster: -cluster.count):
+            if cluster.count > budget:
+                continue
+            budget -= cluster.count
+            expanded += self.clusters.expand(cluster)
+        if expanded:
+            self._show_clusters()
+        return expanded
+
+    def node_at(self, x: int, y: int):
+        """Node whose marker or label covers the screen cell (x, y)."""
+        if self._layout_dirty:
+            return None
+        x, y = x - self._pan_x, y - self._pan_y
+        hits = sorted(self._node_index.query(x, y, x, y))
+        return self._node_list[hits[-1]] if hits else None
+
+    def on_click(self, event: events.Click) -> None:
+        if self._dragged:
+            return
+        node = self.node_at(event.x, event.y)
+        if self.clusters is not None and isinstance(node, ClusterNode) and self.clusters.expand(node):
+            self._show_clusters()
+
     def action_recompute_layout(self):
         self.recompute_layout()
 
     def action_pan_left(self):
         self._pan_x -= 2
-        self._render_dirty = True
         self.refresh()
 
     def action_pan_right(self):
         self._pan_x += 2
-        self._render_dirty = True
         self.refresh()
 
     def action_pan_up(self):
         self._pan_y -= 1
-        self._render_dirty = True
         self.refresh()
 
     def action_pan_down(self):
         self._pan_y += 1
-        self._render_dirty = True
         self.refresh()
 
     def on_mouse_down(self, event: events.MouseDown) -> None:
         if event.button == 1:
             self.focus()
             self._dragging = True
+            self._dragged = False
             self._last_mouse = event.screen_offset
             self.capture_mouse()
 
@@ -140,13 +274,15 @@ class GraphWidget(Widget):
         dy = event.screen_offset.y - self._last_mouse.y
         self._pan_x += dx
         self._pan_y += dy
+        self._dragged = self._dragged or bool(dx or dy)
         self._last_mouse = event.screen_offset
-        self._render_dirty = True
         self.refresh()
 
     def render_line(self, y: int) -> Strip:
         if self._render_dirty or not self._strips:
             self._build_render_cache()
+        elif (self._pan_x, self._pan_y) != self._rendered_pan:
+            self._shift_render_cache()
         if y < 0 or y >= len(self._strips):
             return Strip([Segment("")])
         return self._strips[y]
@@ -161,22 +297,171 @@ class GraphWidget(Widget):
 
         if self._layout_dirty:
             self._layout, self._labels = self._compute_layout(width, height)
+            self._build_index()
             self._layout_dirty = False
 
-        grid = [[(" ", Style()) for _ in range(width)] for _ in range(height)]
+        grid = self._render_region(0, 0, width, height)
+        self._strips = [self._row_to_strip(row) for row in grid]
+        self._rendered_pan = (self._pan_x, self._pan_y)
+        self._render_dirty = False
 
-        edge_style = Style(color="grey50")
-        arrow_style = Style(color="bright_white", bold=True)
+    def _shift_render_cache(self):
+        """Reuse the cached strips after a pan and draw only the exposed rows and columns."""
+        width = self.size.width
+        height = self.size.height
+        old_x, old_y = self._rendered_pan
+        dx = self._pan_x - old_x
+        dy = self._pan_y - old_y
+        if abs(dx) >= width or abs(dy) >= height or len(self._strips) != height:
+            self._build_render_cache()
+            return
 
-        for source, target in self.graph.edges:
-            if source not in self._layout or target not in self._layout:
+        # Content moves by (dx, dy): new row y shows old row y - dy
+        kept_start = max(0, dy)
+        kept_end = min(height, height + dy)
+        strips: List[Optional[Strip]] = [None] * height
+        for y in range(kept_start, kept_end):
+            strips[y] = self._strips[y - dy]
+
+        if dx:
+            column = 0 if dx > 0 else width + dx
+            band = self._render_region(column, kept_start, abs(dx), kept_end - kept_start)
+            for offset, row in enumerate(band):
+                y = kept_start + offset
+                exposed = self._row_to_strip(row)
+                if dx > 0:
+                    strips[y] = Strip.join([exposed, strips[y].crop(0, width - dx)]).simplify()
+                else:
+                    strips[y] = Strip.join([strips[y].crop(-dx, width), exposed]).simplify()
+
+        if dy:
+            row_start = 0 if dy > 0 else height + dy
+            for offset, row in enumerate(self._render_region(0, row_start, width, abs(dy))):
+                strips[row_start + offset] = self._row_to_strip(row)
+
+        self._strips = strips
+        self._rendered_pan = (self._pan_x, self._pan_y)
+
+    def _build_index(self):
+        """Index edge segments and node boxes (marker and label) in layout coordinates."""
+        layout = self._layout
+        self._edge_index = SpatialIndex()
+        self._node_index = SpatialIndex()
+        self._edge_list = []
+        self._edge_ids = {}
+        self._node_list = []
+        self._node_ids = {}
+
+        for edge in self.graph.edges:
+            self._index_edge(edge)
+        for node in layout:
+            self._index_node(node)
+
+    def _index_node(self, node):
+        index = self._node_ids.get(node)
+        if index is None:
+            index = self._node_ids[node] = len(self._node_list)
+            self._node_list.append(node)
+        x, y = self._layout[node]
+        self._node_index.insert(index, *self._node_rect(node, x, y))
+
+    def _index_edge(self, edge: Tuple[object, object]):
+        source, target = edge
+        if source not in self._layout or target not in self._layout:
+            return
+        index = self._edge_ids.get(edge)
+        if index is None:
+            index = self._edge_ids[edge] = len(self._edge_list)
+            self._edge_list.append(edge)
+        for rect in self._edge_rects(self._layout[source], self._layout[target]):
+            self._edge_index.insert(index, *rect)
+
+    def _node_rect(self, node, x: int, y: int) -> Tuple[int, int, int, int]:
+        lines = self._labels.get(node, [])
+        right = x + 1 + max((len(line) for line in lines), default=0)
+        bottom = y + max(0, len(lines) - 1)
+        return x, y, right, bottom
+
+    def _edge_rects(self, source: Tuple[int, int], target: Tuple[int, int]):
+        (sx, sy), (tx, ty) = source, target
+        # Same L shape as _draw_edge: one horizontal and one vertical segment
+        if abs(tx - sx) >= abs(ty - sy):
+            return (sx, sy, sx, ty), (sx, ty, tx, ty)
+        return (sx, sy, tx, sy), (tx, sy, tx, ty)
+
+    def _update_index(self, moved: List[object], old_positions: Dict[object, Optional[Tuple[int, int]]],
+                      old_rects: Dict[object, Tuple[int, int, int, int]], edges: List[Tuple[object, object]]):
+        """Re-index moved nodes and their edges, then index the new edges."""
+        stale_edges = {}
+        for node in moved:
+            old = old_positions.get(node)
+            index = self._node_ids.get(node)
+            if old is not None and index is not None:
+                rect = old_rects.get(node) or self._node_rect(node, *old)
+                self._node_index.remove(index, *rect)
+            for edge in list(self.graph.in_edges(node)) + list(self.graph.out_edges(node)):
+                if edge in self._edge_ids and edge not in stale_edges:
+                    stale_edges[edge] = None
+        for edge in stale_edges:
+            source, target = edge
+            old_source = old_positions.get(source, self._layout[source])
+            old_target = old_positions.get(target, self._layout[target])
+            if old_source is None or old_target is None:
                 continue
-            sx, sy = self._apply_pan(*self._layout[source])
-            tx, ty = self._apply_pan(*self._layout[target])
-            self._draw_edge(grid, sx, sy, tx, ty, edge_style, arrow_style)
+            index = self._edge_ids[edge]
+            for rect in self._edge_rects(old_source, old_target):
+                self._edge_index.remove(index, *rect)
+            for rect in self._edge_rects(self._layout[source], self._layout[target]):
+                self._edge_index.insert(index, *rect)
+        for node in moved:
+            self._index_node(node)
+        for edge in edges:
+            if edge not in self._edge_ids:
+                self._index_edge(edge)
+
+    def _relabel(self, nodes: Iterable[object]):
+        """Re-wrap the labels of laid out nodes (cluster counts) and re-index their boxes."""
+        if self._layout_dirty:
+            return
+        for node in nodes:
+            index = self._node_ids.get(node)
+            if index is None or node not in self._layout:
+                continue
+            x, y = self._layout[node]
+            self._node_index.remove(index, *self._node_rect(node, x, y))
+            geometry = self._geometry[self._layers[node]]
+            self._labels[node] = self._wrap_label(self._node_label(node), geometry.label_width)
+            self._node_index.insert(index, *self._node_rect(node, x, y))
+            self._render_dirty = True
+
+    def _render_region(self, x0: int, y0: int, width: int, height: int):
+        """Cells of the screen rectangle at (x0, y0), drawing only the primitives that intersect it."""
+        grid = [[BLANK] * width for _ in range(height)]
+        if width <= 0 or height <= 0:
+            return grid
 
-        for node, (x, y) in self._layout.items():
-            x, y = self._apply_pan(x, y)
+        # Query in layout coordinates, draw in region coordinates
+        left = x0 - self._pan_x
+        top = y0 - self._pan_y
+        right = left + width - 1
+        bottom = top + height - 1
+        shift_x = self._pan_x - x0
+        shift_y = self._pan_y - y0
+
+        edge_style = Style(color="grey50")
+        arrow_style = Style(color="bright_white", bold=True)
+
+        layout = self._layout
+        for index in sorted(self._edge_index.query(left, top, right, bottom)):
+            source, target = self._edge_list[index]
+            sx, sy = layout[source]
+            tx, ty = layout[target]
+            self._draw_edge(grid, sx + shift_x, sy + shift_y, tx + shift_x, ty + shift_y, edge_style, arrow_style)
+
+        for index in sorted(self._node_index.query(left, top, right, bottom)):
+            node = self._node_list[index]
+            x, y = layout[node]
+            x, y = x + shift_x, y + shift_y
             style = self._node_style(node)
             marker = "@" if node == self.root else "*"
             self._set_cell(grid, x, y, marker, style, force=True)
@@ -184,18 +469,21 @@ class GraphWidget(Widget):
             if label_lines:
                 self._draw_label_lines(grid, x + 2, y, label_lines, style)
 
-        self._strips = [self._row_to_strip(row) for row in grid]
-        self._render_dirty = False
+        return grid
 
     def _compute_layout(
         self, width: int, height: int
     ) -> Tuple[Dict[object, Tuple[int, int]], Dict[object, List[str]]]:
+        self._layers = {}
+        self._slots = {}
+        self._layer_size = {}
+        self._geometry = {}
+        self._layout_width = width
         nodes = list(self.graph.nodes)
         if not nodes:
             return {}, {}
 
         layers = self._assign_layers(nodes)
-        max_layer = max(layers.values(), default=0)
 
         by_layer: Dict[int, List[object]] = defaultdict(list)
         for node, layer in layers.items():
@@ -204,61 +492,140 @@ class GraphWidget(Widget):
         for layer_nodes in by_layer.values():
             layer_nodes.sort(key=self._node_sort_key)
 
-        layout: Dict[object, Tuple[int, int]] = {}
-        labels: Dict[object, List[str]] = {}
+        self._layers = layers
+        for layer, layer_nodes in by_layer.items():
+            self._layer_size[layer] = len(layer_nodes)
+            for index, node in enumerate(layer_nodes):
+                self._slots[node] = index
 
-        layer_defs: List[Tuple[List[object], Dict[object, List[str]], int, int]] = []
+        labels: Dict[object, List[str]] = {}
         total_label_height = 0
-        layer_count = max_layer + 1
-
-        for layer in range(layer_count):
-            layer_nodes = by_layer.get(layer, [])
-            if not layer_nodes:
-                continue
-
-            count = len(layer_nodes)
-            available_cell = max(4, width // max(1, count))
-
-            raw_labels = {node: self._node_label(node) for node in layer_nodes}
-            max_label_len = max((len(label) for label in raw_labels.values()), default=4)
-            desired_cell = min(self._max_label_width + 2, max_label_len + 2)
-            cell_width = max(4, min(desired_cell, available_cell))
-            label_width = max(1, cell_width - 2)
-
-            wrapped_labels = {
-                node: self._wrap_label(label, label_width) for node, label in raw_labels.items()
-            }
-            layer_height = max((len(lines) for lines in wrapped_labels.values()), default=1)
-
-            layer_defs.append((layer_nodes, wrapped_labels, cell_width, layer_height))
-            total_label_height += layer_height
-
-        if not layer_defs:
-            return {}, {}
+        for layer in sorted(by_layer):
+            geometry = self._layer_geometry(by_layer[layer], width, labels)
+            self._geometry[layer] = geometry
+            total_label_height += geometry.height
 
         gap = 0
-        if len(layer_defs) > 1:
+        if len(self._geometry) > 1:
             extra_space = height - total_label_height
             if extra_space > 0:
-                gap = min(self._layer_gap, max(1, extra_space // (len(layer_defs) - 1)))
+                gap = min(self._layer_gap, max(1, extra_space // (len(self._geometry) - 1)))
 
-        total_height = total_label_height + gap * (len(layer_defs) - 1)
-        top_margin = max(0, (height - total_height) // 2)
+        total_height = total_label_height + gap * (len(self._geometry) - 1)
+        self._top = max(0, (height - total_height) // 2)
+        self._gap = gap
 
-        y = top_margin
-        for layer_nodes, wrapped_labels, cell_width, layer_height in layer_defs:
-            count = len(layer_nodes)
-            total_width = cell_width * count
-            start_x = (width - total_width) // 2
+        self._stack_layers()
+        layout = {node: self._slot_position(node) for node in layers}
+        return layout, labels
 
-            for index, node in enumerate(layer_nodes):
-                x = start_x + index * cell_width
-                layout[node] = (x, y)
-                labels[node] = wrapped_labels[node]
+    def _slot_position(self, node) -> Tuple[int, int]:
+        geometry = self._geometry[self._layers[node]]
+        return geometry.start_x + self._slots[node] * geometry.cell_width, geometry.y
+
+    def _layer_geometry(self, layer_nodes: List[object], width: int, labels: Dict[object, List[str]]) -> LayerGeometry:
+        count = len(layer_nodes)
+        available_cell = max(4, width // max(1, count))
+
+        raw_labels = {node: self._node_label(node) for node in layer_nodes}
+        max_label_len = max((len(label) for label in raw_labels.values()), default=4)
+        desired_cell = min(self._max_label_width + 2, max_label_len + 2)
+        cell_width = max(4, min(desired_cell, available_cell))
+        label_width = max(1, cell_width - 2)
+
+        layer_height = 1
+        for node, label in raw_labels.items():
+            labels[node] = self._wrap_label(label, label_width)
+            layer_height = max(layer_height, len(labels[node]))
+
+        start_x = (width - cell_width * count) // 2
+        return LayerGeometry(cell_width, label_width, start_x, layer_height)
+
+    def _stack_layers(self) -> List[int]:
+        """Assign each layer its y; returns the layers whose y changed."""
+        moved = []
+        y = self._top
+        for layer in sorted(self._geometry):
+            geometry = self._geometry[layer]
+            if geometry.y != y:
+                geometry.y = y
+                moved.append(layer)
+            y += geometry.height + self._gap
+        return moved
+
+    def _extend_layout(self, nodes: List[object], edges: List[Tuple[object, object]]):
+        """Place new nodes and nodes whose layer changed; every other node keeps its position.
+
+        Nodes are appended after the existing slots of their layer (sorted within the batch),
+        vacated slots stay empty and new layers are stacked in order. recompute_layout() restores
+        the compact sorted layout.
+        """
+        if self._layout_dirty or not self._layers:
+            # Nothing laid out yet: the next render does a full layout
+            self._layout_dirty = True
+            self._render_dirty = True
+            self.refresh()
+            return
 
-            y += layer_height + gap
+        layers = self._layers
+        changed: Dict[object, Optional[int]] = {}
+        for node in nodes:
+            changed[node] = None
+            layers[node] = ORPHAN_LAYER
+
+        # Shortest distance from the root can only decrease: relax from the new edges
+        queue = deque()
+        for source, target in edges:
+            layer = layers.get(source, ORPHAN_LAYER)
+            if layer != ORPHAN_LAYER and layer + 1 < layers.get(target, ORPHAN_LAYER):
+                changed.setdefault(target, layers.get(target))
+                layers[target] = layer + 1
+                queue.append(target)
+        while queue:
+            node = queue.popleft()
+            for _, target in self.graph.out_edges(node):
+                if layers[node] + 1 < layers.get(target, ORPHAN_LAYER):
+                    changed.setdefault(target, layers.get(target))
+                    layers[target] = layers[node] + 1
+                    queue.append(target)
 
-        return layout, labels
+        old_positions = {node: self._layout[node] for node in changed if node in self._layout}
+        # Labels of nodes changing layer are re-wrapped: keep their old boxes for the index
+        old_rects = {node: self._node_rect(node, *position) for node, position in old_positions.items()}
+
+        arrivals: Dict[int, List[object]] = defaultdict(list)
+        for node, old in changed.items():
+            if old != layers[node] or old is None:
+                arrivals[layers[node]].append(node)
+
+        for layer, layer_nodes in arrivals.items():
+            layer_nodes.sort(key=self._node_sort_key)
+            geometry = self._geometry.get(layer)
+            if geometry is None:
+                geometry = self._geometry[layer] = self._layer_geometry(layer_nodes, self._layout_width, self._labels)
+            else:
+                for node in layer_nodes:
+                    self._labels[node] = self._wrap_label(self._node_label(node), geometry.label_width)
+                    geometry.height = max(geometry.height, len(self._labels[node]))
+            start = self._layer_size.get(layer, 0)
+            for index, node in enumerate(layer_nodes):
+                self._slots[node] = start + index
+            self._layer_size[layer] = start + len(layer_nodes)
+
+        # A new layer or a taller one pushes the layers below it down
+        moved = [node for layer_nodes in arrivals.values() for node in layer_nodes]
+        shifted = set(self._stack_layers())
+        if shifted:
+            # Every node of a shifted layer follows it, including the ones already there
+            arrived = set(moved)
+            moved.extend(node for node, layer in layers.items() if layer in shifted and node not in arrived)
+        for node in moved:
+            old_positions.setdefault(node, self._layout.get(node))
+            self._layout[node] = self._slot_position(node)
+
+        self._update_index(moved, old_positions, old_rects, edges)
+        self._render_dirty = True
+        self.refresh()
 
     def _assign_layers(self, nodes: Iterable[object]) -> Dict[object, int]:
         graph = self.graph
@@ -279,10 +646,9 @@ class GraphWidget(Widget):
                     queue.append(target)
 
         if len(layers) < len(graph.nodes):
-            remaining = [n for n in graph.nodes if n not in layers]
-            next_layer = max(layers.values(), default=0) + 1
-            for node in remaining:
-                layers[node] = next_layer
+            for node in graph.nodes:
+                if node not in layers:
+                    layers[node] = ORPHAN_LAYER
 
         return layers
 
@@ -366,18 +732,29 @@ class GraphWidget(Widget):
     def _draw_horizontal(self, grid, y: int, x1: int, x2: int, style: Style):
         if y < 0 or y >= len(grid):
             return
-        start = min(x1, x2)
-        end = max(x1, x2)
+        start = max(0, min(x1, x2))
+        end = min(len(grid[0]) - 1, max(x1, x2))
+        # Inlined _merge_line: hub nodes overdraw the same rows with many edges
+        row = grid[y]
+        merge = MERGE_HORIZONTAL
         for x in range(start, end + 1):
-            self._merge_line(grid, x, y, "=", style)
+            existing = row[x][0]
+            if existing in ARROWS:
+                continue
+            row[x] = (merge.get(existing, existing), style)
 
     def _draw_vertical(self, grid, x: int, y1: int, y2: int, style: Style):
         if x < 0 or x >= len(grid[0]):
             return
-        start = min(y1, y2)
-        end = max(y1, y2)
+        start = max(0, min(y1, y2))
+        end = min(len(grid) - 1, max(y1, y2))
+        merge = MERGE_VERTICAL
         for y in range(start, end + 1):
-            self._merge_line(grid, x, y, "|", style)
+            row = grid[y]
+            existing = row[x][0]
+            if existing in ARROWS:
+                continue
+            row[x] = (merge.get(existing, existing), style)
 
     def _draw_label_lines(self, grid, x: int, y: int, lines: List[str], style: Style):
         width = len(grid[0])
@@ -396,7 +773,7 @@ class GraphWidget(Widget):
         if x < 0 or x >= len(grid[0]):
             return
         existing_char, existing_style = grid[y][x]
-        if existing_char in ("<", ">", "^", "v"):
+        if existing_char in ARROWS:
             return
         merged = self._merge_line_char(existing_char, char)
         grid[y][x] = (merged, style)
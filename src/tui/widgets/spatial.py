@@ -0,0 +1,96 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+# (x1, y1, x2, y2, item), bounds inclusive
+Entry = Tuple[int, int, int, int, int]
+
+
+class SpatialIndex:
+    """Multi-level grid of rectangles for viewport queries.
+
+    Each rectangle is stored at the finest level where it covers at most
+    ``max_cells`` buckets, so long edge segments do not flood the fine grid.
+    Each coarser level multiplies the bucket size by ``fanout``.
+    """
+
+    def __init__(self, cell_width: int = 32, cell_height: int = 8, fanout: int = 8, max_cells: int = 4):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.fanout = fanout
+        self.max_cells = max_cells
+        # Buckets are sets so that moving a rectangle (remove + insert) stays O(1)
+        self._levels: List[Dict[Tuple[int, int], Set[Entry]]] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        self._levels = []
+        self._count = 0
+
+    def _level_size(self, level: int) -> Tuple[int, int]:
+        scale = self.fanout ** level
+        return self.cell_width * scale, self.cell_height * scale
+
+    def _placement(self, x1: int, y1: int, x2: int, y2: int):
+        if x2 < x1:
+            x1, x2 = x2, x1
+        if y2 < y1:
+            y1, y2 = y2, y1
+        level = 0
+        while True:
+            width, height = self._level_size(level)
+            bx1, bx2 = x1 // width, x2 // width
+            by1, by2 = y1 // height, y2 // height
+            if (bx2 - bx1 + 1) * (by2 - by1 + 1) <= self.max_cells:
+                return level, (x1, y1, x2, y2), range(bx1, bx2 + 1), range(by1, by2 + 1)
+            level += 1
+
+    def insert(self, item: int, x1: int, y1: int, x2: int, y2: int):
+        level, rect, columns, rows = self._placement(x1, y1, x2, y2)
+        while len(self._levels) <= level:
+            self._levels.append(defaultdict(set))
+        buckets = self._levels[level]
+        entry = rect + (item,)
+        for bx in columns:
+            for by in rows:
+                buckets[(bx, by)].add(entry)
+        self._count += 1
+
+    def remove(self, item: int, x1: int, y1: int, x2: int, y2: int) -> bool:
+        """Remove a rectangle previously inserted with the same bounds."""
+        level, rect, columns, rows = self._placement(x1, y1, x2, y2)
+        if level >= len(self._levels):
+            return False
+        buckets = self._levels[level]
+        entry = rect + (item,)
+        removed = False
+        for bx in columns:
+            for by in rows:
+                bucket = buckets.get((bx, by))
+                if bucket and entry in bucket:
+                    bucket.discard(entry)
+                    removed = True
+                    if not bucket:
+                        del buckets[(bx, by)]
+        if removed:
+            self._count -= 1
+        return removed
+
+    def query(self, x1: int, y1: int, x2: int, y2: int) -> Set[int]:
+        """Items whose rectangles intersect the (inclusive) query rectangle."""
+        found: Set[int] = set()
+        for level, buckets in enumerate(self._levels):
+            if not buckets:
+                continue
+            width, height = self._level_size(level)
+            for bx in range(x1 // width, x2 // width + 1):
+                for by in range(y1 // height, y2 // height + 1):
+                    bucket = buckets.get((bx, by))
+                    if not bucket:
+                        continue
+                    for ex1, ey1, ex2, ey2, item in bucket:
+                        if ex1 <= x2 and ex2 >= x1 and ey1 <= y2 and ey2 >= y1:
+                            found.add(item)
+        return found
@@ -2,15 +2,37 @@ from TermTk import TTkWidget, TTkColor, TTkCanvas
 from TermTk import TTkLog, TTkK, TTkMouseEvent
 import networkx as nx
 import math
+import threading
 from src.models.graph import NodeType
+from src.tui.widgets.clusters import ClusterIndex, ClusterNode
+from src.tui.widgets.force import ForceLayout, layout_in_background
 
 class TTkGraphWidget(TTkWidget):
-    __slots__ = ('_graph', '_pos', '_zoom', '_offset_x', '_offset_y', '_drag_start', '_is_dragging')
+    __slots__ = ('_graph', '_pos', '_zoom', '_offset_x', '_offset_y', '_drag_start', '_is_dragging',
+                 '_force', '_background', '_layout_thread', '_layout_generation',
+                 '_pending_layout', '_pending_lock', '_clusters', '_drag_moved')
 
-    def __init__(self, *args, **kwargs):
+    # Above this many nodes the layout runs in a background thread and is refined on screen
+    BACKGROUND_THRESHOLD = 2000
+    # Zooming in past this level expands the visible clusters, up to EXPAND_BUDGET members
+    EXPAND_ZOOM = 40.0
+    EXPAND_BUDGET = 400
+
+    def __init__(self, *args, force_layout: ForceLayout = None, background: bool = None, **kwargs):
         super().__init__(*args, **kwargs)
         self._graph = nx.Graph()
         self._pos = {}
+        self._force = force_layout or ForceLayout()
+        # None: background computation for big graphs only
+        self._background = background
+        self._layout_thread = None
+        self._layout_generation = 0
+        # (generation, positions) left by the layout thread, applied on the UI thread
+        self._pending_layout = None
+        self._pending_lock = threading.Lock()
+        # Level of detail: with a ClusterIndex, _graph is its view
+        self._clusters = None
+        self._drag_moved = False
         
         # Viewport
         self._zoom = 10.0
@@ -23,21 +45,111 @@ class TTkGraphWidget(TTkWidget):
         self.setFocusPolicy(TTkK.ClickFocus)
 
     def setGraph(self, graph: nx.Graph):
+        # Keep the view when updating an already laid out graph
+        first = not self._pos
         self._graph = graph
         self.recomputeLayout()
-        self.fitToScreen()
+        if first:
+            self.fitToScreen()
         self.update()
 
-    def recomputeLayout(self):
+    def setClusters(self, clusters: ClusterIndex):
+        """Display clusters.view() instead of a raw graph; edges then go through addEdges()."""
+        self._clusters = clusters
+        self.setGraph(clusters.view() if clusters is not None else nx.Graph())
+
+    def addEdges(self, edges):
+        """Add raw edges and warm-start the layout; with clusters, only their cluster edges are shown."""
+        if self._clusters is not None:
+            edges, _ = self._clusters.add_edges(edges)
+        self._graph.add_edges_from(edges)
+        self.setGraph(self._graph)
+
+    def expandVisible(self) -> int:
+        """Expand the clusters on screen, largest first, within EXPAND_BUDGET members."""
+        if self._clusters is None:
+            return 0
+        w, h = self.size()
+        budget = self.EXPAND_BUDGET
+        expanded = 0
+        visible = [node for node, (sx, sy) in self._screenCoords().items()
+                   if isinstance(node, ClusterNode) and 0 <= sx < w and 0 <= sy < h]
+        for cluster in sorted(visible, key=lambda cluster: -cluster.count):
+            if cluster.count <= budget:
+                budget -= cluster.count
+                expanded += self._clusters.expand(cluster)
+        if expanded:
+            self.setGraph(self._clusters.view())
+        return expanded
+
+    def nodeAt(self, x: int, y: int):
+        """Node whose marker or label covers the cell (x, y)."""
+        best = None
+        for node, (sx, sy) in self._screenCoords().items():
+            label = str(node.value) if hasattr(node, 'value') else str(node)
+            if sy == y and sx <= x <= sx + 2 + len(label):
+                if best is None or sx > best[1]:
+                    best = (node, sx)
+        return best[0] if best else None
+
+    def _screenCoords(self):
+        self._takePendingLayout()
+        w, h = self.size()
+        center_x = w // 2 + self._offset_x
+        center_y = h // 2 + self._offset_y
+        scale_x = self._zoom * 2.0
+        scale_y = self._zoom
+        return {node: (int(nx_x * scale_x + center_x), int(nx_y * scale_y + center_y))
+                for node, (nx_x, nx_y) in self._pos.items()}
+
+    def recomputeLayout(self, warm: bool = True, iterations: int = None):
+        """Lay the graph out, warm-starting from the current positions unless warm is False."""
+        self._takePendingLayout()
+        # A newer layout supersedes the one still running in the background
+        self._layout_generation += 1
         if not self._graph.nodes:
             self._pos = {}
             return
-        # Use a normalized scale since we handle zoom in rendering
-        # spring_layout returns positions roughly in [-1, 1] if scale=1
-        try:
-            self._pos = nx.spring_layout(self._graph, center=(0,0), scale=1, k=0.5, seed=42)
-        except Exception:
-             self._pos = nx.spring_layout(self._graph, center=(0,0), scale=1, seed=42)
+        initial = self._pos if warm else None
+        background = self._background
+        if background is None:
+            background = self._graph.number_of_nodes() > self.BACKGROUND_THRESHOLD
+        if not background:
+            self._pos = self._force.layout(self._graph, initial, iterations)
+            return
+
+        generation = self._layout_generation
+        if initial:
+            # Until the first refinement, new nodes are not drawn
+            self._pos = {node: initial[node] for node in self._graph.nodes if node in initial}
+        # The worker gets its own copies: addEdges() keeps mutating _graph on the UI thread
+        self._layout_thread = threading.Thread(
+            target=layout_in_background,
+            args=(self._force, self._graph.copy(), dict(initial) if initial else None,
+                  lambda positions: self._postLayout(generation, positions),
+                  lambda: generation != self._layout_generation),
+            kwargs={"iterations": iterations},
+            daemon=True,
+        )
+        self._layout_thread.start()
+
+    def _postLayout(self, generation, positions):
+        """Layout thread side: leave the positions for the UI thread and ask for a repaint."""
+        with self._pending_lock:
+            self._pending_layout = (generation, positions)
+        # update() only queues the widget for the next paint
+        self.update()
+
+    def _takePendingLayout(self):
+        """UI thread side: adopt the latest refinement, unless a newer layout superseded it."""
+        with self._pending_lock:
+            pending, self._pending_layout = self._pending_layout, None
+        if pending is None or pending[0] != self._layout_generation:
+            return
+        first = not self._pos
+        self._pos = pending[1]
+        if first:
+            self.fitToScreen()
 
     def fitToScreen(self):
         # Auto-zoom to fit nodes
@@ -76,6 +188,7 @@ class TTkGraphWidget(TTkWidget):
         return TTkColor.RST
 
     def paintEvent(self, canvas: TTkCanvas):
+        self._takePendingLayout()
         w, h = self.size()
         center_x = w // 2 + self._offset_x
         center_y = h // 2 + self._offset_y
@@ -89,12 +202,7 @@ class TTkGraphWidget(TTkWidget):
             return
 
         # Pre-calc screen coords
-        screen_coords = {}
-        for node, (nx_x, nx_y) in self._pos.items():
-            screen_coords[node] = (
-                int(nx_x * scale_x + center_x),
-                int(nx_y * scale_y + center_y)
-            )
+        screen_coords = self._screenCoords()
 
         # Draw Directed Edges
         edge_color = TTkColor.fg("#444444")
@@ -175,6 +283,7 @@ class TTkGraphWidget(TTkWidget):
     def mousePressEvent(self, evt: TTkMouseEvent) -> bool:
         if evt.key == TTkMouseEvent.LeftButton:
             self._is_dragging = True
+            self._drag_moved = False
             self._drag_start = (evt.x, evt.y)
             return True
         return False
@@ -185,13 +294,20 @@ class TTkGraphWidget(TTkWidget):
             dy = evt.y - self._drag_start[1]
             self._offset_x += dx
             self._offset_y += dy
+            self._drag_moved = self._drag_moved or bool(dx or dy)
             self._drag_start = (evt.x, evt.y)
             self.update()
             return True
         return True # Swallow event
 
     def mouseReleaseEvent(self, evt: TTkMouseEvent) -> bool:
+        was_click = self._is_dragging and not self._drag_moved
         self._is_dragging = False
+        # Selecting a cluster expands it
+        if was_click and self._clusters is not None:
+            node = self.nodeAt(evt.x, evt.y)
+            if isinstance(node, ClusterNode) and self._clusters.expand(node):
+                self.setGraph(self._clusters.view())
         return True
 
     def wheelEvent(self, evt: TTkMouseEvent) -> bool:
@@ -199,8 +315,12 @@ class TTkGraphWidget(TTkWidget):
         if evt.evt == TTkMouseEvent.Wheel:
             if evt.key == TTkMouseEvent.WheelUp:
                  self._zoom *= 1.2
+                 if self._zoom >= self.EXPAND_ZOOM:
+                     self.expandVisible()
             elif evt.key == TTkMouseEvent.WheelDown:
                  self._zoom *= 0.8
+                 if self._zoom < self.EXPAND_ZOOM and self._clusters is not None and self._clusters.collapse_all():
+                     self.setGraph(self._clusters.view())
             self.update()
             return True
         return False
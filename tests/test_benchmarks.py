@@ -0,0 +1,59 @@
+import tests  # Configure le path
+
+import dns.resolver
+from benchmarks.run import Scenario, benchmark, compare
+from benchmarks.server import AuthoritativeServer
+from benchmarks.zones import ZoneBuilder, fanout, wildcard
+
+def make_resolver(server):
+    resolver = dns.resolver.Resolver(configure=False)
+    resolver.nameservers = [server.host]
+    resolver.port = server.port
+    resolver.lifetime = 2.0
+    return resolver
+
+def test_server_answers_negatives_wildcards_and_large_responses():
+    builder = ZoneBuilder(negative_ttl=42)
+    fanout(builder, "example.com", width=2, addresses=1)
+    wildcard(builder, "example.edu")
+    for index in range(60):
+        builder.add("big.example.com", "TXT", f'"record {index} padding padding padding"')
+
+    with AuthoritativeServer(builder.build()) as server:
+        resolver = make_resolver(server)
+        assert [str(r) for r in resolver.resolve("www.example.com", "A")] == ["192.0.2.4"]
+        assert str(resolver.resolve("4.2.0.192.in-addr.arpa", "PTR")[0]) == "www.example.com."
+        assert str(resolver.resolve("anything.example.edu", "A")[0]) == "203.0.113.1"
+
+        try:
+            resolver.resolve("missing.example.com", "A")
+            assert False, "NXDOMAIN attendu"
+        except dns.resolver.NXDOMAIN as e:
+            response = e.responses()[dns.name.from_text("missing.example.com")]
+            assert response.authority[0].ttl == 42
+
+        try:
+            resolver.resolve("www.example.com", "MX")
+            assert False, "NODATA attendu"
+        except dns.resolver.NoAnswer:
+            pass
+
+        # Tronquée en UDP, servie en TCP
+        assert len(resolver.resolve("big.example.com", "TXT")) == 60
+
+        try:
+            resolver.resolve("example.invalid", "A")
+            assert False, "REFUSED attendu"
+        except dns.resolver.NoNameservers:
+            pass
+
+def test_benchmark_reports_completeness_and_regressions():
+    scenario = Scenario("tiny", "example.com", lambda b: fanout(b, "example.com", width=3, addresses=1))
+    result = benchmark(scenario, ("dns", "ptr", "subdomains"))
+    assert result["completeness"] == 1.0
+    assert result["nodes"] > 5 and result["server_queries"] > 0
+    assert result["peak_kib"] is not None
+
+    baseline = dict(result, wire_queries=result["wire_queries"] // 2)
+    assert compare(result, baseline, tolerance=0.25) == [f"wire_queries {baseline['wire_queries']} -> {result['wire_queries']}"]
+    assert compare(result, result, tolerance=0.25) == []
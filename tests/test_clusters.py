@@ -0,0 +1,96 @@
+import tests  # Configure le path
+
+import networkx as nx
+import pytest
+from benchmarks.graphs import scan_graph
+from benchmarks.render import BenchGraphWidget
+from src.models.graph import Node, NodeType
+from src.tui.widgets.clusters import AUTO, BY_DOMAIN, BY_TYPE, ClusterIndex, ClusterNode, cluster_key
+
+def domain(name):
+    return Node(name, NodeType.DOMAIN)
+
+def ip(address):
+    return Node(address, NodeType.IP_V4 if ":" not in address else NodeType.IP_V6)
+
+def test_cluster_keys():
+    assert cluster_key(domain("www.example.co.uk")) == ("domain", "example.co.uk")
+    assert cluster_key(Node("_sip._tcp.example.com", NodeType.SERVICE)) == ("domain", "example.com")
+    assert cluster_key(ip("192.0.2.17")) == ("prefix", "192.0.2.0/24")
+    assert cluster_key(ip("2001:db8:1:2::1")) == ("prefix", "2001:db8:1::/48")
+    assert cluster_key(Node("10.0.0.0/16", NodeType.PREFIX_V4)) == ("prefix", "10.0.0.0/16")
+    assert cluster_key(Node("v=spf1 -all", NodeType.TXT)) == ("type", "TXT")
+    # Les adresses ne sont groupées par préfixe qu'en mode auto / prefix
+    assert cluster_key(ip("192.0.2.17"), BY_DOMAIN) == ("type", "IP_V4")
+    assert cluster_key(domain("www.example.com"), BY_TYPE) == ("type", "DOMAIN")
+    with pytest.raises(ValueError):
+        ClusterIndex("bogus")
+
+def test_index_aggregates_edges_and_expands_on_demand():
+    root = domain("example.com")
+    edges = [(root, domain(f"h{i}.example.com")) for i in range(5)]
+    edges += [(domain(f"h{i}.example.com"), ip(f"192.0.2.{i}")) for i in range(5)]
+    edges += [(root, domain("mx.mail.example.net"))]
+
+    index = ClusterIndex(AUTO)
+    displayed, changed = index.add_edges(edges)
+    assert len(index) == 3
+    example = index.clusters[("domain", "example.com")]
+    assert example.count == 6 and example.value == "example.com [6]"
+    # Arêtes internes au cluster invisibles, arêtes inter-clusters dédoublonnées par la vue
+    view = index.view()
+    assert set(view.nodes) == set(index.clusters.values())
+    assert view.number_of_edges() == 2
+    assert index.links()[(("domain", "example.com"), ("prefix", "192.0.2.0/24"))] == 5
+    assert all(shown[0] != shown[1] for shown in displayed)
+
+    assert index.expand(root)
+    view = index.view()
+    assert root in view and example not in view
+    assert view.has_edge(domain("h3.example.com"), index.clusters[("prefix", "192.0.2.0/24")])
+    assert view.has_edge(root, index.clusters[("domain", "example.net")])
+    assert index.representative(root) is root
+
+    # Arêtes arrivant pendant l'expansion : montrées au niveau des membres
+    displayed, changed = index.add_edges([(root, domain("new.example.com"))])
+    assert displayed == [(root, domain("new.example.com"))]
+    assert changed == {example} and example.count == 7
+
+    assert index.collapse_all()
+    assert index.view().number_of_nodes() == 3
+
+def test_graph_widget_shows_clusters_and_streams_into_them():
+    root, edges = scan_graph(3000, 5)
+    pairs = [(edge.source, edge.target) for edge in edges]
+    widget = BenchGraphWidget(nx.DiGraph(), None, 120, 40)
+    index = ClusterIndex()
+    index.add_edges(pairs[:1500])
+    widget.set_clusters(index, root)
+    widget.render_line(0)
+
+    assert widget.graph.number_of_nodes() == len(index) < 1500
+    assert widget.root == index.representative(root)
+    before = dict(widget._layout)
+
+    widget.add_edges(pairs[1500:])
+    widget.render_line(0)
+    assert index.node_count == 3000
+    assert set(widget.graph.nodes) == set(index.clusters.values())
+    moved = [node for node, position in before.items() if widget._layout[node] != position]
+    assert len(moved) < len(before) // 2
+    # Les compteurs affichés suivent les arrivées
+    assert all(widget._labels[node] == widget._wrap_label(node.value, widget._geometry[widget._layers[node]].label_width)
+               for node in widget._layout)
+
+    # Zoom : les clusters visibles sont dépliés dans la limite du budget
+    widget.expand_budget = 50
+    assert widget.expand_visible() > 0
+    widget.render_line(0)
+    revealed = [node for node in widget.graph if not isinstance(node, ClusterNode)]
+    assert 0 < len(revealed) <= 50
+    x, y = widget._layout[revealed[0]]
+    assert widget.node_at(x + widget._pan_x, y + widget._pan_y) == revealed[0]
+
+    widget.action_collapse_clusters()
+    widget.render_line(0)
+    assert all(isinstance(node, ClusterNode) for node in widget.graph)
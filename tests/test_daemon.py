@@ -0,0 +1,101 @@
+import tests  # Configure le path
+
+import json
+import threading
+import urllib.request
+
+from src.daemon.server import DONE, Job, ScanDaemon, make_server
+from src.engine.core import ScannerEngine
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.strategies.base import Strategy
+
+class MockStrategy(Strategy):
+    def execute(self, node):
+        if node.value.count(".") < 3:
+            child = Node(f"sub.{node.value}", NodeType.DOMAIN)
+            yield child, Edge(node, child, EdgeType.SUBDOMAIN)
+
+def make_engine():
+    engine = ScannerEngine()
+    engine.register_strategy(MockStrategy())
+    return engine
+
+def test_daemon_runs_jobs_and_streams_results():
+    daemon = ScanDaemon(workers=2, engine_factory=make_engine)
+    server = make_server(daemon, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        request = urllib.request.Request(
+            f"{base}/scans", data=json.dumps({"domain": "example.com", "depth": 5}).encode(), method="POST"
+        )
+        job = json.loads(urllib.request.urlopen(request).read())
+
+        with urllib.request.urlopen(f"{base}/scans/{job['id']}/results") as response:
+            records = [json.loads(line) for line in response]
+        assert [r["value"] for r in records if r["kind"] == "node"] == [
+            "example.com", "sub.example.com", "sub.sub.example.com"
+        ]
+
+        status = json.loads(urllib.request.urlopen(f"{base}/scans/{job['id']}").read())
+        assert status["status"] == DONE
+        assert status["stats"]["edges"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        daemon.shutdown()
+
+def test_job_results_spill_to_disk_and_stream_to_every_reader():
+    job = Job("example.com", 3, spool_size=4096)
+    job.READ_SIZE = 1000
+    lines = [json.dumps({"kind": "node", "value": f"é{i}.example.com"}) + "\n" for i in range(2000)]
+    early = []
+
+    def follow():
+        early.append("".join(job.stream(timeout=0.05)))
+
+    reader = threading.Thread(target=follow)
+    reader.start()
+    for line in lines[:1000]:
+        job.write(line)
+    # Au-delà du tampon en mémoire, les lignes sont sur disque
+    assert job.spooled
+    for line in lines[1000:]:
+        job.write(line)
+    job.finish(DONE)
+    reader.join()
+
+    # Un client arrivé après la fin relit tout depuis le début
+    assert early == ["".join(lines)]
+    assert "".join(job.stream()) == "".join(lines)
+
+def test_daemon_evicts_finished_jobs_behind_a_running_one():
+    release = threading.Event()
+
+    class BlockingStrategy(Strategy):
+        def execute(self, node):
+            if node.value == "slow.example":
+                release.wait(5)
+            return
+            yield
+
+    def factory():
+        engine = ScannerEngine()
+        engine.register_strategy(BlockingStrategy())
+        return engine
+
+    daemon = ScanDaemon(workers=2, engine_factory=factory, max_jobs=2)
+    try:
+        slow = daemon.submit("slow.example")
+        done = []
+        for i in range(3):
+            job = daemon.submit(f"fast{i}.example")
+            list(job.stream(timeout=0.05))
+            done.append(job)
+        # Le scan en cours reste, les plus anciens scans terminés sont oubliés
+        assert daemon.get(slow.id) is slow
+        assert [daemon.get(job.id) for job in done] == [None, None, done[2]]
+    finally:
+        release.set()
+        daemon.shutdown()
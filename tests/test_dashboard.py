@@ -0,0 +1,117 @@
+import tests  # Configure le path
+
+import io
+import dns.exception
+from rich.console import Console
+from src.engine.core import ScannerEngine
+from src.engine.events import ScanListener
+from src.engine.retry import RetryPolicy
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.strategies.base import Strategy
+from src.tui.dashboard import ScanDashboard, run_with_dashboard
+
+class SlowUpstream:
+    """
+    Timeout pour "slow.*", réponse sinon ; nameservers comme un dns.resolver.Resolver.
+    """
+    cache = None
+    nameservers = ["192.0.2.53"]
+
+    def resolve(self, qname, rdtype="A"):
+        if qname.startswith("slow"):
+            raise dns.exception.Timeout()
+        return object()
+
+class FanOutStrategy(Strategy):
+    """
+    Trois sous-domaines par domaine, en interrogeant chacun.
+    """
+    def __init__(self, resolver):
+        self.resolver = resolver
+
+    def execute(self, node):
+        for label in ("a", "b", "slow"):
+            name = f"{label}.{node.value}"
+            try:
+                self.resolver.resolve(name, "A")
+            except Exception:
+                continue
+            target = Node(name, NodeType.DOMAIN)
+            yield target, Edge(node, target, EdgeType.SUBDOMAIN)
+
+def fan_out_engine(max_depth=2):
+    engine = ScannerEngine(max_depth=max_depth, retry=RetryPolicy(max_attempts=1))
+    engine.register_strategy(FanOutStrategy(SlowUpstream()))
+    return engine
+
+def test_dashboard_counts_queries_timeouts_and_discoveries():
+    engine = fan_out_engine()
+    dashboard = ScanDashboard(engine, recent=3)
+    starts = []
+
+    class Pairing(ScanListener):
+        def on_query_start(self, strategy, qname, rdtype):
+            starts.append(qname)
+
+    engine.add_listener(dashboard)
+    engine.add_listener(Pairing())
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+
+    snap = dashboard.snapshot()
+    # 1 + 2 domaines développés, 3 requêtes chacun
+    assert snap["queries"] == 9 == len(starts)
+    assert snap["in_flight"] == 0
+    assert snap["timeouts"] == {"192.0.2.53": 3}
+    assert snap["hit_rate"] == 0.0
+    assert snap["nodes"] == len(engine.nodes)
+    assert [node.value for _, node in snap["recent"]] == [
+        node.value for node in list(engine.nodes)[-3:]]
+    assert snap["rate"] > 0
+
+    console = Console(file=io.StringIO(), width=120, color_system=None)
+    console.print(dashboard)
+    output = console.file.getvalue()
+    assert "192.0.2.53" in output and "Requêtes/s" in output
+
+def test_frontier_tracks_pending_nodes_per_depth():
+    engine = fan_out_engine(max_depth=3)
+    seen = []
+
+    class FrontierProbe(ScanListener):
+        def on_expand_start(self, node, depth):
+            seen.append((depth, dict(engine.frontier)))
+
+    engine.add_listener(FrontierProbe())
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+
+    assert seen[0] == (0, {0: 0})
+    # Premier enfant de la racine en cours : le second attend à la profondeur 1
+    assert seen[1] == (1, {0: 0, 1: 1})
+    # Ses propres enfants s'ajoutent à la profondeur 2
+    assert seen[2] == (2, {0: 0, 1: 1, 2: 1})
+    assert engine.frontier == {}
+
+def test_cancel_keeps_partial_graph():
+    engine = fan_out_engine(max_depth=5)
+    expanded = []
+
+    class CancelAfterTwo(ScanListener):
+        def on_expand_end(self, node):
+            expanded.append(node)
+            if len(expanded) == 2:
+                engine.cancel()
+
+    engine.add_listener(CancelAfterTwo())
+    console = Console(file=io.StringIO(), width=120, color_system=None)
+    completed = run_with_dashboard(engine, Node("example.com", NodeType.DOMAIN), console, refresh_per_second=20)
+
+    assert not completed and engine.cancelled
+    assert len(expanded) == 2
+    # Racine + 2 enfants + 2 petits-enfants découverts avant l'arrêt
+    assert len(engine.nodes) == 5 and len(engine.edges) == 4
+    assert not any(isinstance(listener, ScanDashboard) for listener in engine.listeners)
+
+    # Un nouveau scan repart de zéro
+    expanded.append(None)
+    assert run_with_dashboard(engine, Node("example.com", NodeType.DOMAIN), console)
+    assert len(engine.nodes) > 5
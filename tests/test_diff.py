@@ -0,0 +1,36 @@
+import tests  # Configure le path
+
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.storage.diff import ADDED, REMOVED, GraphSource, StoreSource, diff_scans, merge_sorted, summarize
+from src.storage.sqlite import ResultStore
+
+DOMAIN = Node("example.com", NodeType.DOMAIN)
+OLD_IP = Node("192.0.2.1", NodeType.IP_V4)
+NEW_IP = Node("192.0.2.2", NodeType.IP_V4)
+MX = Node("mx.example.com", NodeType.DOMAIN)
+
+OLD = ([DOMAIN, OLD_IP, MX], [Edge(DOMAIN, OLD_IP, EdgeType.A), Edge(DOMAIN, MX, EdgeType.MX)])
+NEW = ([DOMAIN, NEW_IP, MX], [Edge(DOMAIN, NEW_IP, EdgeType.A), Edge(DOMAIN, MX, EdgeType.MX)])
+
+def test_merge_sorted():
+    changes = list(merge_sorted(iter([1, 2, 4]), iter([2, 3, 4, 5])))
+    assert changes == [(REMOVED, 1), (ADDED, 3), (ADDED, 5)]
+
+def test_diff_in_memory():
+    changes = list(diff_scans(GraphSource(*OLD), GraphSource(*NEW)))
+    summary = summarize(changes)
+    assert summary.added_nodes == {"IP_V4": 1}
+    assert summary.removed_nodes == {"IP_V4": 1}
+    assert summary.added_edges == {"A": 1}
+    assert summary.removed_edges == {"A": 1}
+    added = [c.edge for c in changes if c.kind == "edge" and c.action == ADDED]
+    assert added == [Edge(DOMAIN, NEW_IP, EdgeType.A)]
+
+def test_diff_between_stored_and_memory(tmp_path):
+    with ResultStore(str(tmp_path / "scans.db")) as store:
+        old_id = store.save(*OLD, root=DOMAIN)
+        new_id = store.save(*NEW, root=DOMAIN)
+        on_disk = list(diff_scans(StoreSource(store, old_id), StoreSource(store, new_id)))
+        mixed = list(diff_scans(StoreSource(store, old_id), GraphSource(*NEW)))
+        assert on_disk == mixed
+        assert summarize(diff_scans(StoreSource(store, new_id), GraphSource(*NEW))).unchanged
@@ -0,0 +1,73 @@
+import tests  # Configure le path
+
+import io
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from src.engine.core import ScannerEngine
+from src.export.base import GraphExporter, open_exporter
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.models.ids import stable_id
+from src.strategies.base import Strategy
+
+class ChainStrategy(Strategy):
+    def execute(self, node):
+        if node.value == "example.com":
+            ip = Node("192.0.2.1", NodeType.IP_V4)
+            yield ip, Edge(node, ip, EdgeType.A)
+            txt = Node('v=spf1 "quoted" <tag>', NodeType.TXT)
+            yield txt, Edge(node, txt, EdgeType.TXT)
+
+def test_stable_ids_do_not_depend_on_process():
+    # Empreinte blake2b fixe, contrairement à hash()
+    assert stable_id(Node("example.com", NodeType.DOMAIN)) == stable_id(Node("Example.com.", NodeType.DOMAIN))
+    assert stable_id(Node("example.com", NodeType.DOMAIN)) != stable_id(Node("example.com", NodeType.TLD))
+
+def test_streaming_export_from_scan():
+    buffers = {fmt: io.StringIO() for fmt in ("dot", "jsonl", "graphml")}
+    engine = ScannerEngine()
+    engine.register_strategy(ChainStrategy())
+    exporters = [open_exporter(fmt, buffer) for fmt, buffer in buffers.items()]
+    for exporter in exporters:
+        engine.add_listener(exporter)
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+    for exporter in exporters:
+        exporter.close()
+
+    records = [json.loads(line) for line in buffers["jsonl"].getvalue().splitlines()]
+    assert [r["kind"] for r in records].count("node") == 3
+    assert [r["kind"] for r in records].count("edge") == 2
+    # Chaque arête référence un nœud déjà écrit
+    seen = set()
+    for record in records:
+        if record["kind"] == "node":
+            seen.add(record["id"])
+        else:
+            assert record["source"] in seen and record["target"] in seen
+
+    dot = buffers["dot"].getvalue()
+    assert dot.startswith("digraph G {") and dot.endswith("}\n")
+    assert f'"n{stable_id(Node("example.com", NodeType.DOMAIN))}" ->' in dot
+
+    root = ET.fromstring(buffers["graphml"].getvalue())
+    ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+    assert len(root.findall(".//g:node", ns)) == 3
+    assert len(root.findall(".//g:edge", ns)) == 2
+
+
+if __name__ == "__main__":
+    test_stable_ids_do_not_depend_on_process()
+    test_streaming_export_from_scan()
+    print("✓ Tout est OK !")
+
+def test_incomplete_exporter_fails_at_instantiation():
+    class NodesOnly(GraphExporter):
+        def format_node(self, node_id, node):
+            return node.value + "\n"
+
+    buffer = io.StringIO()
+    with pytest.raises(TypeError):
+        NodesOnly(buffer)
+    assert buffer.getvalue() == ""
@@ -0,0 +1,98 @@
+import tests  # Configure le path
+
+import math
+import threading
+import networkx as nx
+import numpy as np
+from benchmarks.graphs import scan_graph
+from src.tui.widgets import force
+from src.tui.widgets.force import ForceLayout, layout_in_background
+
+def scan(size):
+    root, edges = scan_graph(size, 3)
+    graph = nx.Graph()
+    graph.add_edges_from((edge.source, edge.target) for edge in edges)
+    return root, graph
+
+def test_repulsion_matches_exact_sum():
+    rng = np.random.default_rng(7)
+    pos = rng.random((1500, 2))
+    # Un amas dense, comme les feuilles autour d'un hub
+    pos[:500] = 0.4 + pos[:500] * 0.05
+    k = 0.05
+
+    delta = pos[:, None, :] - pos[None, :, :]
+    d2 = (delta ** 2).sum(-1)
+    np.fill_diagonal(d2, np.inf)
+    exact = (delta * (k * k / d2)[:, :, None]).sum(1)
+
+    approx = ForceLayout()._repulsion(pos, k)
+    error = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+    assert np.median(error) < 0.02
+    assert np.percentile(error, 95) < 0.1
+
+def test_layout_places_every_node_and_pulls_edges_together():
+    _, graph = scan(2000)
+    positions = ForceLayout(iterations=30).layout(graph)
+
+    assert set(positions) == set(graph.nodes)
+    assert max(max(abs(x), abs(y)) for x, y in positions.values()) <= 1.0 + 1e-9
+
+    def distance(u, v):
+        return math.dist(positions[u], positions[v])
+
+    nodes = list(graph.nodes)
+    rng = np.random.default_rng(0)
+    pairs = rng.integers(0, len(nodes), size=(2000, 2))
+    random_mean = np.mean([distance(nodes[a], nodes[b]) for a, b in pairs])
+    edge_mean = np.mean([distance(u, v) for u, v in graph.edges])
+    assert edge_mean < random_mean / 2
+
+def test_warm_start_keeps_existing_nodes_stable():
+    root, graph = scan(3000)
+    layout = ForceLayout(iterations=40)
+    before = layout.layout(graph)
+
+    graph.add_edges_from((root, f"new{i}.example") for i in range(20))
+    warm = layout.layout(graph, initial=before, iterations=10)
+    cold = ForceLayout(iterations=40, seed=1).layout(graph)
+
+    assert set(warm) == set(graph.nodes)
+    warm_moves = np.median([math.dist(warm[node], before[node]) for node in before])
+    cold_moves = np.median([math.dist(cold[node], before[node]) for node in before])
+    assert warm_moves < 0.1
+    assert warm_moves < cold_moves / 3
+    # Les nouveaux nœuds partent de leur voisin déjà placé
+    assert all(math.dist(warm[f"new{i}.example"], warm[root]) < 0.5 for i in range(20))
+
+def test_refine_yields_progressively_within_budget():
+    _, graph = scan(500)
+    steps = list(ForceLayout().refine(graph, iterations=30, every=10))
+    assert len(steps) == 3
+    assert all(set(step) == set(graph.nodes) for step in steps)
+
+    # Un budget nul s'arrête après la première itération, avec un résultat complet
+    steps = list(ForceLayout().refine(graph, iterations=1000, time_budget=0.0, every=10))
+    assert len(steps) == 1 and set(steps[0]) == set(graph.nodes)
+
+def test_background_layout_works_on_its_own_copy():
+    root, graph = scan(500)
+    updates = []
+    worker = threading.Thread(target=layout_in_background,
+                              args=(ForceLayout(), graph.copy(), None, updates.append, lambda: False),
+                              kwargs={"iterations": 20, "every": 5})
+    worker.start()
+    # Le graphe affiché continue de grandir pendant le calcul
+    graph.add_edges_from((root, f"late{i}.example") for i in range(50))
+    worker.join()
+
+    assert len(updates) == 4
+    assert all(len(step) == 500 for step in updates)
+
+def test_falls_back_to_spring_layout_without_numpy(monkeypatch):
+    monkeypatch.setattr(force, "np", None)
+    graph = nx.path_graph(30)
+    initial = {node: (node / 30, 0.0) for node in range(20)}
+    positions = ForceLayout(iterations=10).layout(graph, initial=initial)
+    assert set(positions) == set(graph.nodes)
+    assert ForceLayout().layout(nx.Graph()) == {}
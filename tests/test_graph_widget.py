@@ -0,0 +1,103 @@
+import tests  # Configure le path
+
+import networkx as nx
+from rich.style import Style
+from benchmarks.graphs import scan_graph
+from benchmarks.render import BenchGraphWidget
+from src.tui.widgets.graph import ORPHAN_LAYER
+from src.tui.widgets.spatial import SpatialIndex
+
+def cells(strips):
+    return [[(char, segment.style) for segment in strip for char in segment.text] for strip in strips]
+
+def reference(widget, width, height):
+    # Rendu sans index ni réutilisation : toutes les arêtes puis tous les nœuds
+    grid = [[(" ", Style()) for _ in range(width)] for _ in range(height)]
+    edge_style = Style(color="grey50")
+    arrow_style = Style(color="bright_white", bold=True)
+    for source, target in widget._edge_list:
+        if source in widget._layout and target in widget._layout:
+            sx, sy = widget._apply_pan(*widget._layout[source])
+            tx, ty = widget._apply_pan(*widget._layout[target])
+            widget._draw_edge(grid, sx, sy, tx, ty, edge_style, arrow_style)
+    for node, (x, y) in widget._layout.items():
+        x, y = widget._apply_pan(x, y)
+        style = widget._node_style(node)
+        widget._set_cell(grid, x, y, "@" if node == widget.root else "*", style, force=True)
+        if widget._labels.get(node):
+            widget._draw_label_lines(grid, x + 2, y, widget._labels[node], style)
+    return [[cell for cell in row] for row in grid]
+
+def make_widget(size=400, width=120, height=40):
+    root, edges = scan_graph(size)
+    graph = nx.DiGraph()
+    graph.add_edges_from((edge.source, edge.target) for edge in edges)
+    return BenchGraphWidget(graph, root, width, height)
+
+def test_spatial_index_queries_fine_and_coarse_levels():
+    index = SpatialIndex(cell_width=4, cell_height=4)
+    index.insert(1, 0, 0, 2, 2)
+    index.insert(2, -500, 10, 500, 10)  # long segment, coarse level
+    index.insert(3, 40, 40, 41, 41)
+    assert index.query(0, 0, 3, 3) == {1}
+    assert index.query(-100, 8, -90, 12) == {2}
+    assert index.query(30, 30, 50, 50) == {3}
+    assert len(index) == 3
+
+def test_culled_and_panned_rendering_matches_full_redraw():
+    widget = make_widget()
+    widget._build_render_cache()
+    assert cells(widget._strips) == reference(widget, 120, 40)
+
+    for dx, dy in ((2, 0), (0, 1), (-7, -3), (15, 9), (-40, 2), (0, -39), (130, 0)):
+        widget._pan_x += dx
+        widget._pan_y += dy
+        widget.render_line(0)
+        assert widget._rendered_pan == (widget._pan_x, widget._pan_y)
+        assert cells(widget._strips) == reference(widget, 120, 40)
+
+def test_incremental_layout_keeps_existing_nodes_in_place():
+    root, edges = scan_graph(600)
+    pairs = [(edge.source, edge.target) for edge in edges]
+    widget = BenchGraphWidget(nx.DiGraph(pairs[:800]), root, 120, 40)
+    widget._build_render_cache()
+    before = dict(widget._layout)
+    deepest = max(layer for layer in widget._layers.values() if layer < ORPHAN_LAYER)
+    parent = next(node for node, layer in widget._layers.items() if layer == deepest)
+
+    # Nouvelles feuilles sous la couche la plus profonde : une couche ajoutée, rien ne bouge
+    leaves = [(parent, f"leaf{i}") for i in range(5)]
+    widget.add_edges(leaves)
+    assert all(widget._layout[node] == position for node, position in before.items())
+    assert {widget._layers[leaf] for _, leaf in leaves} == {deepest + 1}
+
+    # Le reste du scan arrive par lots : seuls les nœuds arrivés ou changés de couche se déplacent
+    for start in range(800, len(pairs), 150):
+        stable = {node: position for node, position in widget._layout.items()}
+        widget.add_edges(pairs[start:start + 150])
+        moved = [node for node, position in stable.items() if widget._layout[node] != position]
+        assert len(moved) < len(stable) // 2
+    widget.render_line(0)
+
+    assert widget._layers == widget._assign_layers(list(widget.graph.nodes))
+    positions = list(widget._layout.values())
+    assert len(positions) == len(set(positions))
+    assert cells(widget._strips) == reference(widget, 120, 40)
+
+    widget._pan_x -= 30
+    widget._pan_y -= 12
+    widget.render_line(0)
+    assert cells(widget._strips) == reference(widget, 120, 40)
+
+def test_incremental_layout_moves_whole_layer_when_a_layer_above_grows():
+    widget = BenchGraphWidget(nx.DiGraph([("root", "a"), ("a", "b"), ("a", "c")]), "root", 120, 40)
+    widget._build_render_cache()
+    old_y = widget._layout["b"][1]
+
+    # Un libellé de 200 caractères grandit la couche 1 pendant que la couche 2 reçoit "d"
+    widget.add_edges([("root", "x" * 200), ("a", "d")])
+    for node, layer in widget._layers.items():
+        assert widget._layout[node][1] == widget._geometry[layer].y
+    assert widget._layout["b"][1] == widget._layout["c"][1] == widget._layout["d"][1] > old_y
+    widget.render_line(0)
+    assert cells(widget._strips) == reference(widget, 120, 40)
@@ -0,0 +1,53 @@
+import tests  # Configure le path
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from src.headless import main
+from src.storage import spill
+
+ROOT = Path(__file__).parent.parent
+
+# Lance le mode headless puis liste les modules lourds chargés au passage
+PROBE = """
+import json, sys
+from src.headless import main
+main(sys.argv[1:])
+heavy = [m for m in ("rich", "networkx", "tldextract", "dns.resolver", "textual") if m in sys.modules]
+print(json.dumps({"heavy": heavy}), file=sys.stderr)
+"""
+
+def run_headless(*args):
+    return subprocess.run([sys.executable, "-c", PROBE, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+def test_headless_writes_json_lines_without_heavy_imports():
+    result = run_headless("a.b.example.com", "-s", "parents")
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["value"] for r in records if r["kind"] == "node"] == ["a.b.example.com", "b.example.com", "example.com"]
+    assert json.loads(result.stderr.splitlines()[-1]) == {"heavy": []}
+
+def test_headless_rejects_unknown_strategy():
+    result = subprocess.run(
+        [sys.executable, "main.py", "headless", "example.com", "-s", "nope"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    assert result.returncode == 2
+    assert "nope" in result.stderr
+
+def test_headless_removes_spill_file_when_the_run_fails(tmp_path, monkeypatch):
+    stores = []
+
+    class RecordingStore(spill.SpillGraphStore):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            stores.append(self)
+
+    monkeypatch.setattr(spill, "SpillGraphStore", RecordingStore)
+    # Écriture des métriques impossible, après le scan
+    with pytest.raises(OSError):
+        main(["a.b.example.com", "-s", "parents", "--memory-limit", "1", "--metrics", str(tmp_path / "absent" / "m.json")])
+    assert len(stores) == 1 and not os.path.exists(stores[0].path)
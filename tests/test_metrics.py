@@ -0,0 +1,90 @@
+import tests  # Configure le path
+
+import dns.exception
+import dns.resolver
+from unittest.mock import MagicMock
+from src.engine.core import ScannerEngine
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.strategies.base import Strategy
+from src.strategies.subdomains import SubdomainStrategy
+
+class FakeResolver:
+    cache = None
+
+    def resolve(self, qname, rdtype="A"):
+        if qname.startswith("missing"):
+            raise dns.resolver.NXDOMAIN()
+        answer = MagicMock()
+        answer.rrset.ttl = 300
+        return answer
+
+class LookupStrategy(Strategy):
+    def __init__(self):
+        self.resolver = FakeResolver()
+
+    def execute(self, node):
+        if node.value != "example.com":
+            return
+        for name in ("www", "missing", "api"):
+            try:
+                self.resolver.resolve(f"{name}.{node.value}", "A")
+            except Exception:
+                continue
+            target = Node(f"{name}.{node.value}", NodeType.DOMAIN)
+            yield target, Edge(node, target, EdgeType.SUBDOMAIN)
+
+class BrokenStrategy(Strategy):
+    def execute(self, node):
+        raise RuntimeError("boom")
+        yield
+
+def scan() -> ScannerEngine:
+    engine = ScannerEngine(max_depth=1)
+    engine.register_strategy(LookupStrategy())
+    engine.register_strategy(BrokenStrategy())
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+    return engine
+
+def test_stats_report_per_strategy_counters():
+    strategies = scan().get_stats()["strategies"]
+
+    lookup = strategies["LookupStrategy"]
+    assert lookup["runs"] == 1 and lookup["results"] == 2
+    assert lookup["wire_queries"] == 3
+    assert lookup["rdtypes"]["A"]["outcomes"]["NOERROR"] == 2
+    assert lookup["rdtypes"]["A"]["outcomes"]["NXDOMAIN"] == 1
+    assert lookup["rdtypes"]["A"]["latency"]["buckets"]["+Inf"] == 3
+    assert lookup["results_per_query"] == round(2 / 3, 4)
+    assert strategies["BrokenStrategy"]["errors"] == 1
+
+def test_prometheus_export():
+    text = scan().metrics.to_prometheus()
+    assert '# TYPE dns_checker_queries_total counter' in text
+    assert 'dns_checker_queries_total{strategy="LookupStrategy",rdtype="A",outcome="NXDOMAIN"} 1' in text
+    assert 'dns_checker_query_duration_seconds_count{strategy="LookupStrategy",rdtype="A"} 3' in text
+    assert 'dns_checker_strategy_errors_total{strategy="BrokenStrategy"} 1' in text
+
+class FailingResolver:
+    """
+    Timeout pour www, bogue (exception hors DNS) pour api, NXDOMAIN sinon.
+    """
+    cache = None
+
+    def resolve(self, qname, rdtype="A"):
+        if qname.startswith("www."):
+            raise dns.exception.Timeout()
+        if qname.startswith("api."):
+            raise KeyError(qname)
+        raise dns.resolver.NXDOMAIN()
+
+def test_strategy_errors_count_unexpected_exceptions_only():
+    strategy = SubdomainStrategy()
+    strategy.resolver = FailingResolver()
+    engine = ScannerEngine(max_depth=1)
+    engine.register_strategy(strategy)
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+
+    stats = engine.get_stats()["strategies"]["SubdomainStrategy"]
+    # Les erreurs DNS sont des réponses ; le KeyError remonte jusqu'au moteur
+    assert stats["errors"] == 1
+    assert stats["rdtypes"]["A"]["outcomes"]["TIMEOUT"] >= 1
@@ -0,0 +1,120 @@
+import tests  # Configure le path
+
+from unittest.mock import MagicMock
+from src.engine.core import ScannerEngine
+from src.engine.monitor import ADDED, REMOVED, ScanMonitor
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.strategies.base import Strategy
+
+class FakeResolver:
+    def __init__(self, zone):
+        self.zone = zone
+        self.queries = []
+
+    def resolve(self, qname, rdtype="A"):
+        self.queries.append((qname, rdtype))
+        answer = MagicMock()
+        answer.rrset.ttl = self.zone[qname][1]
+        answer.__iter__.return_value = iter(self.zone[qname][0])
+        return answer
+
+class ARecordStrategy(Strategy):
+    def __init__(self, zone):
+        self.resolver = FakeResolver(zone)
+
+    def execute(self, node):
+        if node.type != NodeType.DOMAIN:
+            return
+        for ip in self.resolver.resolve(node.value, "A"):
+            target = Node(ip, NodeType.IP_V4)
+            yield target, Edge(node, target, EdgeType.A)
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def test_monitor_refreshes_only_expired_lookups():
+    zone = {"a.example": (["192.0.2.1"], 60), "b.example": (["192.0.2.2"], 3600)}
+    root = Node("a.example", NodeType.DOMAIN)
+    strategy = ARecordStrategy(zone)
+    engine = ScannerEngine(max_depth=2)
+    engine.register_strategy(strategy)
+    clock = Clock()
+    monitor = ScanMonitor(engine, min_ttl=10, clock=clock, sleep=clock.sleep)
+    changes = []
+    monitor.add_handler(changes.append)
+
+    monitor.start(root)
+    edge = Edge(root, Node("192.0.2.1", NodeType.IP_V4), EdgeType.A)
+    assert monitor.provenance(edge) == ("a.example", "A", 60)
+    assert monitor.next_due() == 60
+
+    # Rien n'a changé : une seule requête rejouée, aucun événement
+    clock.now = 60
+    assert monitor.run_pending() == 1
+    assert changes == []
+    assert strategy.resolver.queries[-1] == ("a.example", "A")
+
+    # Le A change : l'ancienne arête disparaît, la nouvelle est signalée
+    zone["a.example"] = (["192.0.2.9"], 60)
+    monitor.run(duration=60)
+    actions = {(c.action, c.edge.target.value) for c in changes}
+    assert actions == {(ADDED, "192.0.2.9"), (REMOVED, "192.0.2.1")}
+    assert changes[0].qname == "a.example"
+    assert {e.target.value for e in engine.edges} == {"192.0.2.9"}
+
+class LinkStrategy(ARecordStrategy):
+    """
+    Réponses = noms de domaines (comme un CNAME) : produit des sous-graphes de domaines.
+    """
+    def execute(self, node):
+        for name in self.resolver.resolve(node.value, "CNAME"):
+            target = Node(name, NodeType.DOMAIN)
+            yield target, Edge(node, target, EdgeType.CNAME)
+
+def test_monitor_drops_subgraphs_that_left_the_estate():
+    zone = {
+        "a.example": (["b.example"], 60),
+        "b.example": (["c.example"], 3600),
+        "c.example": ([], 3600),
+        "d.example": ([], 3600),
+    }
+    root = Node("a.example", NodeType.DOMAIN)
+    strategy = LinkStrategy(zone)
+    engine = ScannerEngine(max_depth=5)
+    engine.register_strategy(strategy)
+    clock = Clock()
+    monitor = ScanMonitor(engine, min_ttl=10, clock=clock, sleep=clock.sleep)
+    changes = []
+    monitor.add_handler(changes.append)
+    monitor.start(root)
+
+    # a.example ne pointe plus vers b.example : b et c quittent le parc
+    zone["a.example"] = (["d.example"], 60)
+    clock.now = 60
+    monitor.run_pending()
+    removed = {(c.edge.source.value, c.edge.target.value) for c in changes if c.action == REMOVED}
+    assert removed == {("a.example", "b.example"), ("b.example", "c.example")}
+    assert {(e.source.value, e.target.value) for e in engine.edges} == {("a.example", "d.example")}
+    assert all(key[0].value in ("a.example", "d.example") for key in monitor._scheduled)
+
+    # Plus aucune requête vers b ni c, même après leur TTL
+    strategy.resolver.queries.clear()
+    monitor.run(duration=7200)
+    assert {qname for qname, _ in strategy.resolver.queries} == {"a.example", "d.example"}
+
+    # b.example revient : il est redéveloppé et replanifié
+    zone["a.example"] = (["b.example"], 60)
+    clock.now += 60
+    changes.clear()
+    monitor.run_pending()
+    added = {(c.edge.source.value, c.edge.target.value) for c in changes if c.action == ADDED}
+    assert added == {("a.example", "b.example"), ("b.example", "c.example")}
+    assert ("b.example", "c.example") in {(e.source.value, e.target.value) for e in engine.edges}
+    assert any(key[0].value == "b.example" for key in monitor._scheduled)
@@ -0,0 +1,41 @@
+import tests  # Configure le path
+
+from src.engine.core import ScannerEngine
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.strategies.base import Strategy
+
+def test_node_values_are_canonical():
+    assert Node("Example.COM.", NodeType.DOMAIN) == Node("example.com", NodeType.DOMAIN)
+    assert Node("bücher.example", NodeType.DOMAIN).value == "xn--bcher-kva.example"
+    assert Node("2001:DB8:0:0::1", NodeType.IP_V6).value == "2001:db8::1"
+    assert Node("10.1.2.3/8", NodeType.PREFIX_V4).value == "10.0.0.0/8"
+    assert Node(" v=spf1 -all", NodeType.TXT).value == " v=spf1 -all"
+    # Valeurs égales : un seul objet str
+    assert Node("a.example", NodeType.DOMAIN).value is Node("A.example.", NodeType.DOMAIN).value
+
+class SpellingStrategy(Strategy):
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, node):
+        self.calls.append(node.value)
+        if node.value == "root":
+            for spelling in ("Host.example", "host.example.", "host.example"):
+                target = Node(spelling, NodeType.DOMAIN)
+                yield target, Edge(node, target, EdgeType.CNAME)
+
+def test_engine_scans_each_spelling_once():
+    strategy = SpellingStrategy()
+    engine = ScannerEngine()
+    engine.register_strategy(strategy)
+    engine.scan(Node("root", NodeType.DOMAIN))
+
+    assert strategy.calls == ["root", "host.example"]
+    assert len(engine.nodes) == 2
+    assert len(engine.edges) == 1
+
+
+if __name__ == "__main__":
+    test_node_values_are_canonical()
+    test_engine_scans_each_spelling_once()
+    print("✓ Tout est OK !")
@@ -0,0 +1,34 @@
+import tests  # Configure le path
+
+from src.models.graph import Node, NodeType
+from src.models.psl import SuffixTrie, public_suffix, registered_domain
+from src.strategies.parents import ParentStrategy
+
+def test_registered_domain():
+    assert registered_domain("www.example.co.uk") == "example.co.uk"
+    assert registered_domain("a.b.example.com") == "example.com"
+    assert registered_domain("co.uk") is None
+    assert registered_domain("1.2.3.4") is None
+    assert registered_domain("host.unknowntld") is None
+    assert public_suffix("www.example.co.uk") == "co.uk"
+
+def test_wildcard_and_exception_rules():
+    trie = SuffixTrie.compile("*.ck\n!www.ck\nio\n// ===BEGIN PRIVATE DOMAINS===\ngithub.io\n")
+    assert trie.suffix_length("a.b.ck".split(".")) == 2
+    assert trie.suffix_length("www.ck".split(".")) == 1
+    # Les règles privées ne s'appliquent que sur demande
+    assert trie.suffix_length("user.github.io".split(".")) == 1
+    assert trie.suffix_length("user.github.io".split("."), private=True) == 2
+
+def test_parent_strategy_stops_at_registered_domain():
+    strategy = ParentStrategy()
+    results = list(strategy.execute(Node("a.b.example.co.uk", NodeType.DOMAIN)))
+    assert [n.value for n, e in results] == ["b.example.co.uk"]
+    assert list(strategy.execute(Node("example.co.uk", NodeType.DOMAIN))) == []
+
+
+if __name__ == "__main__":
+    test_registered_domain()
+    test_wildcard_and_exception_rules()
+    test_parent_strategy_stops_at_registered_domain()
+    print("✓ Tout est OK !")
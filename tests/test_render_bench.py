@@ -0,0 +1,17 @@
+import tests  # Configure le path
+
+from benchmarks.graphs import scan_graph
+from benchmarks.render import MEMORY_KEYS, TIME_KEYS, benchmark
+
+def test_scan_graph_is_deterministic_and_sized():
+    root, edges = scan_graph(2000, seed=3)
+    nodes = {edge.source for edge in edges} | {edge.target for edge in edges}
+    assert len(nodes) == 2000 and root in nodes
+    assert edges == scan_graph(2000, seed=3)[1]
+    assert {node.type.value for node in nodes} >= {"DOMAIN", "IP_V4", "TXT"}
+
+def test_render_benchmark_measures_every_phase():
+    result = benchmark(300, width=80, height=24, redraws=2)
+    assert result["nodes"] == 300
+    for key in TIME_KEYS + MEMORY_KEYS:
+        assert result[key] >= 0
@@ -0,0 +1,140 @@
+import tests  # Configure le path
+
+import dns.exception
+import dns.message
+import dns.rcode
+import dns.resolver
+from src.engine.core import ScannerEngine
+from src.engine.events import ScanListener
+from src.engine.retry import NegativeCache, RetryPolicy
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.strategies.base import Strategy
+
+class FlakyResolver:
+    """
+    Perd les `losses` premières requêtes de chaque nom, NXDOMAIN pour "missing.*".
+    """
+    cache = None
+
+    def __init__(self, losses: int):
+        self.losses = losses
+        self.calls = {}
+
+    def resolve(self, qname, rdtype="A"):
+        self.calls[qname] = self.calls.get(qname, 0) + 1
+        if qname.startswith("missing"):
+            raise dns.resolver.NXDOMAIN()
+        if self.calls[qname] <= self.losses:
+            raise dns.exception.Timeout()
+        return object()
+
+class ProbeStrategy(Strategy):
+    def __init__(self, resolver, names):
+        self.resolver = resolver
+        self.names = names
+
+    def execute(self, node):
+        for name in self.names:
+            try:
+                self.resolver.resolve(f"{name}.example.com", "A")
+            except Exception:
+                continue
+            target = Node(f"{name}.example.com", NodeType.DOMAIN)
+            yield target, Edge(node, target, EdgeType.SUBDOMAIN)
+
+def engine_with(resolver, names, **policy):
+    delays = []
+    engine = ScannerEngine(max_depth=1, retry=RetryPolicy(sleep=delays.append, rng=lambda: 1.0, **policy))
+    engine.register_strategy(ProbeStrategy(resolver, names))
+    engine.register_strategy(ProbeStrategy(resolver, names))
+    return engine, delays
+
+def test_transient_failures_are_retried_with_backoff():
+    resolver = FlakyResolver(losses=2)
+    engine, delays = engine_with(resolver, ["www"], max_attempts=3, base_delay=0.1)
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+
+    assert Node("www.example.com", NodeType.DOMAIN) in engine.nodes
+    assert delays == [0.1, 0.2]
+    assert engine.get_stats()["retries"]["retries"] == 2
+    assert engine.get_stats()["strategies"]["ProbeStrategy"]["rdtypes"]["A"]["retries"] == 2
+
+def test_negatives_are_cached_and_never_retried():
+    resolver = FlakyResolver(losses=0)
+    engine, delays = engine_with(resolver, ["missing"])
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+
+    # Seconde stratégie servie par le cache négatif
+    assert resolver.calls["missing.example.com"] == 1
+    assert delays == []
+    assert engine.negative_cache.hits == 1
+
+def test_retry_budget_is_per_scan():
+    resolver = FlakyResolver(losses=10)
+    engine, delays = engine_with(resolver, ["a", "b", "c"], max_attempts=5, budget=3)
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+    assert len(delays) == 3 and engine.retry.exhausted > 0
+
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+    assert len(delays) == 6
+
+def test_negative_cache_expires():
+    now = [0.0]
+    cache = NegativeCache(default_ttl=60, clock=lambda: now[0])
+    cache.put("missing.example.com", "A", "NXDOMAIN", None, dns.resolver.NXDOMAIN())
+    cache.put("www.example.com", "A", "TIMEOUT", None, dns.exception.Timeout())
+    assert cache.get("missing.example.com", "A")[0] == "NXDOMAIN"
+    assert cache.get("www.example.com", "A") is None
+    now[0] = 61
+    assert cache.get("missing.example.com", "A") is None
+
+class RefusingResolver(FlakyResolver):
+    """
+    REFUSED pour "refused.*", SERVFAIL pour "broken.*" (NoNameservers dans les deux cas).
+    """
+    def resolve(self, qname, rdtype="A"):
+        self.calls[qname] = self.calls.get(qname, 0) + 1
+        label = qname.split(".")[0]
+        if label in ("refused", "broken"):
+            rcode = dns.rcode.REFUSED if label == "refused" else dns.rcode.SERVFAIL
+            request = dns.message.make_query(qname, rdtype)
+            response = dns.message.make_response(request)
+            response.set_rcode(rcode)
+            raise dns.resolver.NoNameservers(
+                request=request, errors=[("192.0.2.53", False, 53, dns.rcode.to_text(rcode), response)])
+        return object()
+
+def test_refused_is_permanent_and_servfail_is_retried():
+    resolver = RefusingResolver(losses=0)
+    engine, delays = engine_with(resolver, ["refused", "broken"], max_attempts=3, base_delay=0.1)
+    outcomes = []
+
+    class Outcomes(ScanListener):
+        def on_query(self, event):
+            outcomes.append((event.qname.split(".")[0], event.outcome, event.cached))
+
+    engine.add_listener(Outcomes())
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+
+    # REFUSED : une seule requête, la seconde stratégie est servie par le cache négatif
+    assert resolver.calls["refused.example.com"] == 1
+    assert ("refused", "REFUSED", True) in outcomes
+    # SERVFAIL : relancé
+    assert resolver.calls["broken.example.com"] == 3 * 2
+    assert len(delays) == 2 * 2
+
+def test_negative_cache_hits_raise_fresh_exceptions():
+    resolver = FlakyResolver(losses=0)
+    engine, _ = engine_with(resolver, ["missing"])
+    engine.register_strategy(ProbeStrategy(resolver, ["missing"]))
+    raised = []
+    observed = engine.strategies[0].resolver
+    for _ in range(3):
+        try:
+            observed.resolve("missing.example.com", "A")
+        except dns.resolver.NXDOMAIN as e:
+            raised.append(e)
+    assert len({id(e) for e in raised}) == 3
+    # La trace d'une copie ne contient que la relance courante
+    depth = lambda tb: 0 if tb is None else 1 + depth(tb.tb_next)
+    assert depth(raised[2].__traceback__) == depth(raised[1].__traceback__)
@@ -0,0 +1,103 @@
+import tests  # Configure le path
+
+import io
+from rich.console import Console
+from rich.tree import Tree
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.tui.rich_app import RichDNSApp
+from src.tui.tree import AdjacencyIndex, walk
+
+def domain(name):
+    return Node(name, NodeType.DOMAIN)
+
+def render(renderable_or_app, root=None, **limits):
+    console = Console(file=io.StringIO(), width=200, color_system=None)
+    if root is None:
+        console.print(renderable_or_app)
+    else:
+        renderable_or_app.print_tree(root, console, **limits)
+    return console.file.getvalue()
+
+def recursive_tree(app, root):
+    # Construction récursive d'origine, pour comparaison
+    adj = {}
+    for edge in app.engine.edges:
+        adj.setdefault(edge.source, []).append(edge)
+    rank = {NodeType.DOMAIN: 0, NodeType.TLD: 1, NodeType.SERVICE: 2, NodeType.IP_V4: 3, NodeType.IP_V6: 4}
+    for edges in adj.values():
+        edges.sort(key=lambda edge: (rank.get(edge.target.type, 99), edge.target.value, edge.type.value))
+
+    def add(node, tree_node, visited):
+        for edge in adj.get(node, []):
+            label = app._edge_label(edge, edge.target)
+            if edge.target in visited:
+                label.stylize("dim")
+                tree_node.add(label)
+                continue
+            visited.add(edge.target)
+            add(edge.target, tree_node.add(label), visited)
+
+    tree = Tree(app._node_label(root, is_root=True), guide_style="grey50")
+    add(root, tree, {root})
+    return tree
+
+def sample_app():
+    app = RichDNSApp()
+    root = domain("example.com")
+    edges = [
+        Edge(root, domain("www.example.com"), EdgeType.SUBDOMAIN),
+        Edge(root, Node("192.0.2.1", NodeType.IP_V4), EdgeType.A),
+        Edge(root, domain("mail.example.com"), EdgeType.MX),
+        Edge(domain("www.example.com"), Node("192.0.2.1", NodeType.IP_V4), EdgeType.A),
+        Edge(domain("mail.example.com"), Node("192.0.2.9", NodeType.IP_V4), EdgeType.A),
+        Edge(Node("192.0.2.9", NodeType.IP_V4), domain("mail.example.com"), EdgeType.PTR),
+        Edge(domain("www.example.com"), Node("2001:db8::1", NodeType.IP_V6), EdgeType.AAAA),
+    ]
+    for edge in edges:
+        app.engine.add_edge(edge)
+    return app, root
+
+def test_streamed_tree_matches_recursive_rich_tree():
+    app, root = sample_app()
+    expected = render(recursive_tree(app, root))
+    assert render(app, root) == expected
+    assert render(app.build_rich_tree(root)) == expected
+    # Plafond de lignes : l'affichage s'arrête sur une ligne de troncature
+    lines = render(app, root, max_lines=3).splitlines()
+    assert len(lines) == 5 and lines[-1] == "└── … truncated after 3 lines"
+    # L'index suit les arêtes au fil de l'eau, sans reconstruction
+    assert app.adjacency.edge_count == len(app.engine.edges)
+
+def test_pagination_and_depth_cap():
+    app = RichDNSApp()
+    root = domain("example.com")
+    for i in range(12):
+        app.engine.add_edge(Edge(root, domain(f"h{i:02d}.example.com"), EdgeType.SUBDOMAIN))
+    app.engine.add_edge(Edge(domain("h00.example.com"), domain("deep.example.com"), EdgeType.CNAME))
+    app.engine.add_edge(Edge(domain("deep.example.com"), domain("deeper.example.com"), EdgeType.CNAME))
+
+    lines = render(app, root, max_children=5, max_depth=2).splitlines()
+    assert lines[-1] == "└── … +7 more"
+    assert sum("h0" in line for line in lines) == 5
+    assert any("deep.example.com" in line for line in lines)
+    assert not any("deeper.example.com" in line for line in lines)
+    assert "… +1 more" in lines[3]
+    assert render(app.build_rich_tree(root, max_children=5, max_depth=2)) == "\n".join(lines) + "\n"
+
+def test_deep_chain_is_iterative_and_bounded():
+    index = AdjacencyIndex()
+    chain = [domain(f"c{i}.example.com") for i in range(20000)]
+    for source, target in zip(chain, chain[1:]):
+        index.on_edge(Edge(source, target, EdgeType.CNAME))
+    assert sum(1 for _ in walk(index, chain[0], max_depth=None)) == len(chain) - 1
+    items = list(walk(index, chain[0], max_depth=50))
+    assert len(items) == 51 and items[-1] == (51, 1, True, False)
+
+def test_index_sorts_late_arrivals():
+    index = AdjacencyIndex()
+    root = domain("example.com")
+    for name in ("b.example.com", "c.example.com", "a.example.com"):
+        index.on_edge(Edge(root, domain(name), EdgeType.SUBDOMAIN))
+    index.on_edge(Edge(root, Node("192.0.2.1", NodeType.IP_V4), EdgeType.A))
+    assert [edge.target.value for _, edge in index.children(root)] == [
+        "a.example.com", "b.example.com", "c.example.com", "192.0.2.1"]
@@ -0,0 +1,107 @@
+import tests  # Configure le path
+
+import os
+import random
+from src.engine.core import ScannerEngine
+from src.models.bloom import BloomFilter, ScalableBloomFilter
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.models.store import GraphStore
+from src.storage.spill import SpillGraphStore
+from src.strategies.base import Strategy
+
+def keys(prefix, count):
+    return [f"{prefix}{i}.example.com".encode() for i in range(count)]
+
+def test_bloom_filters_have_no_false_negatives_and_report_their_rate():
+    bloom = BloomFilter(10000, 0.01)
+    # Un ajout peut tomber sur un faux positif, mais rarement
+    assert sum(bloom.add(key) for key in keys("in", 10000)) < 50
+    assert all(key in bloom for key in keys("in", 10000))
+    measured = sum(key in bloom for key in keys("out", 20000)) / 20000
+    assert 0.002 < measured < 0.02
+    assert abs(bloom.false_positive_rate() - measured) < 0.005
+
+    scalable = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+    for key in keys("in", 20000):
+        scalable.add(key)
+    assert len(scalable.filters) > 1 and not scalable.saturated
+    assert all(key in scalable for key in keys("in", 20000))
+    assert scalable.false_positive_rate() < 0.01
+
+def test_scalable_bloom_respects_its_memory_ceiling():
+    bloom = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01, max_bytes=8192)
+    for key in keys("in", 50000):
+        bloom.add(key)
+    assert bloom.saturated and bloom.nbytes <= 8192
+    assert all(key in bloom for key in keys("in", 50000))
+    # Au-delà du plafond, le taux de faux positifs monte et reste mesurable
+    assert bloom.false_positive_rate() > 0.01
+
+def random_edges(count, names=3000, seed=7):
+    rng = random.Random(seed)
+    edge_types = [EdgeType.A, EdgeType.CNAME, EdgeType.NS, EdgeType.SUBDOMAIN]
+    nodes = [Node(f"n{i}.example.com", NodeType.DOMAIN) for i in range(names)]
+    return [Edge(rng.choice(nodes), rng.choice(nodes), rng.choice(edge_types)) for _ in range(count)]
+
+def test_spill_store_matches_graph_store_even_when_saturated():
+    # Plafond minuscule : filtres saturés, beaucoup de vérifications sur disque, résultat exact
+    reference = GraphStore()
+    with SpillGraphStore(memory_limit=4096, batch_size=500, cache_nodes=100) as spill:
+        for edge in random_edges(20000):
+            assert spill.add_edge(edge) == reference.add_edge(edge)
+        assert len(spill.nodes) == len(reference.nodes)
+        assert len(spill.edges) == len(reference.edges)
+        assert list(spill.nodes) == list(reference.nodes)
+        assert list(spill.edges) == list(reference.edges)
+
+        node = Node("n42.example.com", NodeType.DOMAIN)
+        node_id = spill.node_id(node)
+        assert node_id == reference.node_id(node) and spill.node(node_id) == node
+        assert spill.out_edges(node_id) == reference.out_edges(node_id)
+        assert spill.in_edges(node_id) == reference.in_edges(node_id)
+        assert spill.node_id(Node("absent.example.com", NodeType.DOMAIN)) is None
+
+        first = next(iter(reference.edges))
+        assert first in spill.edges
+        assert spill.remove_edge_ids(spill.node_id(first.source), spill.node_id(first.target), first.type)
+        assert first not in spill.edges and len(spill.edges) == len(reference.edges) - 1
+
+        assert spill.mark_visited(node_id) and not spill.mark_visited(node_id)
+        assert list(spill.visited) == [node]
+
+        stats = spill.stats()
+        nodes_filter = stats["node_filter"]
+        assert nodes_filter["saturated"] and nodes_filter["false_positives"] > 0
+        assert 0 < nodes_filter["observed_false_positive_rate"] <= 1
+        assert stats["memory_bytes"] < 4096 + len(reference.nodes) // 8 + 2048
+        path = spill.path
+    assert not os.path.exists(path)
+
+class ChainStrategy(Strategy):
+    """
+    Chaque domaine pointe vers deux domaines dérivés de son nom (graphe déterministe avec reconvergences).
+    """
+    def execute(self, node):
+        index = int(node.value.split(".")[0][1:])
+        for child in (index * 2 % 97, index * 3 % 97):
+            target = Node(f"n{child}.example.com", NodeType.DOMAIN)
+            yield target, Edge(node, target, EdgeType.CNAME)
+
+def test_engine_scan_with_spill_store(tmp_path):
+    root = Node("n1.example.com", NodeType.DOMAIN)
+    reference = ScannerEngine(max_depth=6)
+    reference.register_strategy(ChainStrategy())
+    reference.scan(root)
+
+    path = str(tmp_path / "scan.db")
+    with SpillGraphStore(path, memory_limit=1 << 16, batch_size=16) as store:
+        engine = ScannerEngine(max_depth=6, store=store)
+        engine.register_strategy(ChainStrategy())
+        engine.scan(root)
+        assert set(engine.nodes) == set(reference.nodes)
+        assert set(engine.edges) == set(reference.edges)
+        assert set(engine.visited) == set(reference.visited)
+        stats = engine.get_stats()
+        assert stats["store"]["path"] == path and stats["store"]["disk_bytes"] > 0
+    # Fichier fourni : conservé après close()
+    assert os.path.exists(path)
@@ -0,0 +1,50 @@
+import tests  # Configure le path
+
+from src.engine.core import ScannerEngine
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.storage.sqlite import ResultStore
+from src.strategies.base import Strategy
+
+GRAPH = {
+    "example.com": [("www.example.com", NodeType.DOMAIN, EdgeType.CNAME), ("203.0.113.10", NodeType.IP_V4, EdgeType.A)],
+    "www.example.com": [("203.0.113.20", NodeType.IP_V4, EdgeType.A), ("2001:db8::1", NodeType.IP_V6, EdgeType.AAAA)],
+    "203.0.113.20": [("host.example.net", NodeType.DOMAIN, EdgeType.PTR)],
+    "host.example.net": [("198.51.100.0/24", NodeType.PREFIX_V4, EdgeType.TXT)],
+}
+
+class GraphStrategy(Strategy):
+    def execute(self, node):
+        for value, node_type, edge_type in GRAPH.get(node.value, []):
+            target = Node(value, node_type)
+            yield target, Edge(node, target, edge_type)
+
+def scan_into(store: ResultStore) -> ScannerEngine:
+    engine = ScannerEngine(max_depth=5)
+    engine.register_strategy(GraphStrategy())
+    engine.add_listener(store)
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+    return engine
+
+def test_store_records_streaming_scan(tmp_path):
+    with ResultStore(str(tmp_path / "scan.db"), batch_size=2) as store:
+        engine = scan_into(store)
+        scan_id = store.latest_scan()
+        assert len(list(store.iter_nodes(scan_id))) == len(engine.nodes)
+        assert len(list(store.iter_edges(scan_id))) == len(engine.edges)
+        assert store.scans()[0][1] == "example.com"
+
+def test_store_queries(tmp_path):
+    with ResultStore(str(tmp_path / "scan.db")) as store:
+        scan_into(store)
+
+        resolving = {(s.value, t.value) for s, t in store.resolving_into("203.0.113.0/24")}
+        assert resolving == {("example.com", "203.0.113.10"), ("www.example.com", "203.0.113.20")}
+
+        assert {n.value for n in store.nodes_in("198.51.0.0/16")} == {"198.51.100.0/24"}
+        assert [(n.value, e) for n, e in store.sources_of("2001:DB8::1")] == [("www.example.com", EdgeType.AAAA)]
+
+        nodes, edges = store.neighbourhood("www.example.com", hops=1)
+        assert {n.value for n in nodes} == {"www.example.com", "example.com", "203.0.113.20", "2001:db8::1"}
+        assert len(edges) == 3
+        nodes, _ = store.neighbourhood("www.example.com", hops=2)
+        assert "host.example.net" in {n.value for n in nodes}
@@ -0,0 +1,40 @@
+import tests  # Configure le path
+
+from src.models.graph import Node, Edge, NodeType, EdgeType
+from src.models.store import GraphStore
+
+def test_store_interns_nodes_and_dedups_edges():
+    store = GraphStore()
+    a = Node("example.com", NodeType.DOMAIN)
+    b = Node("1.2.3.4", NodeType.IP_V4)
+
+    assert store.intern(a) == store.intern(Node("example.com", NodeType.DOMAIN))
+    assert store.add_edge(Edge(a, b, EdgeType.A))
+    assert not store.add_edge(Edge(a, b, EdgeType.A))
+    assert store.add_edge(Edge(a, b, EdgeType.NEIGHBOR))
+
+    assert len(store.nodes) == 2
+    assert len(store.edges) == 2
+    assert Edge(a, b, EdgeType.A) in store.edges
+    assert Edge(b, a, EdgeType.A) not in store.edges
+
+def test_store_adjacency_and_visited():
+    store = GraphStore()
+    a = Node("example.com", NodeType.DOMAIN)
+    b = Node("www.example.com", NodeType.DOMAIN)
+    store.add_edge(Edge(b, a, EdgeType.PARENT))
+
+    a_id, b_id = store.node_id(a), store.node_id(b)
+    assert [store.edge(i).target for i in store.out_edges(b_id)] == [a]
+    assert [store.edge(i).source for i in store.in_edges(a_id)] == [b]
+    assert store.out_edges(a_id) == []
+
+    assert store.mark_visited(a_id)
+    assert not store.mark_visited(a_id)
+    assert set(store.visited) == {a}
+
+
+if __name__ == "__main__":
+    test_store_interns_nodes_and_dedups_edges()
+    test_store_adjacency_and_visited()
+    print("✓ Tout est OK !")
@@ -1,8 +1,14 @@
 import tests  # Configure le path
 
+import ipaddress
+import dns.exception
+import dns.message
+import dns.rcode
+import dns.resolver
 from unittest.mock import MagicMock, patch
 from src.models.graph import Node, NodeType
 from src.strategies.dns import BasicDNSStrategy
+from src.strategies.neighbors import Ipv6NeighborStrategy, NeighborStrategy
 from src.strategies.txt import TxtStrategy
 
 def test_basic_dns_strategy():
@@ -38,7 +44,226 @@ def test_txt_strategy():
         assert "_spf.google.com" in values
 
 
+def test_txt_strategy_keeps_cidr_blocks():
+    strategy = TxtStrategy()
+    node = Node("example.com", NodeType.DOMAIN)
+
+    with patch.object(strategy.resolver, 'resolve') as mock_resolve:
+        mock_answer = MagicMock()
+        mock_answer.__str__.return_value = 'v=spf1 ip4:10.0.0.0/16 ip4:192.0.2.1 ip6:2001:db8::/32 a:web.example.com mx -all'
+        mock_resolve.return_value = [mock_answer]
+
+        results = {(n.value, n.type) for n, e in strategy.execute(node)}
+
+    assert ("10.0.0.0/16", NodeType.PREFIX_V4) in results
+    assert ("192.0.2.1", NodeType.IP_V4) in results
+    assert ("2001:db8::/32", NodeType.PREFIX_V6) in results
+    assert ("web.example.com", NodeType.DOMAIN) in results
+
+
+def test_txt_strategy_include_chain_is_bounded():
+    strategy = TxtStrategy()
+    node = Node("example.com", NodeType.DOMAIN)
+
+    def resolve(domain, rtype):
+        # Chaîne infinie : chaque domaine inclut le suivant
+        depth = domain.count("x")
+        answer = MagicMock()
+        answer.__str__.return_value = f'v=spf1 include:{"x" * (depth + 1)}.example.net ~all'
+        return [answer]
+
+    with patch.object(strategy.resolver, 'resolve', side_effect=resolve) as mock_resolve:
+        list(strategy.execute(node))
+        # La requête initiale + au plus 10 include + _dmarc.example.com
+        assert mock_resolve.call_count == 12
+
+        # Les politiques sont mises en cache par domaine
+        list(strategy.execute(node))
+        assert mock_resolve.call_count == 12
+
+
+def test_txt_strategy_follows_dmarc_report_domains():
+    strategy = TxtStrategy()
+    node = Node("example.com", NodeType.DOMAIN)
+    records = {
+        "example.com": 'v=spf1 -all',
+        "_dmarc.example.com": 'v=DMARC1; p=reject; rua=mailto:dmarc@reports.example.net; ruf=mailto:forensics@example.org',
+    }
+
+    def resolve(domain, rtype):
+        if domain not in records:
+            raise dns.resolver.NXDOMAIN()
+        answer = MagicMock()
+        answer.__str__.return_value = records[domain]
+        return [answer]
+
+    with patch.object(strategy.resolver, 'resolve', side_effect=resolve) as mock_resolve:
+        results = [(e.source.value, n.value) for n, e in strategy.execute(node)]
+        assert results == [("example.com", "reports.example.net"), ("example.com", "example.org")]
+
+        # Même cache à TTL que les autres politiques
+        list(strategy.execute(node))
+        assert mock_resolve.call_count == 2
+
+
+def test_txt_policy_cache_follows_ttl_and_skips_transient_failures():
+    now = [0.0]
+    strategy = TxtStrategy(clock=lambda: now[0])
+    answer = MagicMock()
+    answer.__str__.return_value = 'v=spf1 ip4:192.0.2.0/24 -all'
+    answers = MagicMock()
+    answers.__iter__.side_effect = lambda: iter([answer])
+    answers.rrset.ttl = 60
+
+    with patch.object(strategy.resolver, 'resolve', side_effect=dns.exception.Timeout()) as mock_resolve:
+        assert strategy.get_policies("example.com") == ()
+        assert strategy.get_policies("example.com") == ()
+        # Un timeout n'est pas mis en cache
+        assert mock_resolve.call_count == 2
+
+        mock_resolve.side_effect = None
+        mock_resolve.return_value = answers
+        assert len(strategy.get_policies("example.com")) == 1
+        now[0] = 59
+        assert len(strategy.get_policies("example.com")) == 1
+        assert mock_resolve.call_count == 3
+
+        # Expiré au bout du TTL de la réponse
+        now[0] = 61
+        mock_resolve.side_effect = dns.resolver.NXDOMAIN()
+        assert strategy.get_policies("example.com") == ()
+        assert strategy.get_policies("example.com") == ()
+        assert mock_resolve.call_count == 4
+        now[0] = 61 + TxtStrategy.NEGATIVE_TTL + 1
+        strategy.get_policies("example.com")
+        assert mock_resolve.call_count == 5
+
+
+def refused(name):
+    request = dns.message.make_query(name, "PTR")
+    response = dns.message.make_response(request)
+    response.set_rcode(dns.rcode.REFUSED)
+    return dns.resolver.NoNameservers(request=request, errors=[("192.0.2.53", False, 53, "REFUSED", response)])
+
+def test_neighbor_sweep_skips_swept_and_dead_zones():
+    strategy = NeighborStrategy(mode="sweep", window=24, workers=4)
+
+    def resolve(name, rtype):
+        name = str(name)
+        if name in ("2.0.192.in-addr.arpa.", "3.0.192.in-addr.arpa."):
+            raise dns.resolver.NoAnswer()
+        if name.endswith(".3.0.192.in-addr.arpa."):
+            raise refused(name)
+        if name in ("5.2.0.192.in-addr.arpa.", "200.2.0.192.in-addr.arpa."):
+            return [MagicMock()]
+        raise dns.resolver.NXDOMAIN()
+
+    with patch.object(strategy.resolver, 'resolve', side_effect=resolve) as mock_resolve:
+        results = list(strategy.execute(Node("192.0.2.10", NodeType.IP_V4)))
+        assert [n.value for n, e in results] == ["192.0.2.5", "192.0.2.200"]
+        calls = mock_resolve.call_count
+
+        # Le /24 est déjà balayé : aucune nouvelle requête
+        assert list(strategy.execute(Node("192.0.2.5", NodeType.IP_V4))) == []
+        assert mock_resolve.call_count == calls
+
+        # Une zone qui refuse tout est abandonnée après le premier lot
+        assert list(strategy.execute(Node("192.0.3.1", NodeType.IP_V4))) == []
+        assert mock_resolve.call_count == calls + 1 + 16
+
+
+def test_neighbor_sweep_does_not_condemn_a_zone_on_timeout():
+    strategy = NeighborStrategy(mode="sweep", window=24, workers=4)
+
+    def resolve(name, rtype):
+        name = str(name)
+        if name == "2.0.192.in-addr.arpa.":
+            raise dns.exception.Timeout()
+        if name == "7.2.0.192.in-addr.arpa.":
+            return [MagicMock()]
+        raise dns.resolver.NXDOMAIN()
+
+    with patch.object(strategy.resolver, 'resolve', side_effect=resolve):
+        results = list(strategy.execute(Node("192.0.2.10", NodeType.IP_V4)))
+
+    assert [n.value for n, e in results] == ["192.0.2.7"]
+    assert not strategy._dead_zones
+
+
+def test_ipv6_neighbor_walk_prunes_nxdomain_subtrees():
+    strategy = Ipv6NeighborStrategy(prefix_len=112, workers=4)
+    populated = ["2001:db8::1:5", "2001:db8::1:a0"]
+    existing = set()
+    for address in populated:
+        nibbles = ipaddress.IPv6Address(address).exploded.replace(":", "")
+        for i in range(len(nibbles) + 1):
+            existing.add(".".join(reversed(nibbles[:i])))
+
+    def resolve(name, rtype):
+        name = str(name)[:-len(".ip6.arpa.")]
+        if name not in existing:
+            raise dns.resolver.NXDOMAIN()
+        if name.count(".") < 31:
+            raise dns.resolver.NoAnswer()
+        return [MagicMock()]
+
+    with patch.object(strategy.resolver, 'resolve', side_effect=resolve) as mock_resolve:
+        results = list(strategy.execute(Node("2001:db8::1:5", NodeType.IP_V6)))
+
+    assert [n.value for n, e in results] == ["2001:db8::1:a0"]
+    # Racine + 16 sondes par nœud existant sous le /112 (4 nibbles, 2 branches au dernier niveau)
+    assert mock_resolve.call_count == 1 + 16 * 5
+
+
+def test_ipv6_neighbor_walk_resumes_where_the_budget_stopped_it():
+    strategy = Ipv6NeighborStrategy(prefix_len=112, max_queries=33, workers=4)
+    populated = ["2001:db8::1:5", "2001:db8::1:a0"]
+    existing = set()
+    for address in populated:
+        nibbles = ipaddress.IPv6Address(address).exploded.replace(":", "")
+        for i in range(len(nibbles) + 1):
+            existing.add(".".join(reversed(nibbles[:i])))
+    root_timeouts = [1]
+
+    def resolve(name, rtype):
+        name = str(name)[:-len(".ip6.arpa.")]
+        if name.count(".") == 27 and root_timeouts:
+            root_timeouts.pop()
+            raise dns.exception.Timeout()
+        if name not in existing:
+            raise dns.resolver.NXDOMAIN()
+        if name.count(".") < 31:
+            raise dns.resolver.NoAnswer()
+        return [MagicMock()]
+
+    found = []
+    with patch.object(strategy.resolver, 'resolve', side_effect=resolve) as mock_resolve:
+        # Racine en timeout : rien n'est parcouru, le préfixe reste à faire
+        assert list(strategy.execute(Node("2001:db8::1:5", NodeType.IP_V6))) == []
+        assert mock_resolve.call_count == 1 and not strategy._walked
+
+        # Deux développements par appel : le parcours reprend là où il s'était arrêté
+        for value in ("2001:db8::1:5", "2001:db8::1:6", "2001:db8::1:7"):
+            found += [n.value for n, e in strategy.execute(Node(value, NodeType.IP_V6))]
+        assert strategy._walked and not strategy._resume
+        calls = mock_resolve.call_count
+        assert calls == 1 + 1 + 16 * 5
+
+        assert list(strategy.execute(Node("2001:db8::1:8", NodeType.IP_V6))) == []
+        assert mock_resolve.call_count == calls
+
+    assert set(found) == set(populated)
+
+
 if __name__ == "__main__":
     test_basic_dns_strategy()
     test_txt_strategy()
+    test_txt_strategy_keeps_cidr_blocks()
+    test_txt_strategy_include_chain_is_bounded()
+    test_txt_strategy_follows_dmarc_report_domains()
+    test_txt_policy_cache_follows_ttl_and_skips_transient_failures()
+    test_neighbor_sweep_skips_swept_and_dead_zones()
+    test_neighbor_sweep_does_not_condemn_a_zone_on_timeout()
+    test_ipv6_neighbor_walk_prunes_nxdomain_subtrees()
+    test_ipv6_neighbor_walk_resumes_where_the_budget_stopped_it()
     print("✓ Tout est OK !")
@@ -0,0 +1,60 @@
+import tests  # Configure le path
+
+import io
+import json
+
+import pytest
+from src.engine.core import ScannerEngine
+from src.engine.tracing import ChromeTraceSink, ScanTracer, TraceSink, profile_scan
+from src.models.graph import Node, NodeType
+from tests.test_metrics import LookupStrategy
+
+def test_chrome_trace_spans_are_balanced():
+    buffer = io.StringIO()
+    engine = ScannerEngine(max_depth=2)
+    engine.register_strategy(LookupStrategy())
+    tracer = ScanTracer(ChromeTraceSink(buffer))
+    engine.add_listener(tracer)
+    engine.scan(Node("example.com", NodeType.DOMAIN))
+    tracer.sink.close()
+
+    events = json.loads(buffer.getvalue())
+    phases = [event["ph"] for event in events]
+    assert phases.count("B") == phases.count("E")
+    assert phases[0] == "B" and events[0]["cat"] == "scan"
+    assert phases[-1] == "E" and events[-1]["cat"] == "scan"
+
+    queries = [event for event in events if event["cat"] == "query"]
+    assert len(queries) == 3
+    assert {event["args"]["outcome"] for event in queries} == {"NOERROR", "NXDOMAIN"}
+    assert all(event["dur"] >= 0 for event in queries)
+
+    expanded = [event["name"] for event in events if event["cat"] == "node" and event["ph"] == "B"]
+    assert len(expanded) == 3  # example.com, www et api
+
+def test_profile_scan_writes_report():
+    engine = ScannerEngine(max_depth=1)
+    engine.register_strategy(LookupStrategy())
+    report = io.StringIO()
+    profile_scan(engine, Node("example.com", NodeType.DOMAIN), report, limit=5)
+    assert "function calls" in report.getvalue()
+    assert len(engine.nodes) == 3
+
+def test_explicit_zero_timestamp_is_kept():
+    events = []
+
+    class ListSink(TraceSink):
+        def emit(self, event):
+            events.append(event)
+
+    tracer = ScanTracer(ListSink())
+    # Requête partie à l'instant de création du traceur
+    tracer._emit("X", "query", "query", ts=tracer._ts(tracer._origin), dur=5.0)
+    assert events[0]["ts"] == 0.0
+
+def test_incomplete_sink_fails_at_instantiation():
+    class Silent(TraceSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Silent()
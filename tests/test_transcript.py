@@ -0,0 +1,77 @@
+import tests  # Configure le path
+
+from benchmarks.server import AuthoritativeServer
+from benchmarks.zones import ZoneBuilder, fanout, spf_chain
+from src.engine.transcript import ReplayResolver, TranscriptRecorder, read_transcript
+from src.models.graph import Node, NodeType
+from src.strategies.registry import build_engine
+
+NAMES = ("dns", "txt", "ptr", "parents", "subdomains")
+
+def record(path):
+    builder = ZoneBuilder()
+    fanout(builder, "example.com", width=3, addresses=1)
+    spf_chain(builder, "example.net", length=3)
+    builder.add("example.com", "TXT", '"v=spf1 include:example.net -all"')
+
+    engine = build_engine(NAMES, max_depth=3)
+    recorder = TranscriptRecorder(str(path))
+    engine.add_listener(recorder)
+    with AuthoritativeServer(builder.build()) as server:
+        for strategy in engine.strategies:
+            resolver = getattr(strategy, "resolver", None)
+            if resolver is not None:
+                resolver.nameservers = [server.host]
+                resolver.port = server.port
+        engine.scan(Node("example.com", NodeType.DOMAIN))
+    recorder.close()
+    return engine, recorder
+
+def test_replay_reproduces_recorded_scan(tmp_path):
+    path = tmp_path / "scan.dnstrc"
+    original, recorder = record(path)
+
+    records = list(read_transcript(str(path)))
+    assert len(records) == recorder.records > 0
+    assert {record.outcome for record in records} >= {"NOERROR", "NXDOMAIN", "NODATA"}
+
+    replayed = build_engine(NAMES, max_depth=3)
+    replay = ReplayResolver(str(path))
+    replay.install(replayed)
+    replayed.scan(Node("example.com", NodeType.DOMAIN))
+
+    assert set(replayed.nodes) == set(original.nodes)
+    assert set(replayed.edges) == set(original.edges)
+    assert replay.misses == 0
+
+def test_replay_latency_and_unknown_queries(tmp_path):
+    path = tmp_path / "scan.dnstrc"
+    record(path)
+
+    delays = []
+    replay = ReplayResolver(str(path), latency=0.01, sleep=delays.append)
+    assert [str(r) for r in replay.resolve("www.example.com", "A")] == ["192.0.2.4"]
+    assert delays == [0.01]
+
+    try:
+        replay.resolve("unknown.example.org", "A")
+        assert False, "NXDOMAIN attendu"
+    except Exception as e:
+        assert type(e).__name__ == "NXDOMAIN"
+    assert replay.misses == 1
+
+def test_replay_keeps_refused_apart_from_servfail(tmp_path):
+    from src.engine.resolver import QueryEvent, classify
+    path = str(tmp_path / "refused.dnstrc")
+    recorder = TranscriptRecorder(path)
+    for qname, outcome in (("refused.example.org", "REFUSED"), ("broken.example.org", "SERVFAIL")):
+        recorder.on_query(QueryEvent("BasicDNSStrategy", qname, "A", outcome, None, 0.0))
+    recorder.close()
+
+    replay = ReplayResolver(path)
+    for qname, outcome in (("refused.example.org", "REFUSED"), ("broken.example.org", "SERVFAIL")):
+        try:
+            replay.resolve(qname, "A")
+            assert False, f"{outcome} attendu"
+        except Exception as e:
+            assert classify(e) == outcome